@@ -1,8 +1,28 @@
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
+from core.http_cache import make_etag, queryset_validators, conditional_page, cache_policy
 from .models import BlogPost, BlogCategory
 
 
+def _blog_list_validators(request):
+    qs = BlogPost.objects.filter(published=True)
+    category_slug = request.GET.get('category')
+    if category_slug:
+        qs = qs.filter(category__slug=category_slug)
+    last_modified, count = queryset_validators(qs)
+    etag = make_etag('blog_list', request.GET.urlencode(), last_modified, count)
+    return etag, last_modified
+
+
+def _blog_detail_validators(request, slug):
+    last_modified = BlogPost.objects.filter(slug=slug, published=True).values_list('updated_at', flat=True).first()
+    if last_modified is None:
+        return None, None
+    return make_etag('blog_detail', slug, last_modified), last_modified
+
+
+@cache_policy('blog')
+@conditional_page(_blog_list_validators)
 def blog_list(request):
     qs = BlogPost.objects.filter(published=True).select_related('category').prefetch_related('tags')
     category_slug = request.GET.get('category')
@@ -29,6 +49,8 @@ def blog_list(request):
     return render(request, 'blog/list.html', ctx)
 
 
+@cache_policy('blog')
+@conditional_page(_blog_detail_validators)
 def blog_detail(request, slug):
     post = get_object_or_404(BlogPost.objects.select_related('category').prefetch_related('tags'), slug=slug, published=True)
     prev_post = BlogPost.objects.filter(published=True, published_at__gt=post.published_at).order_by('published_at').first()
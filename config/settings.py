@@ -50,6 +50,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # CORS 미들웨어 추가 (맨 위)
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',  # ETag/Last-Modified 기반 304 응답
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -143,6 +144,22 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# 캐시 설정
+# 크롤러 등 별도 프로세스에서 올린 캐시 버전을 웹 프로세스도 볼 수 있도록 파일 캐시 사용
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('DJANGO_CACHE_DIR', str(BASE_DIR / 'django_cache')),
+        'TIMEOUT': 60 * 60 * 6,
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    }
+}
+
+# 시설 목록 필터용 메모리 비트맵 색인 (core/bitmap_index.py, 프로세스당 시설 수 x 필터 값 비트 사용)
+FACILITY_BITMAP_INDEX = os.getenv('FACILITY_BITMAP_INDEX', '') == '1'
+
 # DRF 설정
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 from django.urls import reverse
 from . import models
+from .search import search_facilities
 
 class FacilityBasicInline(admin.TabularInline):
     model = models.FacilityBasic
@@ -88,6 +90,13 @@ class FacilityAdmin(admin.ModelAdmin):
         BlogInline,
     ]
 
+    def get_search_results(self, request, queryset, search_term):
+        # 코드는 기존 방식, 이름/주소/태그/프로그램은 검색 색인으로 조회 (둘 다 list_filter 가 적용된 queryset 안에서)
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            results |= search_facilities(queryset, search_term, ranked=False)
+        return results, may_have_duplicates
+
     def blog_count(self, obj):
         return obj.blogs.count()
     blog_count.short_description = '블로그 수'
@@ -284,9 +293,15 @@ class HospitalAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        # 목록의 이미지 개수를 행마다 COUNT 하지 않도록 한 번에 집계
+        return super().get_queryset(request).defer('summary_embedding').annotate(image_count=Count('images'))
+
     def image_status(self, obj):
         if obj.has_images:
-            image_count = obj.images.count()
+            image_count = getattr(obj, 'image_count', None)
+            if image_count is None:
+                image_count = obj.images.count()
             return format_html('<span style="color: green;">⚫ 있음 ({}장)</span>', image_count)
         else:
             return format_html('<span style="color: red;">⚪ 없음</span>')
@@ -319,3 +334,35 @@ class HospitalImageAdmin(admin.ModelAdmin):
 
     def has_add_permission(self, request):
         return False
+
+
+@admin.register(models.CrawlURL)
+class CrawlURLAdmin(admin.ModelAdmin):
+    list_display = ('url', 'crawler', 'region', 'code', 'status', 'attempts', 'last_fetched', 'run_id')
+    list_filter = ('crawler', 'status', 'region')
+    search_fields = ('url', 'code', 'run_id')
+    readonly_fields = ('crawler', 'url', 'run_id', 'region', 'code', 'status', 'attempts', 'last_fetched', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(models.CrawlCursor)
+class CrawlCursorAdmin(admin.ModelAdmin):
+    list_display = ('run_id', 'crawler', 'region', 'shard', 'page', 'done', 'saved', 'updated', 'skipped', 'updated_at')
+    list_filter = ('crawler', 'done')
+    search_fields = ('run_id', 'region')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(models.CrawlRecord)
+class CrawlRecordAdmin(admin.ModelAdmin):
+    list_display = ('code', 'crawler', 'checks', 'changes', 'interval_hours', 'last_checked', 'last_changed', 'next_due')
+    list_filter = ('crawler',)
+    search_fields = ('code', 'url')
+    readonly_fields = ('section_fingerprints', 'section_changes')
+
+    def has_add_permission(self, request):
+        return False
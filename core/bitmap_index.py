@@ -0,0 +1,229 @@
+"""시설 목록 필터용 메모리 비트맵 색인 (선택 기능, settings.FACILITY_BITMAP_INDEX)
+
+시설을 이름순(파이썬 문자열 순서)으로 번호(비트 위치)를 매기고, 필터 값마다 해당 시설의 비트를 켠 정수(bitset)를 둔다.
+필터 조합은 비트 AND/OR 로, 개수는 popcount 로 계산하므로 DB 조회 없이 목록 개수·패싯을 구한다.
+페이지에 해당하는 시설 id 만 골라 그 행만 DB 에서 가져온다.
+
+비트 위치가 이름순이므로 낮은 비트부터 읽으면 이름순, 등급별 비트맵과 AND 해서 등급 순서대로 읽으면 등급순이 된다.
+검색어/비급여 금액/거리순처럼 색인이 표현하지 못하는 조건은 None 을 반환해 기존 DB 쿼리 경로를 사용한다.
+색인은 프로세스별로 첫 사용 시 만들고, 전역 데이터 세대가 바뀌면 백그라운드에서 다시 만든다(재생성 중에는 이전 색인 사용).
+"""
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+
+from .caching import get_data_generation
+from .filters import GRADE_ORDER
+from .models import Facility
+
+# 필터 키 → 시설 필드 (값이 정확히 일치)
+BITMAP_FIELDS = ('sido', 'sigungu', 'grade', 'availability', 'kind', 'has_images')
+TAG_FILTERS = ('establishment', 'size')  # 태그명 icontains
+SUPPORTED_SORTS = ('grade', 'name')
+REFRESH_INTERVAL = 30  # 데이터 세대 확인/색인 재생성 최소 간격(초)
+
+
+def enabled() -> bool:
+    return getattr(settings, 'FACILITY_BITMAP_INDEX', False)
+
+
+def _bitmap(positions) -> int:
+    value = 0
+    for position in positions:
+        value |= 1 << position
+    return value
+
+
+def _positions(bitmap: int, offset: int, limit: int) -> list:
+    """켜진 비트 위치를 낮은 쪽부터 offset 개 건너뛰고 limit 개"""
+    bits = bin(bitmap)[:1:-1]  # 최하위 비트가 0번 문자
+    result = []
+    index = bits.find('1')
+    while index != -1 and len(result) < limit:
+        if offset:
+            offset -= 1
+        else:
+            result.append(index)
+        index = bits.find('1', index + 1)
+    return result
+
+
+class FacilityBitmapIndex:
+    def __init__(self, rows, tag_rows, generation=None):
+        """rows: [(pk, name, sido, sigungu, grade, availability, kind, has_images)], tag_rows: [(facility_id, 태그명)]"""
+        self.generation = generation
+        self.checked_at = time.monotonic()
+        rows = sorted(rows, key=lambda row: (row[1], row[0]))
+        self.pks = [row[0] for row in rows]
+        position = {pk: idx for idx, pk in enumerate(self.pks)}
+        self.all = (1 << len(self.pks)) - 1
+
+        values = {field: defaultdict(list) for field in BITMAP_FIELDS}
+        for idx, row in enumerate(rows):
+            for field, value in zip(BITMAP_FIELDS, row[2:]):
+                values[field][value].append(idx)
+        tags = defaultdict(list)
+        for facility_id, name in tag_rows:
+            if facility_id in position:
+                tags[name].append(position[facility_id])
+
+        self.values = {field: {value: _bitmap(p) for value, p in by_value.items()} for field, by_value in values.items()}
+        self.tags = {name: _bitmap(p) for name, p in tags.items()}
+        graded = 0
+        for grade in GRADE_ORDER:
+            graded |= self.values['grade'].get(grade, 0)
+        # 등급순 정렬 구간 (order_facilities 와 동일하게 등급 외 값은 마지막)
+        self.grade_segments = [self.values['grade'].get(grade, 0) for grade in GRADE_ORDER] + [self.all & ~graded]
+
+    @classmethod
+    def build(cls, generation=None):
+        rows = Facility.objects.order_by().values_list('pk', 'name', *BITMAP_FIELDS)
+        tag_rows = Facility.tags.through.objects.values_list('facility_id', 'tag__name')
+        return cls(list(rows), list(tag_rows), generation)
+
+    def _field(self, field, value) -> int:
+        if field == 'has_images':
+            value = value in ('1', 'true', 'True', True)
+        return self.values[field].get(value, 0)
+
+    def match(self, filters: dict):
+        """필터 dict(get_facility_filters 형태) → 비트맵. 색인으로 처리할 수 없으면 None"""
+        if filters.get('search') or filters.get('max_cost'):
+            return None
+        bitmap = self.all
+        sido = filters.get('sido')
+        if sido and sido != '전체':
+            bitmap &= self._field('sido', sido)
+            if filters.get('sigungu'):
+                bitmap &= self._field('sigungu', filters['sigungu'])
+        for field in ('grade', 'availability', 'kind', 'has_images'):
+            if filters.get(field):
+                bitmap &= self._field(field, filters[field])
+        for key in TAG_FILTERS:
+            term = filters.get(key)
+            if term:
+                matched = 0
+                for name, tag_bitmap in self.tags.items():
+                    if term.lower() in name.lower():
+                        matched |= tag_bitmap
+                bitmap &= matched
+        return bitmap
+
+    def page(self, bitmap: int, sort: str, offset: int, limit: int) -> list:
+        """정렬 순서대로 offset 부터 limit 개의 시설 pk"""
+        if sort != 'grade':
+            return [self.pks[p] for p in _positions(bitmap, offset, limit)]
+        result = []
+        for segment in self.grade_segments:
+            part = bitmap & segment
+            count = part.bit_count()
+            if offset >= count:
+                offset -= count
+                continue
+            result.extend(self.pks[p] for p in _positions(part, offset, limit - len(result)))
+            offset = 0
+            if len(result) >= limit:
+                break
+        return result
+
+
+class BitmapResult:
+    """Paginator 에 넘길 수 있는 결과 (슬라이스한 페이지의 행만 DB 에서 조회)"""
+    ordered = True
+
+    def __init__(self, index, bitmap, sort, queryset):
+        self.index = index
+        self.bitmap = bitmap
+        self.sort = sort
+        self.queryset = queryset
+        self.model = queryset.model
+        self._count = bitmap.bit_count()
+
+    def count(self):
+        return self._count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start = key.start or 0
+        stop = self._count if key.stop is None else min(key.stop, self._count)
+        pks = self.index.page(self.bitmap, self.sort, start, max(0, stop - start))
+        objects = {obj.pk: obj for obj in self.queryset.filter(pk__in=pks)}
+        return [objects[pk] for pk in pks if pk in objects]
+
+
+_index = None
+_index_lock = threading.Lock()
+_rebuilding = False
+
+
+def get_index():
+    """현재 색인 (비활성화 시 None). 세대가 바뀌었으면 백그라운드 재생성을 시작하고 그동안은 이전 색인을 그대로 사용"""
+    global _index, _rebuilding
+    if not enabled():
+        return None
+    current = _index
+    if current is None:
+        # 처음 한 번은 만들어질 때까지 기다림
+        with _index_lock:
+            if _index is None:
+                _index = FacilityBitmapIndex.build(get_data_generation())
+            return _index
+    now = time.monotonic()
+    if now - current.checked_at < REFRESH_INTERVAL:
+        return current
+    current.checked_at = now
+    generation = get_data_generation()
+    if current.generation == generation:
+        return current
+    with _index_lock:
+        if _rebuilding:
+            return current
+        _rebuilding = True
+    _start_rebuild(generation)
+    return current
+
+
+def _rebuild(generation):
+    global _index, _rebuilding
+    try:
+        _index = FacilityBitmapIndex.build(generation)
+    finally:
+        _rebuilding = False
+
+
+def _start_rebuild(generation):
+    """요청 스레드를 막지 않도록 다른 스레드에서 색인 재생성"""
+    def run():
+        try:
+            _rebuild(generation)
+        finally:
+            connections.close_all()
+    threading.Thread(target=run, name='bitmap-index', daemon=True).start()
+
+
+def serving_index(filters: dict):
+    """현재 필터/정렬을 처리할 색인 (처리할 수 없으면 None). 조건부 요청 검증값 계산용"""
+    if filters.get('sort') not in SUPPORTED_SORTS:
+        return None
+    index = get_index()
+    if index is None or index.match(filters) is None:
+        return None
+    return index
+
+
+def bitmap_queryset(filters: dict, queryset):
+    """색인으로 처리 가능한 필터/정렬이면 BitmapResult, 아니면 None"""
+    if filters.get('sort') not in SUPPORTED_SORTS:
+        return None
+    index = get_index()
+    bitmap = index.match(filters) if index is not None else None
+    if bitmap is None:
+        return None
+    return BitmapResult(index, bitmap, filters['sort'], queryset)
@@ -0,0 +1,277 @@
+"""시설 데이터 캐시
+
+상세 페이지 데이터는 크롤러나 관리자 수정이 있을 때만 바뀌므로
+(시설 코드, 데이터 버전) 을 키로 컨텍스트를 캐시한다.
+버전은 시설 pk 단위로 관리되며 core/signals.py 와 크롤 커맨드가 올려서 이전 캐시를 무효화한다.
+요양병원 상세도 같은 방식(병원 pk 단위 버전)으로 캐시한다.
+
+목록 결과 조각(_facility_list_results.html)은 프로세스 내 LRU 에 보관하며,
+전역 "시설 데이터 세대(generation)" 값이 바뀌면 키가 달라져 자연히 무효화된다. (병원 변경도 세대를 올림)
+"""
+import threading
+import time
+
+from cachetools import LRUCache
+from django.core.cache import cache
+from django.db.models import F, Prefetch
+
+from .loaders import prefetch_sections
+from .models import Facility, Hospital, HospitalAttribute
+
+DETAIL_CACHE_TIMEOUT = 60 * 60 * 6  # 6시간 (버전이 바뀌면 즉시 무효)
+VIEW_FLUSH_EVERY = 20  # 조회수는 캐시에 모았다가 N회마다 DB 반영
+
+FACILITY_PK_KEY = 'core:facility_pk:{code}'
+FACILITY_VERSION_KEY = 'core:facility_version:{pk}'
+FACILITY_DETAIL_KEY = 'core:facility_detail:{code}:{version}'
+FACILITY_VIEWS_KEY = 'core:facility_views:{code}'
+FACILITY_GENERATION_KEY = 'core:facility_generation'
+HOSPITAL_PK_KEY = 'core:hospital_pk:{code}'
+HOSPITAL_VERSION_KEY = 'core:hospital_version:{pk}'
+HOSPITAL_DETAIL_KEY = 'core:hospital_detail:{code}:{version}'
+
+LIST_FRAGMENT_CACHE_SIZE = 256  # 인기 필터 조합(시도별 기본 정렬, 등급, 앞쪽 페이지) 위주
+
+# 상세 페이지 배지 키워드
+PROGRAM_BADGE_KEYWORDS = ["인지프로그램", "여가프로그램", "특화프로그램"]
+
+
+def _new_version() -> int:
+    # 카운터 대신 시각 기반 값 사용: 캐시가 비워져도 이전 버전과 겹치지 않음
+    return time.time_ns()
+
+
+def _code_pk(model, key_format, code):
+    """코드 → pk 매핑 (코드는 바뀌지 않으므로 만료 없이 캐시)"""
+    key = key_format.format(code=code)
+    pk = cache.get(key)
+    if pk is None:
+        pk = model.objects.filter(code=code).values_list('pk', flat=True).first()
+        if pk is None:
+            return None
+        cache.set(key, pk, None)
+    return pk
+
+
+def _version(key) -> int:
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def _bump_versions(key_format, pks):
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    version = _new_version()
+    cache.set_many({key_format.format(pk=pk): version for pk in pks}, None)
+
+
+def get_facility_pk(code: str):
+    return _code_pk(Facility, FACILITY_PK_KEY, code)
+
+
+def get_facility_version(pk) -> int:
+    return _version(FACILITY_VERSION_KEY.format(pk=pk))
+
+
+def bump_facility_version(*pks):
+    """해당 시설들의 상세 캐시 무효화"""
+    _bump_versions(FACILITY_VERSION_KEY, pks)
+
+
+def get_hospital_pk(code: str):
+    return _code_pk(Hospital, HOSPITAL_PK_KEY, code)
+
+
+def get_hospital_version(pk) -> int:
+    return _version(HOSPITAL_VERSION_KEY.format(pk=pk))
+
+
+def bump_hospital_version(*pks):
+    """해당 병원들의 상세 캐시 무효화"""
+    _bump_versions(HOSPITAL_VERSION_KEY, pks)
+
+
+def get_data_generation() -> int:
+    """전역 시설 데이터 세대 (크롤/관리자 저장 시 증가)"""
+    generation = cache.get(FACILITY_GENERATION_KEY)
+    if generation is None:
+        generation = _new_version()
+        if not cache.add(FACILITY_GENERATION_KEY, generation, None):
+            generation = cache.get(FACILITY_GENERATION_KEY, generation)
+    return generation
+
+
+def bump_data_generation():
+    cache.set(FACILITY_GENERATION_KEY, _new_version(), None)
+
+
+def forget_facility_code(code: str):
+    """시설 삭제 시 코드 매핑 제거 (같은 코드가 재생성될 수 있음)"""
+    cache.delete(FACILITY_PK_KEY.format(code=code))
+
+
+def forget_hospital_code(code: str):
+    cache.delete(HOSPITAL_PK_KEY.format(code=code))
+
+
+def split_program_tokens(content: str) -> list:
+    # 개행, 한글쉼표 변형 통합 → 콤마 기준 분리
+    normalized = (content or '').replace('\n', ',').replace('，', ',')
+    return [t.strip() for t in normalized.split(',') if t.strip()]
+
+
+def build_facility_detail(code: str):
+    """상세 페이지 컨텍스트 생성 (캐시 미스 시에만 호출)"""
+    facility = (
+        Facility.objects.defer('summary_embedding')
+        .select_related('homepage_info')
+        .prefetch_related('images', 'tags')
+        .filter(code=code)
+        .first()
+    )
+    if facility is None:
+        return None
+
+    # 모든 관련 정보 수집 (6개 섹션은 UNION 쿼리 한 번)
+    prefetch_sections([facility])
+    basic_items = list(facility.basic_items.all())
+    evaluation_items = list(facility.evaluation_items.all())
+    staff_items = list(facility.staff_items.all())
+    program_items = list(facility.program_items.all())
+    location_items = list(facility.location_items.all())
+    noncovered_items = list(facility.noncovered_items.all())
+
+    # 프로그램 tokens 처리 (템플릿 태그 제거 대체)
+    program_items_tokens = [
+        {'title': p.title, 'tokens': split_program_tokens(p.content)}
+        for p in program_items
+    ]
+
+    # 배지 키워드(존재 여부 표시 용도 필요시 유지)
+    flat_text = ' '.join([' '.join(pi['tokens']) for pi in program_items_tokens])
+    program_badges = [kw for kw in PROGRAM_BADGE_KEYWORDS if kw in flat_text]
+
+    # OneToOne 관계 정보
+    homepage_info = getattr(facility, 'homepage_info', None)
+    summary_info = getattr(facility, 'summary', None)
+
+    # 이미지 및 태그 정보
+    images = list(reversed(facility.images.all()))
+    tags = list(facility.tags.all())
+
+    return {
+        'facility': facility,
+        'basic_items': basic_items,
+        'evaluation_items': evaluation_items,
+        'staff_items': staff_items,
+        'program_items': program_items,  # 원본 유지
+        'program_items_tokens': program_items_tokens,  # 신규
+        'location_items': location_items,
+        'noncovered_items': noncovered_items,
+        'homepage_info': homepage_info,
+        'summary_info': summary_info,
+        'images': images,
+        'tags': tags,
+        'program_badges': program_badges,
+    }
+
+
+def get_facility_detail(code: str, refresh: bool = False):
+    """캐시된 상세 컨텍스트 반환. 시설이 없으면 None"""
+    pk = get_facility_pk(code)
+    if pk is None:
+        return None
+    key = FACILITY_DETAIL_KEY.format(code=code, version=get_facility_version(pk))
+    detail = None if refresh else cache.get(key)
+    if detail is None:
+        detail = build_facility_detail(code)
+        if detail is None:
+            forget_facility_code(code)
+            return None
+        cache.set(key, detail, DETAIL_CACHE_TIMEOUT)
+    return detail
+
+
+def build_hospital_detail(code: str):
+    """병원 상세 컨텍스트 생성 (캐시 미스 시에만 호출). 수치는 저장 시 파싱된 HospitalAttribute 사용"""
+    hospital = (
+        Hospital.objects.defer('summary_embedding')
+        .prefetch_related(
+            'images', 'tags',
+            Prefetch('attributes', queryset=HospitalAttribute.objects.order_by('kind', '-count', 'name')),
+        )
+        .filter(code=code)
+        .first()
+    )
+    if hospital is None:
+        return None
+    kind_labels = dict(HospitalAttribute.KIND_CHOICES)
+    attribute_groups = {}
+    for attribute in hospital.attributes.all():
+        attribute_groups.setdefault(kind_labels.get(attribute.kind, attribute.kind), []).append(attribute)
+    return {
+        'hospital': hospital,
+        'attribute_groups': attribute_groups,
+        'images': list(reversed(hospital.images.all())),
+        'tags': list(hospital.tags.all()),
+    }
+
+
+def get_hospital_detail(code: str, refresh: bool = False):
+    """캐시된 병원 상세 컨텍스트 반환. 병원이 없으면 None"""
+    pk = get_hospital_pk(code)
+    if pk is None:
+        return None
+    key = HOSPITAL_DETAIL_KEY.format(code=code, version=get_hospital_version(pk))
+    detail = None if refresh else cache.get(key)
+    if detail is None:
+        detail = build_hospital_detail(code)
+        if detail is None:
+            forget_hospital_code(code)
+            return None
+        cache.set(key, detail, DETAIL_CACHE_TIMEOUT)
+    return detail
+
+
+def record_facility_view(code: str):
+    """조회수 집계 (prewarm 대상 선정용). 매 요청 DB 쓰기를 피하려고 캐시에 누적"""
+    key = FACILITY_VIEWS_KEY.format(code=code)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, None):
+            return
+        count = cache.incr(key)
+    if count % VIEW_FLUSH_EVERY == 0:
+        Facility.objects.filter(code=code).update(view_count=F('view_count') + VIEW_FLUSH_EVERY)
+
+
+_list_fragments = LRUCache(maxsize=LIST_FRAGMENT_CACHE_SIZE)
+_list_fragments_lock = threading.Lock()
+
+
+def list_fragment_key(params, scope: str = 'facility'):
+    """목록 결과 조각 캐시 키 (scope: facility/hospital). 검색어가 있으면 조합이 무한하므로 캐시하지 않음(None)"""
+    if params.get('search', '').strip():
+        return None
+    items = tuple(sorted((k, v) for k, v in params.items() if k != 'ajax' and v))
+    return scope, get_data_generation(), items
+
+
+def get_list_fragment(key):
+    if key is None:
+        return None
+    with _list_fragments_lock:
+        return _list_fragments.get(key)
+
+
+def set_list_fragment(key, content: bytes):
+    if key is None:
+        return
+    with _list_fragments_lock:
+        _list_fragments[key] = content
@@ -0,0 +1,98 @@
+"""시설 비교 매트릭스
+
+코드 목록(2~5개)의 시설을 한 번에 로드해 비교 항목별 행(row) x 시설 열(column) 형태로 만든다.
+결과는 정렬한 코드 튜플 + 각 시설 데이터 버전을 키로 캐시하고, 요청 순서에 맞게 열만 재배열한다.
+거리는 요청 좌표에 따라 달라지므로 캐시 이후에 계산한다.
+"""
+from django.core.cache import cache
+
+from .caching import DETAIL_CACHE_TIMEOUT, get_facility_pk, get_facility_version
+from .geo import haversine_km
+from .loaders import prefetch_sections
+from .models import Facility
+from .parsing import noncovered_costs, staff_counts
+
+COMPARE_MIN_SIZE = 2
+COMPARE_MAX_SIZE = 5
+COMPARE_CACHE_KEY = 'core:facility_compare:{codes}:{versions}'
+
+
+def _row(key, label, values, unit=''):
+    return {'key': key, 'label': label, 'unit': unit, 'values': values}
+
+
+def _union_keys(dicts) -> list:
+    """여러 dict 의 키를 처음 등장한 순서대로"""
+    return list(dict.fromkeys(key for d in dicts for key in d))
+
+
+def build_matrix(codes) -> dict:
+    """코드 순서대로 열을 구성한 비교 매트릭스 (없는 코드는 missing)"""
+    facilities = {
+        f.code: f for f in
+        Facility.objects.defer('summary_embedding').filter(code__in=codes)
+    }
+    columns = [facilities[code] for code in codes if code in facilities]
+    prefetch_sections(columns)
+
+    staff = [staff_counts(f) for f in columns]
+    costs = [noncovered_costs(f) for f in columns]
+
+    def occupancy_rate(f):
+        if not f.capacity or f.occupancy is None:
+            return None
+        return round(f.occupancy * 100 / f.capacity, 1)
+
+    rows = [
+        _row('grade', '평가등급', [f.grade or None for f in columns]),
+        _row('capacity', '정원', [f.capacity for f in columns], '명'),
+        _row('occupancy', '현원', [f.occupancy for f in columns], '명'),
+        _row('waiting', '대기', [f.waiting for f in columns], '명'),
+        _row('occupancy_rate', '입소율', [occupancy_rate(f) for f in columns], '%'),
+    ]
+    rows += [_row(f'staff:{title}', title, [s.get(title) for s in staff], '명') for title in _union_keys(staff)]
+    rows.append(_row('staff_total', '인력 합계', [sum(s.values()) if s else None for s in staff], '명'))
+    rows += [_row(f'noncovered:{title}', title, [c.get(title) for c in costs], '원/월') for title in _union_keys(costs)]
+    rows.append(_row('noncovered_monthly_total', '비급여 월 합계', [sum(c.values()) if c else None for c in costs], '원/월'))
+
+    return {
+        'facilities': [
+            {'code': f.code, 'name': f.name, 'sido': f.sido, 'sigungu': f.sigungu,
+             'latitude': float(f.latitude) if f.latitude is not None else None,
+             'longitude': float(f.longitude) if f.longitude is not None else None}
+            for f in columns
+        ],
+        'rows': rows,
+        'missing': [code for code in codes if code not in facilities],
+    }
+
+
+def _reorder(matrix: dict, codes) -> dict:
+    """열 순서를 요청한 코드 순서로"""
+    order = {item['code']: idx for idx, item in enumerate(matrix['facilities'])}
+    indexes = [order[code] for code in codes if code in order]
+    return {
+        'facilities': [matrix['facilities'][i] for i in indexes],
+        'rows': [{**row, 'values': [row['values'][i] for i in indexes]} for row in matrix['rows']],
+        'missing': [code for code in codes if code in matrix['missing']],
+    }
+
+
+def get_comparison(codes, point=None) -> dict:
+    """캐시된 비교 매트릭스 (point=(lat, lng) 가 있으면 거리 행 추가)"""
+    sorted_codes = sorted(set(codes))
+    versions = [get_facility_version(pk) if pk is not None else 0 for pk in map(get_facility_pk, sorted_codes)]
+    key = COMPARE_CACHE_KEY.format(codes=','.join(sorted_codes), versions='.'.join(map(str, versions)))
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = build_matrix(sorted_codes)
+        cache.set(key, matrix, DETAIL_CACHE_TIMEOUT)
+
+    matrix = _reorder(matrix, codes)
+    if point is not None:
+        distances = [
+            round(haversine_km(*point, f['latitude'], f['longitude']), 2) if f['latitude'] is not None else None
+            for f in matrix['facilities']
+        ]
+        matrix['rows'].append(_row('distance', '거리', distances, 'km'))
+    return matrix
@@ -0,0 +1,63 @@
+"""비급여 비용 정규화
+
+FacilityNonCovered(자유 텍스트) 또는 noncovered_info(JSON) 를 항목별 월 환산 금액(FacilityCost)과
+시설별 월 합계(Facility.noncovered_monthly_total)로 저장해 인덱스로 필터/정렬할 수 있게 한다.
+"""
+from django.db import transaction
+
+from .models import Facility, FacilityCost, FacilityNonCovered
+from .parsing import monthly_amount
+
+# 항목명 키워드 → 분류 (위에서부터 먼저 일치하는 것)
+CATEGORY_KEYWORDS = [
+    ('snack', ('간식',)),
+    ('meal', ('식사', '식비', '식대', '급식')),
+    ('room', ('상급침실', '1인실', '2인실', '침실')),
+    ('beauty', ('이미용', '미용')),
+]
+
+
+def categorize(title: str) -> str:
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in title for keyword in keywords):
+            return category
+    return 'etc'
+
+
+def cost_items(source) -> list:
+    """{항목명: 내용} → [(분류, 항목명, 월 금액)] (금액을 읽을 수 없는 항목은 제외)"""
+    items = []
+    for title, content in (source or {}).items():
+        title = (title or '').strip()
+        amount = monthly_amount(title, content)
+        if title and amount is not None:
+            items.append((categorize(title), title[:100], amount))
+    return items
+
+
+def sync_facility_costs(pks) -> int:
+    """지정한 시설들의 FacilityCost/월 합계를 다시 계산. 생성한 행 수 반환
+
+    bulk_update 를 사용하므로 post_save 시그널(캐시 무효화)이 다시 발생하지 않는다.
+    """
+    pks = list(pks)
+    items_by_facility = {pk: {} for pk in pks}
+    for facility_id, title, content in FacilityNonCovered.objects.filter(facility_id__in=pks).values_list('facility_id', 'title', 'content'):
+        items_by_facility[facility_id][title] = content
+    facilities = list(Facility.objects.filter(pk__in=pks).only('pk', 'noncovered_info', 'noncovered_monthly_total'))
+
+    rows = []
+    for facility in facilities:
+        # 섹션 데이터 우선 (기간 정보 포함), 없으면 JSON 요약
+        items = cost_items(items_by_facility.get(facility.pk) or facility.noncovered_info)
+        rows.extend(
+            FacilityCost(facility_id=facility.pk, category=category, title=title, monthly_amount=amount)
+            for category, title, amount in items
+        )
+        facility.noncovered_monthly_total = sum(amount for _, _, amount in items) if items else None
+
+    with transaction.atomic():
+        FacilityCost.objects.filter(facility_id__in=pks).delete()
+        FacilityCost.objects.bulk_create(rows, batch_size=1000)
+        Facility.objects.bulk_update(facilities, ['noncovered_monthly_total'], batch_size=500)
+    return len(rows)
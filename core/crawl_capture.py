@@ -0,0 +1,88 @@
+"""크롤러 디버그 스냅샷 저장
+
+목록/상세 HTML 과 실패 스크린샷을 모드에 따라 골라 저장한다.
+- off: 저장하지 않음
+- failures: 실패(상세 링크 없음, 이동/파싱 실패)일 때만 (기본)
+- sample: 실패 + 정상 페이지 중 sample_rate 비율
+- all: 모두
+
+텍스트는 zstandard 로 압축(.zst)하고, 압축과 파일 쓰기는 전용 스레드 하나에서 처리해 이벤트 루프를 막지 않는다.
+디렉터리 전체 크기가 max_bytes 를 넘으면 오래된 파일부터 지운다. 디렉터리는 첫 저장 때 만든다.
+"""
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import zstandard
+
+CAPTURE_MODES = ('off', 'failures', 'sample', 'all')
+DEFAULT_CAPTURE_DIR = Path('crawl_debug')
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_MAX_MB = 200
+COMPRESSION_LEVEL = 3
+
+
+class SnapshotCapture:
+    def __init__(self, directory=DEFAULT_CAPTURE_DIR, mode: str = 'failures', sample_rate: float = DEFAULT_SAMPLE_RATE,
+                 max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f'알 수 없는 저장 모드: {mode}')
+        self.directory = Path(directory)
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='crawl-capture')
+        # 아래 상태는 전용 스레드에서만 접근
+        self._files = None  # deque[(경로, 크기)] 오래된 순
+        self._total = 0
+        self._compressor = None
+
+    def wants(self, failed: bool = False) -> bool:
+        """이번 페이지를 저장할지 (sample 모드는 정상 페이지를 확률적으로)"""
+        if self.mode == 'off':
+            return False
+        if failed or self.mode == 'all':
+            return True
+        return self.mode == 'sample' and random.random() < self.sample_rate
+
+    def save(self, name: str, data):
+        """스냅샷 저장 예약 (바로 반환). 문자열은 압축해 name.zst 로, bytes(스크린샷 등)는 그대로 저장"""
+        return self._executor.submit(self._write, name, data)
+
+    def close(self):
+        """예약된 저장이 끝날 때까지 대기"""
+        self._executor.shutdown(wait=True)
+
+    def _load(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = sorted(
+            (path.stat().st_mtime, path, path.stat().st_size)
+            for path in self.directory.iterdir() if path.is_file()
+        )
+        self._files = deque((path, size) for _, path, size in files)
+        self._total = sum(size for _, size in self._files)
+        self._compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+
+    def _write(self, name: str, data):
+        if self._files is None:
+            self._load()
+        if isinstance(data, str):
+            data = self._compressor.compress(data.encode('utf-8'))
+            name = f'{name}.zst'
+        path = self.directory / name
+        if path.exists():
+            self._total -= path.stat().st_size
+            self._files = deque(item for item in self._files if item[0] != path)
+        path.write_bytes(data)
+        self._files.append((path, len(data)))
+        self._total += len(data)
+        self._enforce_retention()
+        return path
+
+    def _enforce_retention(self):
+        # 방금 쓴 파일은 남긴다
+        while self._total > self.max_bytes and len(self._files) > 1:
+            path, size = self._files.popleft()
+            path.unlink(missing_ok=True)
+            self._total -= size
@@ -0,0 +1,565 @@
+"""크롤러 엔진 (시니어톡톡 목록 → 상세 파이프라인)
+
+crawl_nursinghomes / crawl_nursinghospital 이 공유하는 실행 골격. 명령은 CrawlCommand 를 상속해
+파서(parse_detail), 풍부도 점수(richness), 저장기(make_writer)와 필요하면 저장 후 처리(after_save)만 정의한다.
+
+- 목록: 지역을 샤드로 나눠 샤드마다 브라우저 컨텍스트 하나로 페이지를 넘기며 상세 URL 수집
+- 상세: 작업자 풀(crawl_utils.PagePool)이 httpx(fetchers.HttpFetcher) → 브라우저 순으로 HTML 을 받아 스레드에서 파싱
+- 요청 속도/재시도: 목록·상세 요청이 RateLimiter 하나를 공유하고, 실패하면 RETRY_COUNT 회까지 점점 길게 기다려 다시 시도
+- 프론티어(crawl_frontier.CrawlFrontier): URL 상태/지역 커서/점수/지문 → --resume, --recrawl, 변경 없는 페이지 저장 생략
+- 저장기: add(data, meta) / flush() 가 [(meta, pk 또는 None)] 를 돌려주는 객체
+  (crawl_writer.FacilityBatchWriter 또는 항목마다 바로 저장하는 ImmediateWriter)
+- 지표: 처리 건수(stats), 샤드별 진행(report_progress), 저장기의 DB 저장 시간
+"""
+import asyncio
+import time
+import uuid
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand, CommandError
+from tqdm import tqdm
+
+from .crawl_capture import CAPTURE_MODES, DEFAULT_MAX_MB, DEFAULT_SAMPLE_RATE, SnapshotCapture
+from .crawl_frontier import CrawlFrontier, latest_run_id, section_fingerprints
+from .crawl_utils import PagePool, RateLimiter, format_progress, report_progress, shard_regions
+from .crawl_writer import BatchWriteError
+from .fetchers import HttpFetcher, has_marker
+from .models import CrawlURL
+
+SITE_URL = "https://www.seniortalktalk.com"
+SEARCH_BASE_URL = f"{SITE_URL}/search"
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.1 Safari/537.36"
+)
+# 전국 지역 리스트
+ALL_LOCATIONS = [
+    "서울시/전체", "부산시/전체", "대구시/전체", "인천시/전체",
+    "광주시/전체", "대전시/전체", "울산시/전체", "세종시/전체",
+    "경기도/전체", "강원도/전체", "충청북도/전체", "충청남도/전체",
+    "전라북도/전체", "전라남도/전체", "경상북도/전체", "경상남도/전체",
+    "제주도/전체"
+]
+# 세부 페이지 a 태그 href 패턴 후보들 (실제 DOM 미확인 환경 대응용)
+DETAIL_KEYWORDS = ["detail", "facility", "nursing", "home", "center", "search/view"]
+DETAIL_MARKER = 'section-view-title'  # 정적 HTML 에 이 클래스가 없으면 브라우저로 다시 연다
+
+RETRY_COUNT = 3
+GOTO_TIMEOUT = 60000  # 60s
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RECRAWL_LIMIT = 500
+RECRAWL_REGION = '재수집'  # 재수집 모드의 진행 커서 이름
+EMPTY_PAGE_LIMIT = 3  # 연속으로 상세 링크가 없으면 지역 종료
+
+
+class ImmediateWriter:
+    """배치 없이 항목마다 바로 저장하는 저장기 (FacilityBatchWriter 와 같은 인터페이스)
+
+    save 는 파싱 결과를 받아 저장한 행의 pk(실패하면 None)를 돌려주는 동기 함수.
+    """
+
+    def __init__(self, save):
+        self.save = save
+        self.batches = 0
+        self.written = 0
+        self.seconds = 0.0
+
+    def __len__(self):
+        return 0
+
+    def add(self, data: dict, meta=None) -> list:
+        started = time.perf_counter()
+        pk = self.save(data)
+        self.seconds += time.perf_counter() - started
+        self.batches += 1
+        self.written += pk is not None
+        return [(meta, pk)]
+
+    def flush(self) -> list:
+        return []
+
+    def per_facility_ms(self) -> float:
+        return self.seconds * 1000 / self.written if self.written else 0.0
+
+
+class CrawlCommand(BaseCommand):
+    """시니어톡톡 크롤러 공통 명령. 하위 클래스가 정할 것:
+
+    - crawler: 프론티어 구분값 (models.CRAWLER_CHOICES)
+    - kind: 검색 종류 (요양원/요양병원), unit: 메시지에 쓰는 단위 (시설/병원)
+    - parse_detail(soup, url) -> dict: 상세 파싱 (overview.code 필수, 스레드에서 실행)
+    - richness(data) -> int: 같은 코드의 여러 URL 중 더 풍부한 결과를 고르는 점수
+    - make_writer(options): 저장기
+    - after_save(pk, code): 저장 직후 처리 (선택, 예: 이미지/태그 수집)
+    - on_start(options) / on_finish(): 실행 전후 준비/정리 (선택, 예: 이미지 파이프라인)
+    """
+    crawler = None
+    kind = None
+    unit = '시설'
+    default_concurrency = DEFAULT_CONCURRENCY
+
+    def add_arguments(self, parser):
+        unit = self.unit
+        parser.add_argument("--location", default="전체", help="검색 위치 파라미터 (기본: 전체 - 모든 지역 순회)")
+        parser.add_argument("--max-pages", type=int, default=50, help="각 지역별 최대 크롤 페이지 수 (기본:50)")
+        parser.add_argument("--delay", type=float, default=1.0, help="각 요청 사이 기본 지연(초), --rate 미지정 시 1/delay 회/초")
+        parser.add_argument("--concurrency", type=int, default=self.default_concurrency, help=f"동시에 여는 상세 페이지 수 (기본: {self.default_concurrency})")
+        parser.add_argument("--rate", type=float, default=None, help="전체 요청 속도 상한(회/초, 목록+상세 합계). 작업자 수와 무관하게 유지 (기본: 샤드 수 / delay)")
+        parser.add_argument("--shards", type=int, default=1, help="지역을 나눠 동시에 크롤링할 샤드(브라우저 컨텍스트) 수 (기본: 1)")
+        parser.add_argument("--shard-index", type=int, default=None, help="이 프로세스가 맡을 샤드 번호 (0부터, 여러 프로세스로 나눠 실행할 때)")
+        parser.add_argument("--run-id", default=None, help="샤드 간 중복 제거/진행 상황을 공유할 실행 ID (여러 프로세스는 같은 값 지정)")
+        parser.add_argument("--resume", action="store_true", help="중단된 실행을 이어서 크롤링 (--run-id 미지정 시 가장 최근 실행)")
+        parser.add_argument("--recrawl", action="store_true", help=f"목록 없이 재수집 시각이 지난 {unit}의 상세 페이지만 다시 확인 (변경 잦은 {unit} 우선)")
+        parser.add_argument("--limit", type=int, default=DEFAULT_RECRAWL_LIMIT, help=f"재수집 모드에서 확인할 최대 {unit} 수 (기본: {DEFAULT_RECRAWL_LIMIT})")
+        parser.add_argument("--fetcher", choices=["http", "browser"], default="http", help=f"상세 페이지 수집 방식 (기본: http - httpx 로 받고 {unit} 영역이 없을 때만 브라우저)")
+        parser.add_argument("--capture", choices=CAPTURE_MODES, default="failures", help="crawl_debug/ 디버그 스냅샷 저장 방식 (off/failures/sample/all, 기본: failures)")
+        parser.add_argument("--capture-sample", type=float, default=DEFAULT_SAMPLE_RATE, help=f"sample 모드에서 정상 페이지를 저장할 비율 (기본: {DEFAULT_SAMPLE_RATE})")
+        parser.add_argument("--capture-max-mb", type=int, default=DEFAULT_MAX_MB, help=f"crawl_debug/ 최대 크기(MB), 넘으면 오래된 파일부터 삭제 (기본: {DEFAULT_MAX_MB})")
+        parser.add_argument("--headful", action="store_true", help="브라우저 UI 표시")
+
+    # 플러그인 훅
+    def parse_detail(self, soup, url) -> dict:
+        raise NotImplementedError
+
+    def richness(self, data: dict) -> int:
+        raise NotImplementedError
+
+    def make_writer(self, options):
+        raise NotImplementedError
+
+    async def after_save(self, pk, code):
+        """저장 직후 처리 (기본: 없음)"""
+
+    async def on_start(self, options):
+        """크롤링 시작 전 준비 (기본: 없음)"""
+
+    async def on_finish(self):
+        """마지막 저장 뒤 정리 (기본: 없음)"""
+
+    async def summary_lines(self) -> list:
+        """실행 요약에 덧붙일 줄"""
+        return []
+
+    # 실행
+    def handle(self, *args, **options):
+        try:
+            asyncio.run(self._async_handle(options))
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("사용자 중단"))
+
+    async def _async_handle(self, options):
+        from playwright.async_api import async_playwright  # 지연 import
+
+        location = options["location"]
+        max_pages = options["max_pages"]
+        delay = options["delay"]
+        headless = not options["headful"]
+        concurrency = max(1, options["concurrency"])
+        shards = max(1, options["shards"])
+        shard_index = options["shard_index"]
+        if shard_index is not None and not 0 <= shard_index < shards:
+            raise CommandError(f"--shard-index 는 0 이상 {shards} 미만이어야 합니다.")
+
+        # 특정 지역 지정시 해당 지역만, 아니면 전체 지역 순회
+        if location != "전체":
+            locations_to_crawl = [location if "/" in location else f"{location}/전체"]
+        else:
+            locations_to_crawl = ALL_LOCATIONS
+
+        # 샤드별 지역 (--shard-index 지정 시 이 프로세스는 해당 샤드만)
+        shard_plan = list(enumerate(shard_regions(locations_to_crawl, shards)))
+        if shard_index is not None:
+            shard_plan = [shard_plan[shard_index]]
+        shard_plan = [(shard_no, regions) for shard_no, regions in shard_plan if regions]
+
+        # 요청 간 대기(delay + random) 대신 모든 페이지가 공유하는 속도 제한 (기본: 샤드마다 1/delay 회/초)
+        streams = 1 if options["recrawl"] else len(shard_plan)
+        rate = options["rate"] if options["rate"] is not None else (streams / delay if delay > 0 else 0)
+        self.limiter = RateLimiter(rate)
+        run_id = options["run_id"]
+        if options["resume"] and not run_id:
+            run_id = await sync_to_async(latest_run_id)(self.crawler)
+            if not run_id:
+                raise CommandError("이어서 크롤링할 이전 실행이 없습니다.")
+        run_id = run_id or uuid.uuid4().hex[:12]
+        # 상세 URL 상태/지역 커서/코드별 점수는 DB 프론티어에 기록 (샤드·프로세스 간 공유, --resume 으로 재개)
+        self.frontier = CrawlFrontier(self.crawler, run_id)
+        self.saved_ids = set()
+        # 디버그 스냅샷은 압축해 전용 스레드에서 저장 (이벤트 루프에서 파일 쓰기 없음)
+        self.capture = SnapshotCapture(
+            mode=options["capture"], sample_rate=options["capture_sample"], max_bytes=options["capture_max_mb"] * 1024 * 1024,
+        )
+        self.stats = {'dup_skipped': 0, 'dup_updated': 0, 'unchanged': 0, 'http': 0, 'browser_fallback': 0}
+        # 상세 HTML 은 httpx 로 먼저 (연결 재사용, 목록 페이지와 같은 속도 제한 공유)
+        self.http = HttpFetcher(USER_AGENT, self.limiter, concurrency * max(1, streams)) if options["fetcher"] == "http" else None
+        self.region_saved = {}  # 지역 -> 신규 저장 수
+        self.save_lock = asyncio.Lock()  # 같은 코드를 여러 작업자가 동시에 비교/저장하지 않도록
+        self.writer = self.make_writer(options)
+        self.pending_scores = {}  # 저장 대기 중인 코드 -> 풍부도 점수
+        await self.on_start(options)
+
+        self.stdout.write(f"크롤링 대상 지역: {sum(len(regions) for _, regions in shard_plan)}개")
+        self.stdout.write(f"각 지역별 최대 페이지: {max_pages}")
+        self.stdout.write(f"샤드: {', '.join(str(shard_no) for shard_no, _ in shard_plan)} / {shards} (run-id: {run_id})")
+        self.stdout.write(f"상세 페이지 동시 처리: 샤드당 {concurrency}개, 요청 속도 상한: {rate:.2f}회/초")
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless, args=["--disable-blink-features=AutomationControlled"])
+            self.progress = tqdm(desc="상세", unit="fac")
+            # 코디네이터: 모든 샤드의 진행 상황을 주기적으로 합쳐 출력
+            coordinator = asyncio.create_task(report_progress(self.frontier, self.stdout.write))
+            try:
+                if options["recrawl"]:
+                    await self._recrawl(browser, options["limit"], concurrency)
+                else:
+                    await asyncio.gather(*(
+                        self._crawl_shard(browser, shard_no, regions, max_pages, concurrency)
+                        for shard_no, regions in shard_plan
+                    ))
+            finally:
+                coordinator.cancel()
+                self.progress.close()
+                if self.http is not None:
+                    await self.http.close()
+                await self._flush()
+                await self.on_finish()
+                await browser.close()
+                await asyncio.to_thread(self.capture.close)
+
+        self.stdout.write(f"\n{'='*60}")
+        self.stdout.write(f"전체 크롤링 완료!")
+        self.stdout.write(f"총 {len(self.saved_ids)}개 {self.unit} DB 저장")
+        self.stdout.write(f"중복 스킵: {self.stats['dup_skipped']}, 정보 갱신: {self.stats['dup_updated']}, 변경 없음: {self.stats['unchanged']}")
+        if self.http is not None:
+            self.stdout.write(f"상세 수집: http {self.stats['http']}건, 브라우저 대체 {self.stats['browser_fallback']}건")
+        self.stdout.write(f"DB 저장: 배치 {self.writer.batches}회, {self.unit} {self.writer.written}개, {self.unit}당 {self.writer.per_facility_ms():.1f}ms")
+        self.stdout.write(format_progress(await self.frontier.aprogress_rows()))
+        for line in await self.summary_lines():
+            self.stdout.write(line)
+        self.stdout.write(f"{'='*60}")
+
+    # 브라우저
+    async def _new_context(self, browser):
+        context = await browser.new_context(
+            user_agent=USER_AGENT,
+            locale="ko-KR",
+            java_script_enabled=True,
+            extra_http_headers={
+                "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+                "Referer": f"{SITE_URL}/",
+            },
+            viewport={"width":1280,"height":1600}
+        )
+        # 리소스 절약: 이미지/폰트 차단
+        async def route_intercept(route, request):
+            if request.resource_type in ['image','media','font']:
+                await route.abort()
+            else:
+                await route.continue_()
+        await context.route("**/*", route_intercept)
+        return context
+
+    async def _safe_goto(self, pg, url, expect_selector=None):
+        last_err = None
+        for attempt in range(1, RETRY_COUNT+1):
+            try:
+                await self.limiter.wait()
+                await pg.goto(url, wait_until='domcontentloaded', timeout=GOTO_TIMEOUT)
+                if expect_selector:
+                    try:
+                        await pg.wait_for_selector(expect_selector, timeout=8000)
+                    except Exception:
+                        pass
+                return True
+            except Exception as e:
+                last_err = e
+                self.stderr.write(f"[목록 이동 실패 {attempt}/{RETRY_COUNT}] {e}")
+                await asyncio.sleep(2*attempt)
+        if last_err:
+            await self._capture_screenshot(pg, "fail_list")
+        return False
+
+    async def _capture_screenshot(self, pg, prefix):
+        """실패 화면 저장 (--capture off 면 생략)"""
+        if not self.capture.wants(failed=True):
+            return
+        try:
+            data = await pg.screenshot()
+        except Exception:
+            return
+        self.capture.save(f"{prefix}_{int(asyncio.get_event_loop().time() * 1000)}.png", data)
+
+    async def _fetch_detail(self, dpage, durl):
+        """작업자 페이지로 상세 이동 (작업자별 재시도, 매 시도마다 속도 제한)"""
+        for attempt in range(1, RETRY_COUNT+1):
+            try:
+                await self.limiter.wait()
+                await dpage.goto(durl, wait_until='domcontentloaded', timeout=GOTO_TIMEOUT)
+                await dpage.wait_for_timeout(500)
+                return True
+            except Exception as e:
+                self.stderr.write(f"[상세 이동 실패 {attempt}/{RETRY_COUNT}] {durl} : {e}")
+                if attempt == RETRY_COUNT:
+                    await self._capture_screenshot(dpage, "fail_detail")
+                await asyncio.sleep(1.5*attempt)
+        return False
+
+    async def _detail_html(self, dpage, durl):
+        """상세 HTML: httpx 로 받은 정적 HTML 에 상세 영역이 있으면 그대로, 없으면 작업자 페이지로 다시 열기"""
+        if self.http is not None:
+            html = await self.http.fetch(durl)
+            if has_marker(html, DETAIL_MARKER):
+                self.stats['http'] += 1
+                return html
+            self.stats['browser_fallback'] += 1
+        if not await self._fetch_detail(dpage, durl):
+            return None
+        return await dpage.content()
+
+    async def _auto_scroll(self, pg, max_rounds=8, pause=600):
+        last_height = await pg.evaluate("() => document.body.scrollHeight")
+        for i in range(max_rounds):
+            await pg.evaluate("() => window.scrollBy(0, document.body.scrollHeight)")
+            await pg.wait_for_timeout(pause)
+            new_height = await pg.evaluate("() => document.body.scrollHeight")
+            if new_height == last_height:
+                break
+            last_height = new_height
+
+    # 상세 처리
+    async def _process_detail(self, dpage, item):
+        region, link = item
+        frontier = self.frontier
+        dhtml = None
+        try:
+            dhtml = await self._detail_html(dpage, link)
+            if dhtml is None:
+                await frontier.amark(link, CrawlURL.STATUS_FAILED)
+                return
+            await frontier.amark(link, CrawlURL.STATUS_FETCHED)
+            # HTML 파싱은 스레드에서 (다른 작업자의 네트워크 대기를 막지 않도록)
+            data = await asyncio.to_thread(lambda: self.parse_detail(BeautifulSoup(dhtml, "lxml"), link))
+            code = data.get('overview', {}).get('code')
+            if not code:
+                await frontier.amark(link, CrawlURL.STATUS_FAILED)
+                return
+            richness = self.richness(data)
+            await frontier.amark(link, CrawlURL.STATUS_PARSED, code=code)
+            # 잠금은 점수 비교와 저장기 인계까지만 (저장 후 처리/상태 반영은 잠금 밖에서)
+            async with self.save_lock:
+                best = self.pending_scores.get(code)
+                if best is None:
+                    best = await frontier.abest_score(code)
+                updated = best is not None
+                if updated and richness <= best:
+                    skipped = best
+                elif not updated:
+                    # 이번 실행에서 처음 보는 코드: 이전 실행의 대표 URL 보다 빈약한 중복 URL 이면 건너뜀
+                    skipped = await frontier.ashadowed_score(code, link, richness)
+                else:
+                    skipped = None
+                if skipped is not None:
+                    self.stats['dup_skipped'] += 1
+                    await frontier.amark(link, CrawlURL.STATUS_SKIPPED)
+                    await frontier.aupdate_progress(region, skipped=1)
+                    self.stdout.write(f"[중복-스킵] {code} (기존 점수 {skipped}, 새 점수 {richness})")
+                    return
+                # 이전 수집과 내용이 같으면 DB 저장 생략 (재수집 일정만 갱신)
+                sections = section_fingerprints(data)
+                changed = await frontier.achanged_sections(code, sections)
+                if changed == []:
+                    await frontier.aset_best_score(code, richness, link)
+                    await frontier.arecord_check(code, link, sections, changed)
+                    self.stats['unchanged'] += 1
+                    await frontier.amark(link, CrawlURL.STATUS_SKIPPED)
+                    await frontier.aupdate_progress(region, skipped=1)
+                    self.stdout.write(f"[변경 없음] {code}")
+                    return
+                # 저장기에 넘기고, 저장되면(배치가 차면) 해당 항목들의 상태를 한꺼번에 반영
+                self.pending_scores[code] = richness
+                results = await self._hand_off(data, (region, link, code, richness, sections, changed, updated))
+            await self._apply_results(results)
+        except Exception:
+            await frontier.amark(link, CrawlURL.STATUS_FAILED)
+            if dhtml and self.capture.wants(failed=True):
+                self.capture.save(f"fail_parse_{link.split('?')[0].rstrip('/').rsplit('/', 1)[-1][:40]}.html", dhtml)
+            raise
+        finally:
+            self.progress.update(1)
+
+    async def _hand_off(self, data=None, meta=None) -> list:
+        """저장기에 결과를 넘기고(data 가 없으면 대기 중인 것 저장) 저장된 [(메타, pk 또는 None)] 반환
+
+        save_lock 을 잡은 상태에서 호출한다. 저장된 코드의 점수도 여기서 기록해 다른 작업자의 비교가 어긋나지 않게 한다.
+        """
+        try:
+            if data is None:
+                results = await sync_to_async(self.writer.flush, thread_sensitive=True)()
+            else:
+                results = await sync_to_async(self.writer.add, thread_sensitive=True)(data, meta)
+        except BatchWriteError as e:
+            self.stderr.write(f"[일괄 저장 실패] {len(e.items)}개: {e.__cause__}")
+            results = [(item, None) for item in e.items]
+        for (region, link, code, richness, sections, changed, updated), pk in results:
+            if self.pending_scores.get(code) == richness:
+                del self.pending_scores[code]
+            if pk is not None:
+                await self.frontier.aset_best_score(code, richness, link)
+        return results
+
+    async def _flush(self):
+        """대기 중인 결과를 저장하고 반영"""
+        async with self.save_lock:
+            results = await self._hand_off()
+        await self._apply_results(results)
+
+    async def _apply_results(self, results):
+        """저장된 항목의 저장 후 처리(after_save)와 프론티어 상태/진행 상황 반영 (save_lock 밖에서 호출)"""
+        frontier = self.frontier
+        for (region, link, code, richness, sections, changed, updated), pk in results:
+            if pk is None:
+                await frontier.amark(link, CrawlURL.STATUS_FAILED)
+                continue
+            await frontier.arecord_check(code, link, sections, changed)
+            try:
+                await self.after_save(pk, code)
+            except Exception as e:
+                self.stderr.write(f"[저장 후 처리 오류] {code}: {e}")
+            await frontier.amark(link, CrawlURL.STATUS_SAVED)
+            if updated:
+                self.stats['dup_updated'] += 1
+                await frontier.aupdate_progress(region, updated=1)
+                self.stdout.write(f"[갱신] {code} (점수 {richness})")
+            else:
+                self.saved_ids.add(pk)
+                self.region_saved[region] = self.region_saved.get(region, 0) + 1
+                await frontier.aupdate_progress(region, saved=1)
+                self.stdout.write(f"[저장] {code} (점수 {richness})")
+
+    def _new_pool(self, context, concurrency):
+        return PagePool(context, self._process_detail, concurrency,
+                        on_error=lambda item, e: self.stderr.write(f"[오류] {item[1]}: {e}\n"))
+
+    # 스케줄링
+    async def _recrawl(self, browser, limit, concurrency):
+        """재수집 모드: 목록 페이지 없이 재수집 시각이 지난 상세 페이지만 다시 확인"""
+        await self.frontier.astart_regions(0, [RECRAWL_REGION])
+        pending = await self.frontier.apending_urls(RECRAWL_REGION)
+        due = await self.frontier.adue_urls(limit)
+        self.stdout.write(f"재수집 대상: {len(due)}개 (미완료 {len(pending)}개)")
+        context = await self._new_context(browser)
+        pool = self._new_pool(context, concurrency)
+        pool.start()
+        try:
+            for link in pending:
+                await pool.put((RECRAWL_REGION, link))
+            for link in due:
+                if await self.frontier.aclaim_url(link, RECRAWL_REGION):
+                    await pool.put((RECRAWL_REGION, link))
+            await pool.join()
+            await self._flush()
+            await self.frontier.aupdate_progress(RECRAWL_REGION, done=True)
+        finally:
+            await pool.close()
+            await context.close()
+
+    def list_url(self, region: str, page_no: int) -> str:
+        query = {"kind": self.kind, "keyword": "", "location": region, "sort": "평가등급 순", "filter": "", "page": page_no}
+        return f"{SEARCH_BASE_URL}?{urlencode(query, doseq=True)}"
+
+    async def _detail_links(self, html, region):
+        """목록 HTML → 이번 실행에서 처음 보는 상세 URL (다른 샤드가 이미 가져간 URL 제외)"""
+        soup = BeautifulSoup(html, "lxml")
+        # 후보: list, item, card 등 class 를 가진 a 태그 수집 (일반화)
+        anchors = []
+        for a in soup.find_all("a", href=True):
+            href_lower = a["href"].lower()
+            if "/search/view/" in href_lower:  # 우선 강제 패턴
+                anchors.append(a)
+            elif any(k in href_lower for k in DETAIL_KEYWORDS):
+                anchors.append(a)
+
+        # 중복 제거 & 절대 URL 보정
+        detail_links = []
+        for a in anchors:
+            href = a["href"].strip()
+            if href.startswith("javascript:"):
+                continue
+            if href.startswith("/"):
+                href = SITE_URL + href
+            if href.startswith("http") and await self.frontier.aclaim_url(href, region):
+                detail_links.append(href)
+        return detail_links
+
+    async def _crawl_shard(self, browser, shard_no, regions, max_pages, concurrency):
+        """샤드 하나: 자체 브라우저 컨텍스트/목록 페이지/상세 작업자 풀로 배정된 지역을 순서대로 크롤링"""
+        context = await self._new_context(browser)
+        page = await context.new_page()
+        pool = self._new_pool(context, concurrency)
+        pool.start()
+        try:
+            # 끝나지 않은 지역과 시작 페이지 (재개 시 중단된 페이지부터)
+            start_pages = await self.frontier.astart_regions(shard_no, regions)
+            # 지역별 순회
+            for region_idx, current_location in enumerate(regions, 1):
+                if current_location not in start_pages:
+                    self.stdout.write(f"[샤드{shard_no} {region_idx}/{len(regions)}] {current_location} 이미 완료 - 건너뜀")
+                    continue
+                self.stdout.write(f"\n{'='*60}")
+                self.stdout.write(f"[샤드{shard_no} {region_idx}/{len(regions)}] {current_location} 크롤링 시작")
+                self.stdout.write(f"{'='*60}")
+
+                # 중단 전에 가져갔지만 끝나지 않은 상세 URL 부터 처리
+                pending = await self.frontier.apending_urls(current_location)
+                if pending:
+                    self.stdout.write(f"[{current_location}] 미완료 상세 {len(pending)}개 재처리")
+                for link in pending:
+                    await pool.put((current_location, link))
+
+                empty_page_count = 0
+
+                # 해당 지역의 페이지별 순회 (목록 커서는 샤드마다 따로)
+                for page_no in range(start_pages[current_location], max_pages + 1):
+                    url = self.list_url(current_location, page_no)
+                    self.stdout.write(f"[{current_location}] 페이지 {page_no} 이동: {url}")
+                    await self.frontier.aupdate_progress(current_location, page=page_no)
+
+                    ok = await self._safe_goto(page, url, expect_selector='a')
+                    if not ok:
+                        continue
+
+                    # 자동 스크롤 수행 (동적 로딩 대비)
+                    await self._auto_scroll(page)
+                    html = await page.content()
+                    region_name = current_location.split('/')[0]
+                    detail_links = await self._detail_links(html, current_location)
+
+                    # 디버그 스냅샷 (기본: 상세 링크가 없는 페이지만)
+                    if self.capture.wants(failed=not detail_links):
+                        self.capture.save(f"{region_name}_page{page_no}.html", html)
+                        self.capture.save(f"{region_name}_links_page{page_no}.txt", "\n".join(detail_links))
+
+                    if not detail_links:
+                        empty_page_count += 1
+                        self.stdout.write(f"[{current_location}] 페이지 {page_no} 상세 링크 0개")
+                        # 연속으로 비어있으면 해당 지역 크롤링 종료
+                        if empty_page_count >= EMPTY_PAGE_LIMIT:
+                            self.stdout.write(f"[{current_location}] 연속 {empty_page_count}페이지 비어있음 - 해당 지역 크롤링 종료")
+                            break
+                        continue
+                    empty_page_count = 0  # 링크가 있으면 카운터 리셋
+                    self.stdout.write(f"[{current_location}] 페이지 {page_no} 상세 링크 {len(detail_links)}개")
+
+                    # 상세 페이지는 작업자 풀이 처리 (큐가 가득 차면 목록 수집이 잠시 대기)
+                    for link in detail_links:
+                        await pool.put((current_location, link))
+
+                await pool.join()
+                await self._flush()
+                await self.frontier.aupdate_progress(current_location, done=True)
+                self.stdout.write(f"[{current_location}] 지역 크롤링 완료: 총 {self.region_saved.get(current_location, 0)}개 {self.unit}")
+        finally:
+            await pool.close()
+            await context.close()
@@ -0,0 +1,254 @@
+"""크롤 프론티어 (DB 저장)
+
+상세 URL 별 처리 상태(CrawlURL), 실행별 지역 목록 커서(CrawlCursor), 코드별 최고 풍부도 점수(CrawlRecord)를
+DB 에 기록해 크롤러가 중단되어도 --resume 으로 같은 실행(run_id)을 이어간다.
+같은 run_id 를 쓰는 샤드/프로세스는 URL 중복 제거와 점수를 공유한다.
+
+증분 재수집: 파싱 결과를 섹션별로 해시해 CrawlRecord 에 두고, 지문이 같으면 DB 저장을 생략한다.
+다음 재수집 시각은 변경 이력으로 정한다. 자주 바뀌는 필드(입소 가능 여부/대기/현원)가 바뀌면 최소 간격,
+다른 섹션이 바뀌면 간격을 절반으로, 바뀌지 않으면 두 배로 (MIN~MAX_INTERVAL_HOURS).
+
+크롤러는 asyncio 위에서 돌기 때문에 각 메서드에 sync_to_async 로 감싼 a* 버전을 둔다.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CrawlCursor, CrawlRecord, CrawlURL
+
+MAX_ATTEMPTS = 3  # 실행 안에서 실패한 URL 을 재개 시 다시 시도하는 최대 횟수
+PENDING_STATUSES = (CrawlURL.STATUS_QUEUED, CrawlURL.STATUS_FETCHED, CrawlURL.STATUS_PARSED, CrawlURL.STATUS_FAILED)
+
+VOLATILE_FIELDS = ('availability', 'waiting', 'occupancy')  # 자주 바뀌는 개요 필드
+VOLATILE_SECTION = 'status'
+IGNORED_KEYS = ('raw_text',)  # 광고/날짜 등이 섞여 매번 달라질 수 있는 원문
+MIN_INTERVAL_HOURS = 24
+MAX_INTERVAL_HOURS = 24 * 30
+
+
+def _digest(value) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode()).hexdigest()
+
+
+def section_fingerprints(data: dict) -> dict:
+    """파싱 결과 → {섹션: 해시}. 개요의 자주 바뀌는 필드는 별도 섹션(status)으로 분리"""
+    sections = {}
+    for key, value in data.items():
+        if key in IGNORED_KEYS:
+            continue
+        if key == 'overview' and isinstance(value, dict):
+            sections[VOLATILE_SECTION] = _digest({field: value.get(field) for field in VOLATILE_FIELDS})
+            value = {k: v for k, v in value.items() if k not in IGNORED_KEYS and k not in VOLATILE_FIELDS}
+        sections[key] = _digest(value)
+    return sections
+
+
+def next_interval_hours(previous: int, changed_sections, first: bool = False) -> int:
+    if first or VOLATILE_SECTION in (changed_sections or ()):
+        return MIN_INTERVAL_HOURS
+    if changed_sections:
+        return max(MIN_INTERVAL_HOURS, previous // 2)
+    return min(MAX_INTERVAL_HOURS, previous * 2)
+
+
+def latest_run_id(crawler: str):
+    """가장 최근에 진행된 실행 ID (없으면 None)"""
+    return (
+        CrawlCursor.objects.filter(crawler=crawler)
+        .order_by('-updated_at').values_list('run_id', flat=True).first()
+    )
+
+
+def _async(method):
+    async def wrapper(self, *args, **kwargs):
+        return await sync_to_async(method, thread_sensitive=True)(self, *args, **kwargs)
+    wrapper.__name__ = f'a{method.__name__}'
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class CrawlFrontier:
+    def __init__(self, crawler: str, run_id: str):
+        self.crawler = crawler
+        self.run_id = run_id
+
+    # 상세 URL
+    def claim_url(self, url: str, region: str = '') -> bool:
+        """이번 실행에서 처음 보는 URL 이면 True (같은 실행의 다른 샤드가 먼저 가져갔으면 False)"""
+        try:
+            _, created = CrawlURL.objects.get_or_create(
+                crawler=self.crawler, url=url, defaults={'run_id': self.run_id, 'region': region},
+            )
+        except IntegrityError:  # 다른 프로세스가 동시에 생성
+            return False
+        if created:
+            return True
+        # 이전 실행에서 처리한 URL → 이번 실행으로 가져옴 (동시에 여러 샤드가 시도해도 한 곳만 성공)
+        return CrawlURL.objects.filter(crawler=self.crawler, url=url).exclude(run_id=self.run_id).update(
+            run_id=self.run_id, region=region, code='', status=CrawlURL.STATUS_QUEUED, attempts=0,
+        ) == 1
+
+    def pending_urls(self, region: str) -> list:
+        """이번 실행에서 가져갔지만 끝나지 않은 URL (중단 전 큐에 있던 것, 재시도 가능한 실패)"""
+        return list(
+            CrawlURL.objects.filter(
+                crawler=self.crawler, run_id=self.run_id, region=region, status__in=PENDING_STATUSES,
+                attempts__lt=MAX_ATTEMPTS,
+            ).order_by('pk').values_list('url', flat=True)
+        )
+
+    def mark(self, url: str, status: str, code: str = None):
+        """URL 상태 갱신. fetched/failed 는 시도 횟수를 올린다"""
+        values = {'status': status, 'updated_at': timezone.now()}
+        if status in (CrawlURL.STATUS_FETCHED, CrawlURL.STATUS_FAILED):
+            values['attempts'] = F('attempts') + 1
+        if status == CrawlURL.STATUS_FETCHED:
+            values['last_fetched'] = values['updated_at']
+        if code:
+            values['code'] = code[:64]
+        CrawlURL.objects.filter(crawler=self.crawler, url=url).update(**values)
+
+    # 코드별 점수
+    def best_score(self, code):
+        """이번 실행에서 저장한 코드의 풍부도 점수 (없으면 None)"""
+        if not code:
+            return None
+        return CrawlRecord.objects.filter(crawler=self.crawler, code=code, run_id=self.run_id).values_list(
+            'richness', flat=True).first()
+
+    def set_best_score(self, code, score: int, url: str = ''):
+        if not code:
+            return
+        with transaction.atomic():
+            record, created = CrawlRecord.objects.select_for_update().get_or_create(
+                crawler=self.crawler, code=code, defaults={'run_id': self.run_id, 'richness': score, 'url': url},
+            )
+            if created or (record.run_id == self.run_id and record.richness >= score):
+                return
+            record.run_id = self.run_id
+            record.richness = score
+            record.url = url
+            record.save(update_fields=['run_id', 'richness', 'url', 'updated_at'])
+
+    def shadowed_score(self, code, url: str, score: int):
+        """기록된 대표 URL 이 따로 있고 이 결과가 그보다 빈약하면 기록된 점수, 아니면 None
+
+        best_score 는 이번 실행 기준이라, 새 실행에서 같은 코드의 빈약한 중복 URL 을 먼저 만나면 지문이 달라
+        '변경'으로 저장되고 재수집 간격도 줄어든다. 이런 URL 은 지문 비교 전에 중복으로 건너뛴다.
+        """
+        if not code:
+            return None
+        record = CrawlRecord.objects.filter(crawler=self.crawler, code=code).values_list('url', 'richness').first()
+        if record is None:
+            return None
+        stored_url, stored_score = record
+        if not stored_url or stored_url == url or score >= stored_score:
+            return None
+        return stored_score
+
+    # 내용 지문 / 재수집 일정
+    def changed_sections(self, code, sections: dict):
+        """저장된 지문과 다른 섹션 목록 (기록이 없으면 None = 처음 수집)"""
+        if not code:
+            return None
+        previous = CrawlRecord.objects.filter(crawler=self.crawler, code=code).exclude(fingerprint='').values_list(
+            'section_fingerprints', flat=True).first()
+        if previous is None:
+            return None
+        return sorted(key for key in sections.keys() | previous.keys() if sections.get(key) != previous.get(key))
+
+    def record_check(self, code, url: str, sections: dict, changed):
+        """확인 결과 기록 (DB 저장을 마친 뒤 호출) 후 다음 재수집 시각 계산. changed 는 changed_sections 의 반환값"""
+        if not code:
+            return
+        now = timezone.now()
+        with transaction.atomic():
+            record, created = CrawlRecord.objects.select_for_update().get_or_create(
+                crawler=self.crawler, code=code, defaults={'run_id': self.run_id, 'url': url},
+            )
+            first = changed is None
+            record.interval_hours = next_interval_hours(record.interval_hours, changed, first=first)
+            record.checks += 1
+            if first:
+                record.last_changed = now
+            elif changed:
+                record.changes += 1
+                record.last_changed = now
+                counts = dict(record.section_changes)
+                for key in changed:
+                    counts[key] = counts.get(key, 0) + 1
+                record.section_changes = counts
+            record.fingerprint = _digest(sections)
+            record.section_fingerprints = sections
+            record.url = url or record.url
+            record.last_checked = now
+            record.next_due = now + timedelta(hours=record.interval_hours)
+            record.save()
+
+    def due_urls(self, limit: int, now=None) -> list:
+        """재수집 시각이 지난 상세 URL (오래 밀린 것부터, 같으면 변경이 잦은 것부터)"""
+        now = now or timezone.now()
+        return list(
+            CrawlRecord.objects.filter(crawler=self.crawler, next_due__lte=now).exclude(url='')
+            .order_by('next_due', '-changes').values_list('url', flat=True)[:limit]
+        )
+
+    # 지역 커서
+    def start_regions(self, shard: int, regions) -> dict:
+        """샤드에 배정된 지역의 커서를 만들고 {아직 끝나지 않은 지역: 시작 페이지} 반환 (재개 시 저장된 페이지부터)"""
+        result = {}
+        for region in regions:
+            cursor, _ = CrawlCursor.objects.get_or_create(
+                crawler=self.crawler, run_id=self.run_id, region=region, defaults={'shard': shard},
+            )
+            if cursor.shard != shard:
+                CrawlCursor.objects.filter(pk=cursor.pk).update(shard=shard)
+            if not cursor.done:
+                result[region] = max(1, cursor.page)
+        return result
+
+    def update_progress(self, region: str, page=None, done=False, **counts):
+        """지역 커서 갱신. counts(saved/updated/skipped)는 증가분"""
+        values = {'updated_at': timezone.now()}
+        if page is not None:
+            values['page'] = page
+        if done:
+            values['done'] = True
+        for column in ('saved', 'updated', 'skipped'):
+            if counts.get(column):
+                values[column] = F(column) + counts[column]
+        CrawlCursor.objects.filter(crawler=self.crawler, run_id=self.run_id, region=region).update(**values)
+
+    def progress_rows(self) -> list:
+        """샤드별 진행 상황 (진행 중인 지역/페이지, 처리 건수 합계)"""
+        rows = {}
+        cursors = CrawlCursor.objects.filter(crawler=self.crawler, run_id=self.run_id).order_by('updated_at')
+        for cursor in cursors:
+            row = rows.setdefault(cursor.shard, {
+                'shard': cursor.shard, 'region': None, 'page': None, 'saved': 0, 'updated': 0, 'skipped': 0, 'done': True,
+            })
+            for column in ('saved', 'updated', 'skipped'):
+                row[column] += getattr(cursor, column)
+            if not cursor.done:
+                row['done'] = False
+                if cursor.page:  # 가장 최근에 갱신된 진행 중 지역
+                    row['region'], row['page'] = cursor.region, cursor.page
+        return [rows[shard] for shard in sorted(rows)]
+
+    aclaim_url = _async(claim_url)
+    apending_urls = _async(pending_urls)
+    amark = _async(mark)
+    abest_score = _async(best_score)
+    aset_best_score = _async(set_best_score)
+    ashadowed_score = _async(shadowed_score)
+    astart_regions = _async(start_regions)
+    aupdate_progress = _async(update_progress)
+    aprogress_rows = _async(progress_rows)
+    achanged_sections = _async(changed_sections)
+    arecord_check = _async(record_check)
+    adue_urls = _async(due_urls)
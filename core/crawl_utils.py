@@ -0,0 +1,113 @@
+"""크롤러 공통 유틸
+
+- RateLimiter: 모든 작업자가 공유하는 전역 요청 속도 제한 (초당 요청 수 + 무작위 지연)
+- PagePool: 하나의 브라우저 컨텍스트에서 재사용 페이지 N 개가 asyncio 큐의 항목을 나눠 처리
+- shard_regions / report_progress: 지역을 여러 샤드(브라우저 컨텍스트 또는 프로세스)로 나눠 크롤링할 때
+  지역 분배와 진행 상황 집계 (샤드 간 URL·코드 중복 제거는 core.crawl_frontier 의 DB 프론티어가 담당)
+"""
+import asyncio
+import random
+import time
+
+
+class RateLimiter:
+    """초당 rate 회 이하로 요청 시작 시각을 배정 (간격마다 최대 jitter 비율만큼 무작위로 늘림)
+
+    작업자 수와 무관하게 사이트에 보내는 요청 빈도는 rate 를 넘지 않는다. rate <= 0 이면 제한 없음.
+    """
+
+    def __init__(self, rate: float, jitter: float = 0.5):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.jitter = jitter
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        # 시각 배정만 잠금 안에서 하고 대기는 밖에서 (여러 작업자가 동시에 기다릴 수 있음)
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval * (1 + random.uniform(0, self.jitter))
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class PagePool:
+    """context 의 페이지 concurrency 개로 큐 항목을 handler(page, item) 에 넘겨 처리
+
+    페이지는 작업자별로 한 번 만들어 재사용하고, 닫히거나 크래시가 나면 새로 연다.
+    큐 크기를 제한해 목록 수집(생산자)이 상세 처리보다 너무 앞서지 않게 한다.
+    """
+
+    def __init__(self, context, handler, concurrency: int = 4, on_error=None):
+        self.context = context
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.on_error = on_error
+        self.queue = asyncio.Queue(maxsize=self.concurrency * 4)
+        self._workers = []
+
+    async def _worker(self):
+        page = await self.context.new_page()
+        try:
+            while True:
+                item = await self.queue.get()
+                try:
+                    if item is None:
+                        return
+                    if page.is_closed():
+                        page = await self.context.new_page()
+                    await self.handler(page, item)
+                except Exception as e:
+                    if self.on_error:
+                        self.on_error(item, e)
+                finally:
+                    self.queue.task_done()
+        finally:
+            if not page.is_closed():
+                await page.close()
+
+    def start(self):
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def put(self, item):
+        await self.queue.put(item)
+
+    async def join(self):
+        """지금까지 넣은 항목이 모두 처리될 때까지 대기"""
+        await self.queue.join()
+
+    async def close(self):
+        for _ in self._workers:
+            await self.queue.put(None)
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+def shard_regions(regions, shards: int) -> list:
+    """지역 목록을 shards 개로 라운드로빈 분할 (큰 지역이 한 샤드에 몰리지 않도록 원래 순서 유지)"""
+    shards = max(1, shards)
+    return [regions[idx::shards] for idx in range(shards)]
+
+
+def format_progress(rows) -> str:
+    parts = []
+    for row in rows:
+        position = '완료' if row['done'] else f"{row['region'] or '-'} p{row['page'] or 0}"
+        parts.append(f"샤드{row['shard']} {position} 저장{row['saved']}")
+    total = sum(row['saved'] for row in rows)
+    return f"[진행] {' | '.join(parts)} | 합계 저장 {total}"
+
+
+async def report_progress(frontier, write, interval: float = 30.0):
+    """코디네이터: interval 초마다 모든 샤드(다른 프로세스 포함)의 진행 상황을 합쳐 출력 (취소될 때까지)
+
+    frontier 는 aprogress_rows() 로 샤드별 진행 dict 목록을 돌려주는 객체 (core.crawl_frontier.CrawlFrontier)
+    """
+    while True:
+        await asyncio.sleep(interval)
+        rows = await frontier.aprogress_rows()
+        if rows:
+            write(format_progress(rows))
@@ -0,0 +1,246 @@
+"""크롤러 결과 일괄 저장 (write-behind)
+
+크롤러가 파싱 결과를 add() 로 넘기면 batch_size 개가 모일 때마다 한 트랜잭션으로 저장한다.
+시설마다 get_or_create / 섹션별 삭제·생성을 따로 하던 왕복을 배치당 몇 번의 쿼리로 줄인다.
+- Facility: 새 시설이나 값이 바뀐 시설만 bulk_create(update_conflicts=True) 로 upsert.
+  파싱되지 않은(None) 숫자 필드는 기존 값 유지
+- 하위 항목: 섹션별로 기존 (title, content) 행과 비교해 필요한 추가/수정/삭제만 일괄 반영 (sync_section).
+  바뀌지 않은 행은 id/created_at 이 그대로 남는다
+- 캐시 무효화: 실제로 바뀐 시설의 pk 만 모아 커밋 후 한 번 (bulk 작업은 시그널이 없으므로 명시적으로)
+"""
+import time
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    Facility, FacilityBasic, FacilityEvaluation, FacilityHomepage, FacilityLocation, FacilityNonCovered,
+    FacilityProgram, FacilityStaff,
+)
+from .signals import invalidate_facilities
+
+DEFAULT_BATCH_SIZE = 50
+FACILITY_FIELDS = ('name', 'kind', 'grade', 'availability', 'capacity', 'occupancy', 'waiting')
+KEEP_IF_MISSING = ('capacity', 'occupancy', 'waiting')  # 값이 없으면 기존 값을 덮어쓰지 않음
+TITLE_MAX_LENGTH = 100
+
+OVERVIEW_SECTION = 'overview'  # 변경 집계에서 Facility 행 자체를 가리키는 이름
+HOMEPAGE_SECTION = 'homepage_item'
+
+# (파싱 결과 키, 모델, 항목이 비어 있어도 기존 행을 지우는지)
+SECTIONS = (
+    ('basic_items', FacilityBasic, False),
+    ('evaluation_items', FacilityEvaluation, False),
+    ('staff_items', FacilityStaff, False),
+    ('program_items', FacilityProgram, False),
+    ('location_items', FacilityLocation, True),
+    ('non_covered_items', FacilityNonCovered, True),
+)
+
+
+class BatchWriteError(Exception):
+    """배치 저장 실패. items 는 저장하지 못한 항목의 메타 정보 (add() 에 넘긴 값)"""
+
+    def __init__(self, items):
+        super().__init__(f'{len(items)}개 항목 저장 실패')
+        self.items = items
+
+
+def facility_values(data: dict):
+    """파싱 결과 → Facility 필드 값 (코드가 없으면 None)"""
+    ov = data.get('overview') or {}
+    code = ov.get('code')
+    if not code:
+        return None
+    return {
+        'code': code,
+        'name': ov.get('name') or code,
+        'kind': ov.get('kind') or '',
+        'grade': ov.get('grade') or '',
+        'availability': ov.get('availability') or '',
+        'capacity': ov.get('capacity'),
+        'occupancy': ov.get('occupancy'),
+        'waiting': ov.get('waiting'),
+    }
+
+
+def section_rows(data: dict, key: str) -> list:
+    """하위 항목 목록 → [(title, content)] (제목 없는 항목 제외)"""
+    return [
+        (item['title'][:TITLE_MAX_LENGTH], item.get('content') or '')
+        for item in data.get(key) or [] if item.get('title')
+    ]
+
+
+def sync_section(model, rows_by_facility: dict) -> dict:
+    """시설별 [(title, content)] 를 기존 행과 비교해 필요한 변경만 일괄 반영하고 {시설 pk: (추가, 수정, 삭제)} 반환
+
+    - (title, content) 가 같은 행은 그대로 둔다
+    - 내용만 바뀐 항목은 같은 제목의 기존 행을 수정한다
+    - 나머지 기존 행은 삭제, 나머지 새 항목은 추가
+    바뀐 것이 없는 시설은 결과에 없다.
+    """
+    if not rows_by_facility:
+        return {}
+    existing = defaultdict(list)
+    for pk, facility_id, title, content in (
+        model.objects.filter(facility_id__in=rows_by_facility).order_by('pk')
+        .values_list('pk', 'facility_id', 'title', 'content')
+    ):
+        existing[facility_id].append((pk, title, content))
+
+    now = timezone.now()
+    creates, updates, deletes = [], [], []
+    changes = {}
+    for facility_id, incoming in rows_by_facility.items():
+        unmatched = Counter(incoming)
+        stale = defaultdict(list)  # 제목 -> 새 항목과 일치하지 않는 기존 행 pk
+        for pk, title, content in existing.get(facility_id, ()):
+            if unmatched[(title, content)] > 0:
+                unmatched[(title, content)] -= 1
+            else:
+                stale[title].append(pk)
+        created = updated = 0
+        for title, content in incoming:
+            if unmatched[(title, content)] <= 0:
+                continue
+            unmatched[(title, content)] -= 1
+            if stale.get(title):
+                updates.append(model(pk=stale[title].pop(0), facility_id=facility_id, content=content, updated_at=now))
+                updated += 1
+            else:
+                creates.append(model(facility_id=facility_id, title=title, content=content))
+                created += 1
+        removed = [pk for pks in stale.values() for pk in pks]
+        deletes.extend(removed)
+        if created or updated or removed:
+            changes[facility_id] = (created, updated, len(removed))
+
+    # 삭제를 먼저 (OneToOne 인 홈페이지는 기존 행을 지운 뒤에 추가해야 함)
+    if deletes:
+        model.objects.filter(pk__in=deletes).delete()
+    if updates:
+        model.objects.bulk_update(updates, ['content', 'updated_at'])
+    if creates:
+        model.objects.bulk_create(creates)
+    return changes
+
+
+def write_facilities(payloads):
+    """파싱 결과 여러 개를 한 트랜잭션으로 저장 (같은 코드는 마지막 결과만)
+
+    ({코드: 시설 pk}, {시설 pk: {섹션: (추가, 수정, 삭제)}}) 반환. 두 번째 값에는 실제로 바뀐 시설/섹션만 있고
+    Facility 행 자체의 변경은 'overview' 섹션으로 센다.
+    """
+    batch = {}
+    for data in payloads:
+        values = facility_values(data)
+        if values is not None:
+            batch[values['code']] = (values, data)
+    if not batch:
+        return {}, {}
+
+    changes = defaultdict(dict)
+    with transaction.atomic():
+        existing = {
+            facility.code: facility
+            for facility in Facility.objects.filter(code__in=batch).only('code', *FACILITY_FIELDS)
+        }
+        rows = []
+        for code, (values, _) in batch.items():
+            current = existing.get(code)
+            if current is None:
+                rows.append(Facility(**values))
+                continue
+            for field in KEEP_IF_MISSING:
+                if values[field] is None:
+                    values[field] = getattr(current, field)
+            if any(getattr(current, field) != values[field] for field in FACILITY_FIELDS):
+                rows.append(Facility(**values))
+                changes[current.pk][OVERVIEW_SECTION] = (0, 1, 0)
+        pks = {code: facility.pk for code, facility in existing.items()}
+        if rows:
+            Facility.objects.bulk_create(
+                rows, update_conflicts=True, unique_fields=['code'], update_fields=[*FACILITY_FIELDS, 'updated_at'],
+            )
+            created_codes = [row.code for row in rows if row.code not in pks]
+            if created_codes:
+                pks.update(Facility.objects.filter(code__in=created_codes).values_list('code', 'pk'))
+                for code in created_codes:
+                    changes[pks[code]][OVERVIEW_SECTION] = (1, 0, 0)
+
+        # 하위 항목 (섹션별 차이만 반영)
+        for key, model, replace_empty in SECTIONS:
+            section = {
+                pks[code]: section_rows(data, key)
+                for code, (_, data) in batch.items() if replace_empty or data.get(key)
+            }
+            for facility_id, counts in sync_section(model, section).items():
+                changes[facility_id][key] = counts
+        # 홈페이지 (OneToOne, 항목이 있을 때만 교체)
+        homepages = {
+            pks[code]: [(data[HOMEPAGE_SECTION]['title'][:TITLE_MAX_LENGTH], data[HOMEPAGE_SECTION].get('content') or '')]
+            for code, (_, data) in batch.items() if data.get(HOMEPAGE_SECTION)
+        }
+        for facility_id, counts in sync_section(FacilityHomepage, homepages).items():
+            changes[facility_id][HOMEPAGE_SECTION] = counts
+        if changes:
+            invalidate_facilities(*changes)
+    return pks, dict(changes)
+
+
+class FacilityBatchWriter:
+    """write-behind 저장기. add() 로 쌓다가 batch_size 개마다 (또는 flush() 호출 시) 저장
+
+    batches/written/seconds 에 배치 수, 저장한 시설 수, DB 저장에 걸린 시간을,
+    section_counts 에 섹션별 {'created', 'updated', 'deleted'} 행 수를, changed_ids 에 실제로 바뀐 시설 pk 를 누적한다.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.batch_size = max(1, batch_size)
+        self._pending = []  # [(파싱 결과, 메타)]
+        self.batches = 0
+        self.written = 0
+        self.seconds = 0.0
+        self.section_counts = defaultdict(Counter)
+        self.changed_ids = set()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, data: dict, meta=None) -> list:
+        """저장 대기열에 추가. 배치가 차면 저장하고 [(메타, 시설 pk 또는 None)] 반환 (아니면 빈 목록)"""
+        self._pending.append((data, meta))
+        if len(self._pending) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self) -> list:
+        """대기 중인 결과를 저장하고 [(메타, 시설 pk 또는 None)] 반환. 실패하면 대기열을 비우고 BatchWriteError"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        started = time.perf_counter()
+        try:
+            pks, changes = write_facilities([data for data, _ in pending])
+        except Exception as e:
+            raise BatchWriteError([meta for _, meta in pending]) from e
+        self.seconds += time.perf_counter() - started
+        self.batches += 1
+        self.written += len(pks)
+        self.changed_ids.update(changes)
+        for sections in changes.values():
+            for key, (created, updated, deleted) in sections.items():
+                self.section_counts[key].update(created=created, updated=updated, deleted=deleted)
+        return [(meta, pks.get((facility_values(data) or {}).get('code'))) for data, meta in pending]
+
+    def changes_summary(self) -> str:
+        """섹션별 변경 행 수 요약 (예: 'basic_items +2 ~1 -0, ...')"""
+        return ', '.join(
+            f"{key} +{counts['created']} ~{counts['updated']} -{counts['deleted']}"
+            for key, counts in sorted(self.section_counts.items())
+        ) or '없음'
+
+    def per_facility_ms(self) -> float:
+        return self.seconds * 1000 / self.written if self.written else 0.0
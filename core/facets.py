@@ -0,0 +1,93 @@
+"""목록 필터 패싯 개수
+
+현재 필터 상태에서 각 선택지(등급/시도/시군구/운영상태/설립·규모 태그)를 골랐을 때의 시설 수를 계산한다.
+차원마다 자기 자신의 필터만 뺀 조건으로 GROUP BY 집계 한 번씩 실행하며(선택지 수와 무관),
+결과는 전역 데이터 세대 + 필터 조합을 키로 캐시한다.
+비트맵 색인(core/bitmap_index.py)이 켜져 있으면 DB 대신 색인의 popcount 로 계산한다.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from . import bitmap_index
+from .caching import get_data_generation
+from .filters import filter_facilities
+from .models import Facility, Tag
+
+FACET_FIELDS = ('grade', 'sido', 'sigungu', 'availability')
+
+# 태그 기반 필터 선택지 (facility_list.html 의 칩과 동일)
+FACET_TAGS = {
+    'establishment': ['신규시설', '5년이내', '10년이내', '10년이상'],
+    'size': ['대형', '중형', '소형'],
+}
+
+FACET_CACHE_KEY = 'core:facets:{generation}:{digest}'
+FACET_CACHE_TIMEOUT = 60 * 10
+
+
+def _excluding(filters: dict, dimension: str) -> dict:
+    """해당 차원의 필터만 해제 (시도를 해제하면 시군구도 함께)"""
+    excluded = {**filters, dimension: ''}
+    if dimension == 'sido':
+        excluded['sigungu'] = ''
+    return excluded
+
+
+def compute_facets(filters: dict) -> dict:
+    facets = {}
+    for field in FACET_FIELDS:
+        if field == 'sigungu' and not filters.get('sido'):
+            facets[field] = {}
+            continue
+        rows = (
+            filter_facilities(Facility.objects.all(), _excluding(filters, field))
+            .order_by().values_list(field).annotate(count=Count('pk', distinct=True))
+        )
+        facets[field] = {value: count for value, count in rows if value}
+
+    for dimension, names in FACET_TAGS.items():
+        matching = filter_facilities(Facility.objects.all(), _excluding(filters, dimension)).values('pk')
+        rows = (
+            Tag.objects.filter(name__in=names)
+            .annotate(count=Count('facilities', filter=Q(facilities__in=matching), distinct=True))
+            .values_list('name', 'count')
+        )
+        counts = dict(rows)
+        facets[dimension] = {name: counts.get(name, 0) for name in names}
+    return facets
+
+
+def bitmap_facets(index, filters: dict):
+    """compute_facets 와 같은 결과를 비트맵 색인으로 계산. 색인이 처리할 수 없는 필터면 None"""
+    if index.match(filters) is None:
+        return None
+    facets = {}
+    for field in FACET_FIELDS:
+        if field == 'sigungu' and not filters.get('sido'):
+            facets[field] = {}
+            continue
+        bitmap = index.match(_excluding(filters, field))
+        counts = {value: (bitmap & value_bitmap).bit_count() for value, value_bitmap in index.values[field].items() if value}
+        facets[field] = {value: count for value, count in counts.items() if count}
+    for dimension, names in FACET_TAGS.items():
+        bitmap = index.match(_excluding(filters, dimension))
+        facets[dimension] = {name: (bitmap & index.tags.get(name, 0)).bit_count() for name in names}
+    return facets
+
+
+def get_facets(filters: dict) -> dict:
+    index = bitmap_index.get_index()
+    if index is not None:
+        facets = bitmap_facets(index, filters)
+        if facets is not None:
+            return facets
+    items = sorted((k, v) for k, v in filters.items() if k not in ('sort', 'lat', 'lng') and v)
+    digest = hashlib.md5(repr(items).encode('utf-8')).hexdigest()
+    key = FACET_CACHE_KEY.format(generation=get_data_generation(), digest=digest)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(filters)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
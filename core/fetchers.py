@@ -0,0 +1,118 @@
+"""상세 페이지 수집기
+
+상세 페이지 파서는 정적 마크업만 읽으므로 httpx 비동기 클라이언트(연결 풀/keep-alive, h2 패키지가 있으면 HTTP/2)로
+HTML 을 바로 받고, 기대하는 표시(marker 클래스)가 없을 때만 Playwright 브라우저로 다시 연다.
+
+- HttpFetcher: httpx 로 HTML 수집 (실패/404 는 None)
+- BrowserFetcher: 브라우저 컨텍스트의 페이지 N 개를 돌려 쓰며 렌더링된 HTML 수집 (대체 경로와 비교 측정용)
+"""
+import asyncio
+import importlib.util
+import re
+
+import httpx
+
+HTTP_TIMEOUT = 30.0
+GOTO_TIMEOUT = 60000  # ms
+RETRY_COUNT = 3
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Referer": "https://www.seniortalktalk.com/",
+}
+
+
+def http2_available() -> bool:
+    """HTTP/2 는 선택 의존성(h2)이 설치된 경우에만 사용"""
+    return importlib.util.find_spec('h2') is not None
+
+
+def has_marker(html, css_class: str) -> bool:
+    """HTML 에 css_class 를 가진 요소가 있는지 (파싱 없이 정규식으로 확인)"""
+    if not html:
+        return False
+    pattern = r'class\s*=\s*["\'](?:[^"\']*\s)?' + re.escape(css_class) + r'(?:\s|["\'])'
+    return re.search(pattern, html) is not None
+
+
+class HttpFetcher:
+    """httpx 기반 수집기. limiter(crawl_utils.RateLimiter)를 주면 모든 요청이 속도 제한을 공유"""
+    name = 'http'
+
+    def __init__(self, user_agent: str, limiter=None, concurrency: int = 4, headers=None):
+        self.limiter = limiter
+        self.http2 = http2_available()
+        concurrency = max(1, concurrency)
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            headers={"User-Agent": user_agent, **DEFAULT_HEADERS, **(headers or {})},
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+        )
+
+    async def fetch(self, url: str):
+        for attempt in range(1, RETRY_COUNT + 1):
+            try:
+                if self.limiter is not None:
+                    await self.limiter.wait()
+                response = await self.client.get(url)
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                return response.text
+            except httpx.HTTPError:
+                if attempt == RETRY_COUNT:
+                    return None
+                await asyncio.sleep(1.5 * attempt)
+        return None
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class BrowserFetcher:
+    """Playwright 컨텍스트의 페이지를 최대 concurrency 개 만들어 돌려 쓰는 수집기"""
+    name = 'browser'
+
+    def __init__(self, context, limiter=None, concurrency: int = 4):
+        self.context = context
+        self.limiter = limiter
+        self.concurrency = max(1, concurrency)
+        self._idle = asyncio.Queue()
+        self._created = 0
+        self._pages = []
+
+    async def _acquire(self):
+        if self._idle.empty() and self._created < self.concurrency:
+            self._created += 1
+            page = await self.context.new_page()
+            self._pages.append(page)
+            return page
+        return await self._idle.get()
+
+    async def fetch(self, url: str):
+        page = await self._acquire()
+        try:
+            for attempt in range(1, RETRY_COUNT + 1):
+                try:
+                    if self.limiter is not None:
+                        await self.limiter.wait()
+                    await page.goto(url, wait_until='domcontentloaded', timeout=GOTO_TIMEOUT)
+                    return await page.content()
+                except Exception:
+                    if attempt == RETRY_COUNT:
+                        return None
+                    if page.is_closed():
+                        page = await self.context.new_page()
+                        self._pages.append(page)
+                    await asyncio.sleep(1.5 * attempt)
+            return None
+        finally:
+            self._idle.put_nowait(page)
+
+    async def close(self):
+        for page in self._pages:
+            if not page.is_closed():
+                await page.close()
+        self._pages = []
@@ -0,0 +1,144 @@
+"""시설 목록 필터/정렬
+
+FacilityListView, 조건부 요청 검증값 계산 등에서 같은 필터 로직을 공유한다.
+"""
+from django.db.models import Case, Exists, F, OuterRef, When, Value, IntegerField
+
+from .geo import nearest
+from .models import HospitalAttribute
+from .search import search_facilities
+
+FILTER_KEYS = ('sido', 'sigungu', 'grade', 'availability', 'kind', 'has_images', 'establishment', 'size', 'search', 'sort', 'lat', 'lng', 'max_cost')
+
+HOSPITAL_FILTER_KEYS = ('sido', 'sigungu', 'grade', 'min_doctors', 'min_beds', 'specialist', 'department', 'search')
+
+NEARBY_LIST_LIMIT = 200  # 거리순 정렬 시 가까운 순으로 최대 개수
+
+GRADE_ORDER = ['A등급', 'B등급', 'C등급', 'D등급', 'E등급', '등급외']
+
+
+def get_facility_filters(params) -> dict:
+    """GET 파라미터 → 필터 dict (템플릿 current_filters 와 동일한 형태)"""
+    filters = {key: params.get(key, '') for key in FILTER_KEYS}
+    filters['search'] = filters['search'].strip()
+    # 기본: 검색어가 있으면 검색 정확도, 없으면 등급 정렬
+    filters['sort'] = params.get('sort') or ('relevance' if filters['search'] else 'grade')
+    return filters
+
+
+def filter_facilities(queryset, filters: dict):
+    """정렬을 제외한 필터 적용"""
+    sido = filters.get('sido')
+    sigungu = filters.get('sigungu')
+
+    # 지역 필터링
+    if sido and sido != '전체':
+        queryset = queryset.filter(sido=sido)
+        if sigungu:
+            queryset = queryset.filter(sigungu=sigungu)
+
+    # 평가등급 필터링
+    if filters.get('grade'):
+        queryset = queryset.filter(grade=filters['grade'])
+
+    # 운영상태(입소가능 등) 필터링
+    if filters.get('availability'):
+        queryset = queryset.filter(availability=filters['availability'])
+    if filters.get('kind'):
+        queryset = queryset.filter(kind=filters['kind'])
+    if filters.get('has_images'):
+        queryset = queryset.filter(has_images=filters['has_images'] in ('1', 'true', 'True'))
+
+    # 비급여 월 합계 상한 (FacilityCost 로 계산된 값, 정보가 없는 시설은 제외)
+    max_cost = parse_max_cost(filters.get('max_cost'))
+    if max_cost is not None:
+        queryset = queryset.filter(noncovered_monthly_total__lte=max_cost)
+
+    # 태그 기반 필터링
+    for tag_name in (filters.get('establishment'), filters.get('size')):
+        if tag_name:
+            queryset = queryset.filter(tags__name__icontains=tag_name)
+
+    # 검색(시설명/주소/태그/프로그램, 검색 색인 사용)
+    if filters.get('search'):
+        queryset = search_facilities(queryset, filters['search'], ranked=False)
+
+    return queryset
+
+
+def parse_max_cost(value):
+    """'300000' / '300,000' → 정수(원), 잘못된 값은 None"""
+    try:
+        value = int(str(value or '').replace(',', '').strip())
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+def grade_order_expression():
+    return Case(
+        *[When(grade=grade, then=Value(idx)) for idx, grade in enumerate(GRADE_ORDER, 1)],
+        default=Value(len(GRADE_ORDER) + 1),
+        output_field=IntegerField()
+    )
+
+
+def order_facilities(queryset, sort: str):
+    if sort in ('grade', 'relevance'):
+        return queryset.annotate(_grade_order=grade_order_expression()).order_by('_grade_order', 'name')
+    if sort == 'cost':
+        # 비급여 월 합계 오름차순, 정보 없는 시설은 마지막
+        return queryset.order_by(F('noncovered_monthly_total').asc(nulls_last=True), 'name')
+    # 이름 오름차순
+    return queryset.order_by('name')
+
+
+def order_by_distance(queryset, point, limit: int = NEARBY_LIST_LIMIT):
+    """가까운 순으로 최대 limit 개. (쿼리셋, {pk: 거리 km}) 반환"""
+    ranked = nearest(queryset, *point, k=limit)
+    if not ranked:
+        return queryset.none(), {}
+    ordering = Case(
+        *[When(pk=pk, then=Value(idx)) for idx, (pk, _) in enumerate(ranked)],
+        output_field=IntegerField()
+    )
+    queryset = queryset.filter(pk__in=[pk for pk, _ in ranked]).annotate(_distance_order=ordering).order_by('_distance_order')
+    return queryset, dict(ranked)
+
+
+def _min_value(params, key):
+    value = str(params.get(key) or '').strip()
+    return int(value) if value.isdigit() else None
+
+
+def get_hospital_filters(params) -> dict:
+    return {key: (params.get(key) or '').strip() for key in HOSPITAL_FILTER_KEYS}
+
+
+def filter_hospitals(queryset, filters: dict):
+    """요양병원 목록/API 공통 필터 (합계 컬럼과 HospitalAttribute 인덱스 사용)"""
+    sido = filters.get('sido')
+    if sido and sido != '전체':
+        queryset = queryset.filter(sido=sido)
+        if filters.get('sigungu'):
+            queryset = queryset.filter(sigungu=filters['sigungu'])
+    if filters.get('grade'):
+        queryset = queryset.filter(grade=filters['grade'])
+
+    min_doctors = _min_value(filters, 'min_doctors')
+    if min_doctors is not None:
+        queryset = queryset.filter(doctor_total__gte=min_doctors)
+    min_beds = _min_value(filters, 'min_beds')
+    if min_beds is not None:
+        queryset = queryset.filter(bed_total__gte=min_beds)
+
+    # 과목별 전문의가 1명 이상 (여러 과목은 모두 만족, EXISTS 로 중복 행 없이)
+    for key in ('specialist', 'department'):
+        for name in dict.fromkeys(v.strip() for v in (filters.get(key) or '').split(',') if v.strip()):
+            queryset = queryset.filter(Exists(HospitalAttribute.objects.filter(
+                hospital=OuterRef('pk'), kind=key, name=name, count__gt=0,
+            )))
+
+    if filters.get('search'):
+        queryset = queryset.filter(name__icontains=filters['search'])
+    return queryset
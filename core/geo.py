@@ -0,0 +1,208 @@
+"""위치 기반 검색 (geohash)
+
+위도/경도 각각의 B-tree 인덱스로는 반경 검색을 처리할 수 없으므로
+좌표를 geohash 문자열로 인코딩해 인덱스 컬럼(geohash)에 저장하고,
+접두어 검색으로 주변 셀의 후보만 가져온 뒤 haversine 거리로 정렬한다.
+지도 화면(bbox)에서는 geohash 접두어를 격자 셀로 사용해 서버에서 클러스터링한다.
+"""
+import math
+
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import Substr
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 7  # 저장 정밀도 (약 150m x 150m)
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+NEARBY_DEFAULT_K = 10
+NEARBY_MAX_K = 50
+
+# 지도 응답 크기 상한 (줌 레벨과 무관하게 유지)
+MAP_MAX_POINTS = 300
+MAP_MAX_CLUSTERS = 400
+
+
+def encode(lat, lng, precision: int = GEOHASH_PRECISION) -> str:
+    lat, lng = float(lat), float(lng)
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 짝수 비트는 경도
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def geohash_for(lat, lng) -> str:
+    """모델 저장용. 좌표가 없으면 빈 문자열"""
+    if lat is None or lng is None:
+        return ''
+    return encode(lat, lng)
+
+
+def cell_size(precision: int) -> tuple:
+    """(위도 폭, 경도 폭) 단위: 도"""
+    total_bits = precision * 5
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def neighbors(lat, lng, precision: int) -> list:
+    """좌표가 속한 셀과 주변 8개 셀의 geohash (중복 제거)"""
+    lat, lng = float(lat), float(lng)
+    lat_size, lng_size = cell_size(precision)
+    cells = []
+    for dlat in (-1, 0, 1):
+        for dlng in (-1, 0, 1):
+            cell_lat = min(max(lat + dlat * lat_size, -89.999999), 89.999999)
+            cell_lng = (lng + dlng * lng_size + 180.0) % 360.0 - 180.0
+            cell = encode(cell_lat, cell_lng, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def covered_radius_km(lat, precision: int) -> float:
+    """3x3 셀 블록이 중심 좌표로부터 최소한 보장하는 반경"""
+    lat_size, lng_size = cell_size(precision)
+    return min(lat_size * KM_PER_DEGREE, lng_size * KM_PER_DEGREE * math.cos(math.radians(float(lat))))
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def parse_point(params):
+    """GET 파라미터의 lat/lng → (lat, lng) 또는 None"""
+    try:
+        lat = float(params.get('lat', ''))
+        lng = float(params.get('lng', ''))
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+def parse_bbox(value):
+    """'south,west,north,east' → (south, west, north, east) 또는 None"""
+    try:
+        south, west, north, east = (float(v) for v in (value or '').split(','))
+    except ValueError:
+        return None
+    if not (-90 <= south < north <= 90 and -180 <= west < east <= 180):
+        return None
+    return south, west, north, east
+
+
+def cluster_precision(bbox, max_cells: int = MAP_MAX_CLUSTERS) -> int:
+    """bbox 를 덮는 셀 수가 max_cells 이하가 되는 가장 세밀한 geohash 정밀도"""
+    south, west, north, east = bbox
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lng_size = cell_size(precision)
+        cells = (math.ceil((north - south) / lat_size) + 1) * (math.ceil((east - west) / lng_size) + 1)
+        if cells <= max_cells:
+            return precision
+    return 1
+
+
+def map_features(queryset, bbox, max_points: int = MAP_MAX_POINTS, max_clusters: int = MAP_MAX_CLUSTERS) -> dict:
+    """bbox 안의 개별 좌표(max_points 이하일 때) 또는 geohash 셀별 클러스터"""
+    south, west, north, east = bbox
+    in_box = (
+        queryset.exclude(geohash='')
+        .filter(latitude__range=(south, north), longitude__range=(west, east))
+        .order_by()
+    )
+    total = in_box.count()
+    if total <= max_points:
+        points = [
+            {'id': pk, 'code': code, 'name': name, 'grade': grade, 'lat': float(lat), 'lng': float(lng)}
+            for pk, code, name, grade, lat, lng
+            in in_box.values_list('pk', 'code', 'name', 'grade', 'latitude', 'longitude')
+        ]
+        return {'mode': 'points', 'total': total, 'points': points}
+
+    precision = cluster_precision(bbox, max_clusters)
+    rows = (
+        in_box.annotate(cell=Substr('geohash', 1, precision))
+        .values('cell')
+        .annotate(count=Count('pk'), lat=Avg('latitude'), lng=Avg('longitude'))
+        .order_by('cell')
+    )
+    clusters = [
+        {'cell': row['cell'], 'count': row['count'], 'lat': round(float(row['lat']), 6), 'lng': round(float(row['lng']), 6)}
+        for row in rows
+    ]
+    return {'mode': 'clusters', 'total': total, 'precision': precision, 'clusters': clusters}
+
+
+def _ranked(rows, lat, lng, k, max_km):
+    ranked = sorted(
+        (haversine_km(lat, lng, row_lat, row_lng), pk)
+        for pk, row_lat, row_lng in rows
+    )
+    if max_km is not None:
+        ranked = [item for item in ranked if item[0] <= max_km]
+    return [(pk, distance) for distance, pk in ranked[:k]]
+
+
+def nearest(queryset, lat, lng, k: int = NEARBY_DEFAULT_K, max_km=None) -> list:
+    """queryset 중 (lat, lng) 에서 가까운 k 개의 [(pk, 거리 km)]
+
+    정밀도를 낮춰 가며 3x3 셀 블록을 검색하고, k 번째 거리가 블록이 보장하는 반경 안에 들면 확정한다.
+    끝까지 부족하면 좌표가 있는 전체 행을 대상으로 계산한다.
+    """
+    base = queryset.exclude(geohash='').order_by().distinct()
+    for precision in range(GEOHASH_PRECISION - 1, 1, -1):
+        radius = covered_radius_km(lat, precision)
+        prefix_q = Q()
+        for cell in neighbors(lat, lng, precision):
+            prefix_q |= Q(geohash__startswith=cell)
+        rows = base.filter(prefix_q).values_list('pk', 'latitude', 'longitude')
+        result = _ranked(rows, lat, lng, k, max_km)
+        if max_km is not None and max_km <= radius:
+            return result
+        if len(result) >= k and result[-1][1] <= radius:
+            return result
+    rows = base.values_list('pk', 'latitude', 'longitude')
+    return _ranked(rows, lat, lng, k, max_km)
+
+
+def nearest_naive(queryset, lat, lng, k: int = NEARBY_DEFAULT_K, max_km=None) -> list:
+    """비교용: 좌표가 있는 전체 행에 대해 haversine 계산 (인덱스 미사용)"""
+    rows = (
+        queryset.filter(latitude__isnull=False, longitude__isnull=False)
+        .order_by().distinct().values_list('pk', 'latitude', 'longitude')
+    )
+    return _ranked(rows, lat, lng, k, max_km)
+
+
+def attach_distances(objects, ranked) -> list:
+    """[(pk, 거리)] 순서대로 객체를 정렬하고 distance_km 속성을 붙여 반환"""
+    by_pk = {obj.pk: obj for obj in objects}
+    result = []
+    for pk, distance in ranked:
+        obj = by_pk.get(pk)
+        if obj is not None:
+            obj.distance_km = round(distance, 3)
+            result.append(obj)
+    return result
@@ -0,0 +1,64 @@
+"""요양병원 속성 정규화
+
+Hospital 의 JSON 필드(bed_count, doctor_count, specialist_by_department, department_specialists, other_staff)는
+"상급 : 21 명" 같은 표시용 문자열이라 조건 검색 시 모든 행을 파이썬에서 읽어야 한다.
+이를 (병원, 구분, 항목명, 수) 행(HospitalAttribute)과 합계 컬럼(doctor_total, bed_total)으로 저장해 인덱스로 검색한다.
+"""
+from django.db import transaction
+
+from .models import Hospital, HospitalAttribute
+from .parsing import parse_bed_count, parse_count
+
+# 구분 → (Hospital JSON 필드, 파서)
+ATTRIBUTE_SOURCES = {
+    'bed': ('bed_count', parse_bed_count),
+    'doctor': ('doctor_count', parse_count),
+    'specialist': ('specialist_by_department', parse_count),
+    'department': ('department_specialists', parse_count),
+    'staff': ('other_staff', parse_count),
+}
+SOURCE_FIELDS = [field for field, _ in ATTRIBUTE_SOURCES.values()]
+TOTAL_KEYWORDS = ('합계', '총')
+
+
+def attribute_items(hospital) -> list:
+    """병원 → [(구분, 항목명, 수)] (숫자를 읽을 수 없는 항목은 제외)"""
+    items = {}
+    for kind, (field, parser) in ATTRIBUTE_SOURCES.items():
+        values = getattr(hospital, field) or {}
+        if not isinstance(values, dict):
+            continue
+        for name, text in values.items():
+            name = (name or '').strip()[:100]
+            count = parser(text)
+            if name and count is not None:
+                items.setdefault((kind, name), count)  # 공백 정리 후 같은 이름은 처음 값 사용
+    return [(kind, name, count) for (kind, name), count in items.items()]
+
+
+def kind_total(items, kind):
+    """구분별 합계. '합계/총' 항목이 있으면 그 값, 없으면 항목 합. 항목이 없으면 None"""
+    counts = {name: count for item_kind, name, count in items if item_kind == kind}
+    if not counts:
+        return None
+    for name, count in counts.items():
+        if any(keyword in name for keyword in TOTAL_KEYWORDS):
+            return count
+    return sum(counts.values())
+
+
+def sync_hospital_attributes(pks) -> int:
+    """지정한 병원들의 HospitalAttribute/합계 컬럼을 다시 계산. 생성한 행 수 반환"""
+    hospitals = list(Hospital.objects.filter(pk__in=list(pks)).only('pk', 'doctor_total', 'bed_total', *SOURCE_FIELDS))
+    rows = []
+    for hospital in hospitals:
+        items = attribute_items(hospital)
+        rows.extend(HospitalAttribute(hospital_id=hospital.pk, kind=kind, name=name, count=count) for kind, name, count in items)
+        hospital.doctor_total = kind_total(items, 'doctor')
+        hospital.bed_total = kind_total(items, 'bed')
+
+    with transaction.atomic():
+        HospitalAttribute.objects.filter(hospital__in=hospitals).delete()
+        HospitalAttribute.objects.bulk_create(rows, batch_size=1000)
+        Hospital.objects.bulk_update(hospitals, ['doctor_total', 'bed_total'], batch_size=500)
+    return len(rows)
@@ -0,0 +1,100 @@
+"""HTTP 조건부 요청(ETag/Last-Modified) 및 Cache-Control 헬퍼
+
+각 읽기 뷰는 관련 객체들의 max(updated_at) 으로 검증값을 만들고,
+일치하면 본문 생성 없이 304 를 반환한다.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .loaders import SECTION_MODELS
+from .models import Facility, FacilityHomepage, FacilityImage
+
+# 뷰별 Cache-Control 정책. 공개 HTML 페이지는 로그인 상태를 본문에 넣지 않으므로(navbar public_page)
+# 세션을 읽지 않아 Vary: Cookie 없이 공유 캐시에 저장될 수 있다
+CACHE_POLICIES = {
+    'facility_list': {'public': True, 'max_age': 60},
+    'facility_detail': {'public': True, 'max_age': 300},
+    'facility_api': {'public': True, 'max_age': 300},
+    'hospital_list': {'public': True, 'max_age': 60},
+    'hospital_detail': {'public': True, 'max_age': 300},
+    'hospital_api': {'public': True, 'max_age': 300},
+    'blog': {'public': True, 'max_age': 600},
+}
+
+
+def make_etag(*parts) -> str:
+    """임의 값들로 강한 ETag 생성"""
+    digest = hashlib.md5('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
+
+
+def etag_matches(request, etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag 와 일치하는지"""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or etag in etags
+
+
+def not_modified(etag: str) -> HttpResponseNotModified:
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    return response
+
+
+def facility_fingerprint(facility) -> tuple:
+    """prefetch_sections 로 로드된 시설의 변경 감지용 값 (추가 쿼리 없음)"""
+    parts = [facility.pk, facility.updated_at.isoformat() if facility.updated_at else '']
+    for name in SECTION_MODELS:
+        items = getattr(facility, name).all()
+        parts.append(len(items))
+        parts.extend(f'{item.pk}:{item.updated_at.isoformat()}' for item in items)
+    return tuple(parts)
+
+
+def facility_last_modified(**lookup):
+    """시설 + 하위 테이블(섹션/홈페이지/이미지) 의 max(updated_at) 을 UNION 쿼리 한 번으로 계산"""
+    child_lookup = {f'facility__{key}': value for key, value in lookup.items()}
+    parts = [Facility.objects.filter(**lookup).order_by().values_list('updated_at')]
+    for model in (*SECTION_MODELS.values(), FacilityHomepage, FacilityImage):
+        parts.append(
+            model.objects.filter(**child_lookup).order_by()
+            .values('facility').annotate(last=Max('updated_at')).values_list('last')
+        )
+    values = [row[0] for row in parts[0].union(*parts[1:], all=True) if row[0]]
+    return max(values) if values else None
+
+
+def queryset_validators(queryset):
+    """목록용 (max(updated_at), 개수) 를 집계 쿼리 한 번으로 계산"""
+    stats = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk', distinct=True))
+    return stats['last'], stats['count']
+
+
+def conditional_page(validators):
+    """validators(request, *args, **kwargs) -> (etag, last_modified) 로 조건부 GET 처리
+
+    Django condition 데코레이터는 etag/last_modified 를 따로 계산하므로 요청 단위로 한 번만 계산해 공유한다.
+    """
+    def _get(request, *args, **kwargs):
+        if not hasattr(request, '_conditional_validators'):
+            request._conditional_validators = validators(request, *args, **kwargs)
+        return request._conditional_validators
+
+    def etag_func(request, *args, **kwargs):
+        return _get(request, *args, **kwargs)[0]
+
+    def last_modified_func(request, *args, **kwargs):
+        return _get(request, *args, **kwargs)[1]
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
+def cache_policy(name):
+    return cache_control(**CACHE_POLICIES[name])
@@ -0,0 +1,182 @@
+"""이미지 수집 파이프라인 (eroum 시설/병원 사진)
+
+이미지 URL 을 받아 httpx 비동기 클라이언트 하나(연결 풀)로 동시에 내려받는다.
+- 이미 저장된 original_url 은 시작할 때 한 번에 읽어 두고(prefetch) 건너뛴다 (이미지마다 exists() 쿼리 없음)
+- 전체 동시 다운로드 수(concurrency)와 호스트별 동시 연결 수(per_host)를 따로 제한
+- 응답 본문은 메모리에 통째로 올리지 않고 임시 파일(SpooledTemporaryFile)로 받아 저장소에 그대로 넘긴다
+- 이미지 행은 batch_size 개씩 bulk_create 하고, 주인(시설/병원)의 has_images 도 한 번에 갱신
+bulk 작업은 시그널이 없으므로 캐시 무효화 함수(invalidate_facilities / invalidate_hospitals)를 넘겨 받아 직접 호출한다.
+"""
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.core.files import File
+from django.db import transaction
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST = 4
+DEFAULT_BATCH_SIZE = 100
+IMAGE_TIMEOUT = 30.0
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_BYTES = 1024 * 1024  # 이보다 큰 이미지는 디스크 임시 파일로
+EROUM_URL = 'https://eroum.co.kr'
+
+
+def image_urls(soup, base: str = EROUM_URL) -> list:
+    """상세 페이지의 슬라이드 이미지 URL (절대 URL 로 변환, 중복 제거)"""
+    urls = []
+    for img_tag in soup.select('div.swiper-slide img'):
+        src = (img_tag.get('src') or '').strip()
+        if src.startswith('//'):
+            src = 'https:' + src
+        elif src.startswith('/'):
+            src = base + src
+        elif not src.startswith('http'):
+            continue
+        if src not in urls:
+            urls.append(src)
+    return urls
+
+
+def image_filename(url: str, fallback: str) -> str:
+    """URL 경로의 파일명 (확장자가 없으면 fallback)"""
+    name = os.path.basename(urlparse(url).path)
+    return name if name and '.' in name else fallback
+
+
+class ImagePipeline:
+    """model(FacilityImage/HospitalImage) 행을 만드는 비동기 이미지 수집기
+
+    owner_field 는 주인 FK 이름('facility'/'hospital'), invalidate 는 주인 pk 를 받는 캐시 무효화 함수.
+    prefetch() → add() 반복 → close() 순서로 쓴다.
+    """
+
+    def __init__(self, model, owner_field: str, user_agent: str, concurrency: int = DEFAULT_CONCURRENCY,
+                 per_host: int = DEFAULT_PER_HOST, batch_size: int = DEFAULT_BATCH_SIZE, invalidate=None):
+        self.model = model
+        self.owner_field = owner_field
+        self.owner_model = model._meta.get_field(owner_field).related_model
+        self.image_field = model._meta.get_field('image')
+        self.invalidate = invalidate
+        self.per_host = max(1, per_host)
+        self.batch_size = max(1, batch_size)
+        concurrency = max(1, concurrency)
+        self.client = httpx.AsyncClient(
+            headers={'User-Agent': user_agent},
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=IMAGE_TIMEOUT,
+            follow_redirects=True,
+        )
+        self.known = set()
+        self.stats = Counter()  # known / downloaded / failed / saved / duplicate
+        self._slots = asyncio.Semaphore(concurrency)
+        self._hosts = {}  # 호스트 -> Semaphore
+        self._tasks = set()
+        self._rows = []
+
+    async def prefetch(self):
+        """이미 저장된 original_url 을 한 번에 읽어 둔다"""
+        self.known = await sync_to_async(
+            lambda: set(self.model.objects.values_list('original_url', flat=True)), thread_sensitive=True,
+        )()
+
+    async def add(self, owner_id, urls, name_prefix: str) -> int:
+        """주인의 이미지 URL 목록을 등록하고 이미 저장된 이미지 수 반환
+
+        이미 저장된 이미지가 있으면 has_images 를 바로 True 로, 이미지가 하나도 없으면 False 로 바꾼다.
+        새 이미지만 있으면 플래그는 그대로 두고, 백그라운드에서 내려받아 저장될 때(_commit) True 로 바꾼다
+        (동시 다운로드가 가득 차면 자리가 날 때까지 대기).
+        """
+        new = [url for url in urls if url not in self.known]
+        known = len(urls) - len(new)
+        self.stats['known'] += known
+        if known or not new:
+            await sync_to_async(self._set_has_images, thread_sensitive=True)([owner_id], known > 0)
+        for idx, url in enumerate(new):
+            self.known.add(url)  # 같은 실행에서 다시 받지 않도록
+            await self._slots.acquire()
+            task = asyncio.create_task(self._download(owner_id, url, f'{name_prefix}_{int(time.time())}_{idx}.jpg'))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return known
+
+    async def close(self):
+        """남은 다운로드를 기다린 뒤 대기 중인 행을 저장하고 연결 종료"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush()
+        await self.client.aclose()
+
+    async def flush(self):
+        rows, self._rows = self._rows, []
+        if rows:
+            await sync_to_async(self._commit, thread_sensitive=True)(rows)
+
+    async def _download(self, owner_id, url, fallback_name):
+        try:
+            host = urlparse(url).netloc
+            semaphore = self._hosts.setdefault(host, asyncio.Semaphore(self.per_host))
+            spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+            try:
+                async with semaphore:
+                    async with self.client.stream('GET', url) as response:
+                        response.raise_for_status()
+                        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                            spool.write(chunk)
+                name = await asyncio.to_thread(self._store, image_filename(url, fallback_name), spool)
+            finally:
+                spool.close()
+        except Exception:
+            self.stats['failed'] += 1
+            return
+        finally:
+            self._slots.release()
+        self.stats['downloaded'] += 1
+        self._rows.append(self.model(**{f'{self.owner_field}_id': owner_id}, image=name, original_url=url))
+        if len(self._rows) >= self.batch_size:
+            await self.flush()
+
+    def _store(self, filename: str, spool) -> str:
+        """임시 파일을 저장소(upload_to 경로)에 저장하고 실제 이름 반환"""
+        spool.seek(0)
+        name = self.image_field.generate_filename(None, filename)
+        return self.image_field.storage.save(name, File(spool, name=filename))
+
+    def _commit(self, rows):
+        with transaction.atomic():
+            # 다른 실행이 그 사이 먼저 저장한 URL 은 건너뛰고 내려받은 파일을 지운다
+            existing = set(
+                self.model.objects.filter(original_url__in=[row.original_url for row in rows])
+                .values_list('original_url', flat=True)
+            )
+            new_rows = [row for row in rows if row.original_url not in existing]
+            self.model.objects.bulk_create(new_rows, ignore_conflicts=True)
+            owner_ids = {getattr(row, f'{self.owner_field}_id') for row in new_rows}
+            if owner_ids:
+                self._set_has_images(owner_ids, True)
+                # 새 이미지 행이 상세 캐시에 보이도록 (has_images 가 이미 True 인 주인 포함)
+                if self.invalidate is not None:
+                    self.invalidate(*owner_ids)
+        for row in rows:
+            if row.original_url in existing:
+                self.image_field.storage.delete(row.image.name)
+        self.stats['saved'] += len(new_rows)
+        self.stats['duplicate'] += len(rows) - len(new_rows)
+
+    def _set_has_images(self, owner_ids, value: bool):
+        """has_images 가 value 와 다른 주인만 갱신하고 무효화"""
+        changed = list(
+            self.owner_model.objects.filter(pk__in=list(owner_ids)).exclude(has_images=value)
+            .values_list('pk', flat=True)
+        )
+        if not changed:
+            return
+        self.owner_model.objects.filter(pk__in=changed).update(has_images=value)
+        if self.invalidate is not None:
+            self.invalidate(*changed)
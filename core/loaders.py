@@ -0,0 +1,73 @@
+"""시설 상세 섹션 일괄 로더
+
+basic/evaluation/staff/program/location/noncovered 6개 섹션을
+UNION ALL 쿼리 한 번으로 가져와 각 시설의 prefetch 캐시에 채운다.
+이후 facility.basic_items.all() 등은 추가 쿼리 없이 동작하므로
+템플릿/시리얼라이저 코드는 그대로 사용할 수 있다.
+"""
+from django.db.models import CharField, Value
+
+from .models import (
+    FacilityBasic,
+    FacilityEvaluation,
+    FacilityStaff,
+    FacilityProgram,
+    FacilityLocation,
+    FacilityNonCovered,
+)
+
+# related_name → 모델
+SECTION_MODELS = {
+    'basic_items': FacilityBasic,
+    'evaluation_items': FacilityEvaluation,
+    'staff_items': FacilityStaff,
+    'program_items': FacilityProgram,
+    'location_items': FacilityLocation,
+    'noncovered_items': FacilityNonCovered,
+}
+
+SECTION_FIELDS = ('id', 'facility_id', 'title', 'content', 'created_at', 'updated_at')
+
+
+def section_rows_queryset(facility_ids):
+    """6개 섹션 테이블을 하나로 합친 values_list 쿼리셋"""
+    querysets = [
+        model.objects.filter(facility_id__in=facility_ids)
+        .annotate(section=Value(name, output_field=CharField()))
+        .values_list(*SECTION_FIELDS, 'section')
+        .order_by()
+        for name, model in SECTION_MODELS.items()
+    ]
+    return querysets[0].union(*querysets[1:], all=True)
+
+
+def prefetch_sections(facilities):
+    """시설 목록의 섹션 데이터를 한 번의 쿼리로 prefetch. 입력 리스트를 그대로 반환"""
+    facilities = [f for f in facilities if f.pk is not None]
+    if not facilities:
+        return facilities
+
+    by_id = {f.pk: f for f in facilities}
+    buckets = {(pk, name): [] for pk in by_id for name in SECTION_MODELS}
+    rows = section_rows_queryset(list(by_id))
+    for pk, facility_id, title, content, created_at, updated_at, section in rows:
+        model = SECTION_MODELS[section]
+        item = model(id=pk, facility_id=facility_id, title=title, content=content,
+                     created_at=created_at, updated_at=updated_at)
+        item._state.adding = False
+        item._state.db = rows.db
+        buckets[(facility_id, section)].append(item)
+
+    for facility in facilities:
+        cache = facility.__dict__.setdefault('_prefetched_objects_cache', {})
+        for name in SECTION_MODELS:
+            items = sorted(buckets[(facility.pk, name)], key=lambda i: i.pk)
+            for item in items:
+                # 역방향 FK 캐시 (item.facility 접근 시 쿼리 방지)
+                item.facility = facility
+            # 관련 매니저가 prefetch 결과를 사용하도록 Django 의 prefetch 방식과 동일하게 저장
+            qs = getattr(facility, name).get_queryset()
+            qs._result_cache = items
+            qs._prefetch_done = True
+            cache[name] = qs
+    return facilities
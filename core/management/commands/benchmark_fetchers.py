@@ -0,0 +1,116 @@
+import asyncio
+import random
+import resource
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.crawl_engine import DETAIL_MARKER, USER_AGENT
+from core.crawl_utils import RateLimiter
+from core.fetchers import BrowserFetcher, HttpFetcher, has_marker
+from core.models import CrawlURL
+
+BACKENDS = ('http', 'browser')
+
+try:  # 선택 의존성: 있으면 브라우저 자식 프로세스의 CPU/RSS 까지 측정
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _usage():
+    """(누적 CPU 초, 현재 RSS MB)"""
+    if psutil is not None:
+        procs = [psutil.Process()]
+        procs += procs[0].children(recursive=True)
+        cpu = rss = 0.0
+        for proc in procs:
+            try:
+                times = proc.cpu_times()
+                cpu += times.user + times.system
+                rss += proc.memory_info().rss / 1024 / 1024
+            except psutil.Error:
+                continue
+        return cpu, rss
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss / 1024  # 리눅스 ru_maxrss 단위는 KB
+
+
+class Command(BaseCommand):
+    help = '상세 페이지 수집 방식(httpx / Playwright)별 처리량(pages/sec)과 CPU/메모리 사용량을 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*', help='측정할 상세 URL (미지정 시 크롤 프론티어에서 표본 추출)')
+        parser.add_argument('--crawler', choices=['facility', 'hospital'], default='facility', help='표본을 뽑을 크롤러 (기본: facility)')
+        parser.add_argument('--samples', type=int, default=30, help='표본 URL 수 (기본: 30)')
+        parser.add_argument('--backends', default=','.join(BACKENDS), help=f'측정할 방식 (기본: {",".join(BACKENDS)})')
+        parser.add_argument('--concurrency', type=int, default=4, help='동시 요청 수 (기본: 4)')
+        parser.add_argument('--rate', type=float, default=2.0, help='요청 속도 상한(회/초, 0 이면 제한 없음, 기본: 2)')
+        parser.add_argument('--seed', type=int, default=None, help='난수 시드')
+
+    def handle(self, *args, **options):
+        urls = options['urls']
+        if not urls:
+            candidates = list(
+                CrawlURL.objects.filter(crawler=options['crawler'], status=CrawlURL.STATUS_SAVED)
+                .values_list('url', flat=True)
+            )
+            if not candidates:
+                self.stdout.write(self.style.WARNING('측정할 URL 이 없습니다. URL 을 지정하거나 크롤러를 먼저 실행하세요.'))
+                return
+            urls = random.Random(options['seed']).sample(candidates, min(options['samples'], len(candidates)))
+
+        backends = [name.strip() for name in options['backends'].split(',') if name.strip() in BACKENDS]
+        self.stdout.write(f'URL {len(urls)}개, 동시 {options["concurrency"]}, 속도 상한 {options["rate"] or "없음"}')
+        if psutil is None:
+            self.stdout.write('psutil 미설치: CPU/RSS 는 이 프로세스만 측정 (브라우저 프로세스 제외, RSS 는 최대값)')
+        for name in backends:
+            result = asyncio.run(self._run(name, urls, options['concurrency'], options['rate']))
+            self.stdout.write(
+                f'{name:>8}: {result["pages"] / result["elapsed"]:.2f} pages/sec '
+                f'({result["pages"]}/{len(urls)}건, 표시 있음 {result["marked"]}건, {result["elapsed"]:.1f}s), '
+                f'CPU {result["cpu"]:.2f}s, RSS {result["rss"]:.0f}MB'
+                + (' [HTTP/2]' if result.get('http2') else '')
+            )
+
+    async def _run(self, name, urls, concurrency, rate):
+        limiter = RateLimiter(rate, jitter=0) if rate else None
+        playwright = browser = None
+        cpu_before, _ = _usage()
+        peak_rss = 0.0
+        if name == 'http':
+            fetcher = HttpFetcher(USER_AGENT, limiter, concurrency)
+        else:
+            from playwright.async_api import async_playwright  # 지연 import
+            playwright = await async_playwright().start()
+            browser = await playwright.chromium.launch(headless=True)
+            context = await browser.new_context(user_agent=USER_AGENT, locale="ko-KR")
+            fetcher = BrowserFetcher(context, limiter, concurrency)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        pages = marked = 0
+
+        async def fetch(url):
+            nonlocal pages, marked
+            async with semaphore:
+                html = await fetcher.fetch(url)
+            if html is not None:
+                pages += 1
+                marked += has_marker(html, DETAIL_MARKER)
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(fetch(url)) for url in urls]
+        while not all(task.done() for task in tasks):
+            peak_rss = max(peak_rss, _usage()[1])
+            await asyncio.wait(tasks, timeout=0.5)
+        elapsed = time.perf_counter() - started
+        cpu_after, rss = _usage()
+        result = {
+            'pages': pages, 'marked': marked, 'elapsed': max(elapsed, 1e-9),
+            'cpu': cpu_after - cpu_before, 'rss': max(peak_rss, rss), 'http2': getattr(fetcher, 'http2', False),
+        }
+        await fetcher.close()
+        if browser is not None:
+            await browser.close()
+            await playwright.stop()
+        return result
@@ -0,0 +1,68 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.geo import nearest, nearest_naive
+from core.models import Facility, Hospital
+
+MODELS = {'facility': Facility, 'hospital': Hospital}
+
+
+class Command(BaseCommand):
+    help = 'geohash 주변 검색과 전체 haversine 스캔의 응답 시간/결과를 비교합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=list(MODELS), default='facility', help='대상 모델 (기본: facility)')
+        parser.add_argument('--samples', type=int, default=50, help='측정할 좌표 수 (기본: 50)')
+        parser.add_argument('--k', type=int, default=10, help='조회 개수 (기본: 10)')
+        parser.add_argument('--jitter', type=float, default=0.02, help='샘플 좌표에 더할 무작위 오차(도) (기본: 0.02)')
+        parser.add_argument('--seed', type=int, default=None, help='난수 시드')
+
+    def handle(self, *args, **options):
+        model = MODELS[options['model']]
+        rng = random.Random(options['seed'])
+        queryset = model.objects.all()
+
+        points = list(
+            queryset.exclude(geohash='').order_by()
+            .values_list('latitude', 'longitude')
+        )
+        if not points:
+            self.stdout.write(self.style.WARNING('좌표가 있는 데이터가 없습니다. geocode_locations 를 먼저 실행하세요.'))
+            return
+
+        jitter = options['jitter']
+        samples = [
+            (float(lat) + rng.uniform(-jitter, jitter), float(lng) + rng.uniform(-jitter, jitter))
+            for lat, lng in rng.sample(points, min(options['samples'], len(points)))
+        ]
+        self.stdout.write(f'{model._meta.verbose_name} {len(points)}건, 샘플 {len(samples)}개, k={options["k"]}')
+
+        timings = {'geohash': [], 'naive': []}
+        mismatches = 0
+        for lat, lng in samples:
+            started = time.perf_counter()
+            indexed = nearest(queryset, lat, lng, k=options['k'])
+            timings['geohash'].append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            naive = nearest_naive(queryset, lat, lng, k=options['k'])
+            timings['naive'].append((time.perf_counter() - started) * 1000)
+
+            # 같은 거리의 동률은 순서가 다를 수 있으므로 거리 목록으로 비교
+            if [round(d, 6) for _, d in indexed] != [round(d, 6) for _, d in naive]:
+                mismatches += 1
+
+        for name, values in timings.items():
+            values.sort()
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            self.stdout.write(
+                f'{name:>8}: 평균 {statistics.mean(values):.2f}ms, 중앙값 {statistics.median(values):.2f}ms, p95 {p95:.2f}ms'
+            )
+
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'결과 불일치 {mismatches}건'))
+        else:
+            self.stdout.write(self.style.SUCCESS('모든 샘플에서 결과 일치'))
@@ -1,34 +1,32 @@
 import asyncio
-import os
-import requests
-from urllib.parse import urljoin, urlparse
-from pathlib import Path
+
+from asgiref.sync import sync_to_async
 from django.core.management.base import BaseCommand
-from django.core.files.base import ContentFile
-from django.db import transaction
+from core.crawl_engine import USER_AGENT
+from core.crawl_utils import RateLimiter
+from core.fetchers import HttpFetcher
+from core.image_pipeline import DEFAULT_CONCURRENCY, DEFAULT_PER_HOST, EROUM_URL, ImagePipeline, image_urls
 from core.models import Facility, FacilityImage, Tag
+from core.signals import invalidate_facilities
 from bs4 import BeautifulSoup
 from tqdm import tqdm
-import time
-import random
 
-USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.1 Safari/537.36"
-)
+PAGE_HEADERS = {'Referer': f'{EROUM_URL}/'}
 
 class Command(BaseCommand):
-    help = "기존 DB의 Facility 코드를 사용해 eroum.co.kr에서 ���미지와 태그를 크롤링하여 저장"
+    help = "기존 DB의 Facility 코드를 사용해 eroum.co.kr에서 이미지와 태그를 크롤링하여 저장"
 
     def add_arguments(self, parser):
         parser.add_argument("--facility-code", help="특정 시설 코드만 크롤링")
         parser.add_argument("--limit", type=int, default=None, help="크롤링할 시설 수 제한")
-        parser.add_argument("--delay", type=float, default=2.0, help="요청 간 지연시간(초)")
+        parser.add_argument("--delay", type=float, default=0.5, help="상세 페이지 요청 간 지연시간(초), --rate 미지정 시 1/delay 회/초")
+        parser.add_argument("--rate", type=float, default=None, help="상세 페이지 요청 속도 상한(회/초, 0 이면 제한 없음)")
+        parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"동시 이미지 다운로드 수 (기본: {DEFAULT_CONCURRENCY})")
+        parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help=f"이미지 호스트별 동시 연결 수 (기본: {DEFAULT_PER_HOST})")
 
     def handle(self, *args, **options):
         facility_code = options.get('facility_code')
         limit = options.get('limit')
-        delay = options.get('delay')
 
         # 크롤링할 시설 선택
         if facility_code:
@@ -40,117 +38,72 @@ class Command(BaseCommand):
             facilities = Facility.objects.all()
             if limit:
                 facilities = facilities[:limit]
-
-        self.stdout.write(f"총 {facilities.count()}개 시설 크롤링 시작")
+        facilities = list(facilities.values_list('pk', 'code', 'name'))
+
+        self.stdout.write(f"총 {len(facilities)}개 시설 크롤링 시작")
+        asyncio.run(self._crawl(facilities, options))
+
+    async def _crawl(self, facilities, options):
+        delay = options['delay']
+        rate = options['rate'] if options['rate'] is not None else (1 / delay if delay > 0 else 0)
+        concurrency = max(1, options['concurrency'])
+        # 상세 페이지는 속도 제한을 두고, 이미지는 파이프라인이 호스트별 연결 수로 제한
+        pages = HttpFetcher(USER_AGENT, RateLimiter(rate) if rate else None, concurrency, headers=PAGE_HEADERS)
+        self.images = ImagePipeline(
+            FacilityImage, 'facility', USER_AGENT, concurrency=concurrency, per_host=options['per_host'],
+            invalidate=invalidate_facilities,
+        )
+        await self.images.prefetch()
+        self.stdout.write(f"저장된 이미지 {len(self.images.known)}개는 건너뜀")
 
         success_count = 0
         error_count = 0
+        semaphore = asyncio.Semaphore(concurrency)
+        progress = tqdm(total=len(facilities), desc="시설 크롤링")
 
-        for facility in tqdm(facilities, desc="시설 크롤링"):
+        async def crawl(facility):
+            nonlocal success_count, error_count
+            pk, code, name = facility
             try:
-                self.crawl_facility_detail(facility, delay)
+                async with semaphore:
+                    await self.crawl_facility_detail(pages, pk, code)
                 success_count += 1
-                self.stdout.write(f"[성공] {facility.code} - {facility.name}")
+                self.stdout.write(f"[성공] {code} - {name}")
             except Exception as e:
                 error_count += 1
-                self.stderr.write(f"[오류] {facility.code}: {e}")
-
-            # 지연
-            time.sleep(delay + random.uniform(0, delay/2))
-
-        self.stdout.write(f"\n크롤링 완료: 성공 {success_count}, 실패 {error_count}")
-
-    def crawl_facility_detail(self, facility, delay):
-        """개별 시설의 상세 페이지를 크롤링하여 이미지와 태그 저장"""
-        url = f"https://eroum.co.kr/search/detail?careCenterType=NURSING_HOME&webYn=&ltcAdminSym={facility.code}"
-
-        headers = {
-            'User-Agent': USER_AGENT,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+                self.stderr.write(f"[오류] {code}: {e}")
+            finally:
+                progress.update(1)
 
         try:
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # 이미지 크롤링
-            images_found = self.crawl_images(facility, soup)
+            await asyncio.gather(*(crawl(facility) for facility in facilities))
+        finally:
+            progress.close()
+            await pages.close()
+            await self.images.close()
 
-            # 태그 크롤링
-            self.crawl_tags(facility, soup)
+        stats = self.images.stats
+        self.stdout.write(f"\n크롤링 완료: 성공 {success_count}, 실패 {error_count}")
+        self.stdout.write(
+            f"이미지: 새로 저장 {stats['saved']}, 기존 {stats['known']}, 다운로드 실패 {stats['failed']}, 중복 건너뜀 {stats['duplicate']}"
+        )
 
-            # has_images 필드 업데이�� (URL 유효하고 이미지가 있으면 True)
-            facility.has_images = images_found
-            facility.save(update_fields=['has_images'])
+    async def crawl_facility_detail(self, pages, pk, code):
+        """개별 시설의 상세 페이지를 크롤링하여 이미지(백그라운드 다운로드)와 태그 저장"""
+        url = f"{EROUM_URL}/search/detail?careCenterType=NURSING_HOME&webYn=&ltcAdminSym={code}"
 
-        except Exception as e:
+        html = await pages.fetch(url)
+        if html is None:
             # URL이 유효하지 않거나 오류 발생시 False로 설정
-            facility.has_images = False
-            facility.save(update_fields=['has_images'])
-            raise e
-
-    def crawl_images(self, facility, soup):
-        """이미지 크롤링 및 저장 - 이미지가 발견되면 True 반환"""
-        # swiper-slide 내의 이미지 찾기
-        image_slides = soup.select('div.swiper-slide img')
+            await self.images.add(pk, [], code)
+            raise ValueError(f"상세 페이지를 가져오지 못했습니다: {url}")
+        soup = await asyncio.to_thread(BeautifulSoup, html, 'html.parser')
 
-        images_saved = False
-
-        for img_tag in image_slides:
-            img_src = img_tag.get('src')
-            if not img_src:
-                continue
-
-            # 절대 URL로 변환
-            if img_src.startswith('//'):
-                img_src = 'https:' + img_src
-            elif img_src.startswith('/'):
-                img_src = 'https://eroum.co.kr' + img_src
-            elif not img_src.startswith('http'):
-                continue
-
-            # 이미 존재하는 이미지인지 확인
-            if FacilityImage.objects.filter(original_url=img_src).exists():
-                images_saved = True  # 이미 저장된 이미지라도 이미지가 있다는 뜻
-                continue
-
-            try:
-                # 이미지 다운로드
-                img_response = requests.get(img_src, headers={'User-Agent': USER_AGENT}, timeout=30)
-                img_response.raise_for_status()
-
-                # 파일명 생성
-                parsed_url = urlparse(img_src)
-                file_name = os.path.basename(parsed_url.path)
-                if not file_name or '.' not in file_name:
-                    file_name = f"{facility.code}_{int(time.time())}.jpg"
-
-                # FacilityImage 객체 생성 및 저장
-                facility_image = FacilityImage(
-                    facility=facility,
-                    original_url=img_src
-                )
-
-                # ContentFile로 이미지 저장
-                facility_image.image.save(
-                    file_name,
-                    ContentFile(img_response.content),
-                    save=True
-                )
-
-                images_saved = True
-                self.stdout.write(f"  이미지 저장: {file_name}")
-
-            except Exception as e:
-                self.stderr.write(f"  이미지 다운로드 실패 {img_src}: {e}")
+        # 이미지 크롤링 (has_images: 저장된 이미지가 있으면 바로 True, 새 이미지는 저장되면 True)
+        await self.images.add(pk, image_urls(soup), code)
 
-        return images_saved
+        # 태그 크롤링
+        await sync_to_async(self.crawl_tags, thread_sensitive=True)(pk, soup)
 
     def crawl_tags(self, facility, soup):
         """태그(��지) 크롤링 및 저장"""
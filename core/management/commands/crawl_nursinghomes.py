@@ -1,29 +1,11 @@
-import asyncio
-import random
-import os
-from pathlib import Path
-from urllib.parse import urlencode
-
-from django.core.management.base import BaseCommand
-from django.db import transaction
-from core import models as core_models
 import re
-from asgiref.sync import sync_to_async
 
+from asgiref.sync import sync_to_async
 from bs4 import BeautifulSoup
-from tqdm import tqdm
-
-SEARCH_BASE_URL = "https://www.seniortalktalk.com/search"
-DEFAULT_QUERY = {
-    "kind": "요양원",
-    "keyword": "",
-    "location": "서울시/전체",
-    "sort": "평가등급 순",
-    "filter": "",
-}
 
-# 세부 페이지 a 태그 href 패턴 후보들 (실제 DOM 미확인 환경 대응용)
-DETAIL_KEYWORDS = ["detail", "facility", "nursing", "home", "center", "search/view"]
+from core import models as core_models
+from core.crawl_engine import CrawlCommand
+from core.crawl_writer import DEFAULT_BATCH_SIZE, FacilityBatchWriter
 
 # 풍부도 점수 계산 헬퍼
 def _compute_richness(data: dict) -> int:
@@ -44,274 +26,32 @@ def _compute_richness(data: dict) -> int:
     score += len(noncov_items) * 2  # 비급여 항목 가중치
     return int(score * 100)  # 소수 방지
 
-USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.1 Safari/537.36"
-)
 
-RETRY_COUNT = 3
-GOTO_TIMEOUT = 60000  # 60s
-SCREENSHOT_DIR = Path('crawl_debug')
-SCREENSHOT_DIR.mkdir(exist_ok=True)
-
-
-class Command(BaseCommand):
+class Command(CrawlCommand):
     help = "시니어톡톡 요양원 목록 + 디테일 크롤링 후 CSV 저장"
+    crawler = 'facility'  # 크롤 프론티어(core.crawl_frontier) 구분값
+    kind = '요양원'
+    unit = '시설'
 
     def add_arguments(self, parser):
-        parser.add_argument("--location", default="전체", help="검색 위치 파라미터 (기본: 전체 - 모든 지역 순회)")
-        parser.add_argument("--max-pages", type=int, default=50, help="각 지역별 최대 크롤 페이지 수 (기본:50)")
-        parser.add_argument("--delay", type=float, default=1.0, help="각 요청 사이 기본 지연(초)")
-        parser.add_argument("--headful", action="store_true", help="브라우저 UI 표시")
-        # CSV / detail-url 옵션 제거 및 최소 옵션 유지
-        parser._actions = [a for a in parser._actions if a.dest not in {"output","no_csv","detail_url"}]
-        # 안전하게 남은 help 수정
-        for a in parser._actions:
-            if a.dest == 'max_pages':
-                a.help = '각 지역별 최대 크롤 페이지 수'
-
-    def handle(self, *args, **options):
-        try:
-            asyncio.run(self._async_handle(options))
-        except KeyboardInterrupt:
-            self.stdout.write(self.style.WARNING("사용자 중단"))
-
-    async def _async_handle(self, options):
-        from playwright.async_api import async_playwright  # 지연 import
-
-        location = options["location"]
-        max_pages = options["max_pages"]
-        delay = options["delay"]
-        headless = not options["headful"]
-
-        # 전국 지역 리스트
-        all_locations = [
-            "서울시/전체", "부산시/전체", "대구시/전체", "인천시/전체",
-            "광주시/전체", "대전시/전체", "울산시/전체", "세종시/전체",
-            "경기도/전체", "강원도/전체", "충청북도/전체", "충청남도/전체",
-            "전라북도/전체", "전라남도/전체", "경상북도/전체", "경상남도/전체",
-            "제주도/전체"
-        ]
-
-        # 특정 지역 지정시 해당 지역만, 아니면 전체 지역 순회
-        if location != "전체":
-            locations_to_crawl = [location if "/" in location else f"{location}/전체"]
-        else:
-            locations_to_crawl = all_locations
-
-        saved_facilities = []
-        detail_urls_seen = set()
-        best_scores = {}  # code -> richness score
-        dup_skipped = 0
-        dup_updated = 0
-        total_regions = len(locations_to_crawl)
-
-        self.stdout.write(f"크롤링 대상 지역: {total_regions}개")
-        self.stdout.write(f"각 지역별 최대 페이지: {max_pages}")
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=headless, args=["--disable-blink-features=AutomationControlled"])
-            context = await browser.new_context(
-                user_agent=USER_AGENT,
-                locale="ko-KR",
-                java_script_enabled=True,
-                extra_http_headers={
-                    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                    "Referer": "https://www.seniortalktalk.com/",
-                },
-                viewport={"width":1280,"height":1600}
-            )
-            # 리소스 절약: 이미지/폰트 차단
-            async def route_intercept(route, request):
-                if request.resource_type in ['image','media','font']:
-                    await route.abort()
-                else:
-                    await route.continue_()
-            await context.route("**/*", route_intercept)
-            page = await context.new_page()
-
-            async def safe_goto(pg, url, expect_selector=None):
-                last_err = None
-                for attempt in range(1, RETRY_COUNT+1):
-                    try:
-                        await pg.goto(url, wait_until='domcontentloaded', timeout=GOTO_TIMEOUT)
-                        if expect_selector:
-                            try:
-                                await pg.wait_for_selector(expect_selector, timeout=8000)
-                            except Exception:
-                                pass
-                        return True
-                    except Exception as e:
-                        last_err = e
-                        self.stderr.write(f"[목록 이동 실패 {attempt}/{RETRY_COUNT}] {e}")
-                        await asyncio.sleep(2*attempt)
-                if last_err:
-                    fname = SCREENSHOT_DIR / f"fail_list_{int(asyncio.get_event_loop().time())}.png"
-                    try:
-                        await pg.screenshot(path=str(fname))
-                    except Exception:
-                        pass
-                return False
-
-            async def safe_detail(detail_ctx, durl):
-                dpage = await detail_ctx.new_page()
-                for attempt in range(1, RETRY_COUNT+1):
-                    try:
-                        await dpage.goto(durl, wait_until='domcontentloaded', timeout=GOTO_TIMEOUT)
-                        await dpage.wait_for_timeout(500)
-                        # 페이지 내 간단 anchor 수 기록
-                        try:
-                            await dpage.evaluate("() => window.scrollTo(0,0)")
-                        except Exception:
-                            pass
-                        return dpage
-                    except Exception as e:
-                        self.stderr.write(f"[상세 이동 실패 {attempt}/{RETRY_COUNT}] {durl} : {e}")
-                        if attempt == RETRY_COUNT:
-                            try:
-                                await dpage.screenshot(path=str(SCREENSHOT_DIR / f"fail_detail_{int(asyncio.get_event_loop().time())}.png"))
-                            except Exception:
-                                pass
-                        await asyncio.sleep(1.5*attempt)
-                await dpage.close()
-                return None
-
-            async def auto_scroll(pg, max_rounds=8, pause=600):
-                last_height = await pg.evaluate("() => document.body.scrollHeight")
-                for i in range(max_rounds):
-                    await pg.evaluate("() => window.scrollBy(0, document.body.scrollHeight)")
-                    await pg.wait_for_timeout(pause)
-                    new_height = await pg.evaluate("() => document.body.scrollHeight")
-                    if new_height == last_height:
-                        break
-                    last_height = new_height
-
-            # 지역별 순회
-            for region_idx, current_location in enumerate(locations_to_crawl, 1):
-                self.stdout.write(f"\n{'='*60}")
-                self.stdout.write(f"[{region_idx}/{total_regions}] {current_location} 크롤링 시작")
-                self.stdout.write(f"{'='*60}")
+        super().add_arguments(parser)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help=f"DB 에 한 트랜잭션으로 모아 저장할 시설 수 (기본: {DEFAULT_BATCH_SIZE})")
 
-                region_facilities = 0
-                empty_page_count = 0
+    def richness(self, data: dict) -> int:
+        return _compute_richness(data)
 
-                # 해당 지역의 페이지별 순회
-                for page_no in range(1, max_pages + 1):
-                    query = DEFAULT_QUERY.copy()
-                    query["location"] = current_location
-                    query["page"] = page_no
+    def make_writer(self, options):
+        # 파싱 결과는 모아 두었다가 batch_size 개마다 한 트랜잭션으로 저장 (지역/실행이 끝날 때도 저장)
+        return FacilityBatchWriter(options["batch_size"])
 
-                    url = f"{SEARCH_BASE_URL}?{urlencode(query, doseq=True)}"
-                    self.stdout.write(f"[{current_location}] 페이지 {page_no} 이동: {url}")
-
-                    ok = await safe_goto(page, url, expect_selector='a')
-                    if not ok:
-                        continue
-
-                    # 자동 스크롤 수행 (동적 로딩 대비)
-                    await auto_scroll(page)
-                    html = await page.content()
-
-                    # 디버그 스냅샷 저장
-                    region_name = current_location.split('/')[0]
-                    debug_path = SCREENSHOT_DIR / f"{region_name}_page{page_no}.html"
-                    debug_path.write_text(html, encoding='utf-8')
-
-                    soup = BeautifulSoup(html, "lxml")
-
-                    # 후보: list, item, card 등 class 를 가진 a 태그 수집 (일반화)
-                    anchors = []
-                    for a in soup.find_all("a", href=True):
-                        href_lower = a["href"].lower()
-                        if "/search/view/" in href_lower:  # 우선 강제 패턴
-                            anchors.append(a)
-                        elif any(k in href_lower for k in DETAIL_KEYWORDS):
-                            anchors.append(a)
-
-                    # 중복 제거 & 절대 URL 보정
-                    detail_links = []
-                    for a in anchors:
-                        href = a["href"].strip()
-                        if href.startswith("javascript:"):
-                            continue
-                        if href.startswith("/"):
-                            href = "https://www.seniortalktalk.com" + href
-                        if href not in detail_urls_seen and href.startswith("http"):
-                            detail_urls_seen.add(href)
-                            detail_links.append(href)
-
-                    # 링크 디버그 저장
-                    link_debug_file = SCREENSHOT_DIR / f"{region_name}_links_page{page_no}.txt"
-                    link_debug_file.write_text("\n".join(detail_links), encoding='utf-8')
-
-                    if not detail_links:
-                        empty_page_count += 1
-                        self.stdout.write(f"[{current_location}] 페이지 {page_no} 상세 링크 0개")
-                        # 연속 3페이지 이상 비어있으면 해당 지역 크롤링 종료
-                        if empty_page_count >= 3:
-                            self.stdout.write(f"[{current_location}] 연속 {empty_page_count}페이지 비어있음 - 해당 지역 크롤링 종료")
-                            break
-                        continue
-                    else:
-                        empty_page_count = 0  # 링크가 있으면 카운터 리셋
-                        self.stdout.write(f"[{current_location}] 페이지 {page_no} 상세 링크 {len(detail_links)}개")
-
-                    page_facilities = 0
-                    for link in tqdm(detail_links, desc=f"{region_name} p{page_no}", unit="fac"):
-                        dpage = await safe_detail(context, link)
-                        if not dpage:
-                            continue
-                        try:
-                            dhtml = await dpage.content()
-                            dsoup = BeautifulSoup(dhtml, "lxml")
-                            data = self.parse_detail(dsoup, link)
-                            code = data.get('overview', {}).get('code')
-                            richness = _compute_richness(data)
-                            do_save = True
-                            updated = False
-                            if code in best_scores:
-                                if richness > best_scores[code]:
-                                    updated = True
-                                else:
-                                    do_save = False
-                            if do_save:
-                                facility = await sync_to_async(self.save_to_db, thread_sensitive=True)(data)
-                                best_scores[code] = richness
-                                if facility:
-                                    if updated:
-                                        dup_updated += 1
-                                        self.stdout.write(f"[갱신] {facility.code} (점수 {richness})")
-                                    else:
-                                        saved_facilities.append(facility)
-                                        page_facilities += 1
-                                        region_facilities += 1
-                                        self.stdout.write(f"[저장] {facility.code} (점수 {richness})")
-                            else:
-                                dup_skipped += 1
-                                self.stdout.write(f"[중복-스킵] {code} (기존 점수 {best_scores[code]}, 새 점수 {richness})")
-                        except Exception as e:
-                            self.stderr.write(f"[오류] {link}: {e}\n")
-                        finally:
-                            await dpage.close()
-                            await asyncio.sleep(delay + random.uniform(0, delay / 2))
-
-                    self.stdout.write(f"[{current_location}] 페이지 {page_no} 완료: {page_facilities}개 시설 저장")
-
-                self.stdout.write(f"[{current_location}] 지역 크롤링 완료: 총 {region_facilities}개 시설")
-
-            await context.close()
-            await browser.close()
-
-        self.stdout.write(f"\n{'='*60}")
-        self.stdout.write(f"전체 크롤링 완료!")
-        self.stdout.write(f"총 {len({f.id for f in saved_facilities})}개 시설 DB 저장")
-        self.stdout.write(f"중복 스킵: {dup_skipped}, 정보 갱신: {dup_updated}")
-        self.stdout.write(f"{'='*60}")
+    async def summary_lines(self):
+        lines = [f"변경된 시설: {len(self.writer.changed_ids)}개 (섹션별 행 추가/수정/삭제: {self.writer.changes_summary()})"]
         try:
             eval_count = await sync_to_async(core_models.FacilityEvaluation.objects.count)()
-            self.stdout.write(f"평가 레코드 누적: {eval_count}")
+            lines.append(f"평가 레코드 누적: {eval_count}")
         except Exception:
             pass
+        return lines
 
     def parse_detail(self, soup: BeautifulSoup, url: str) -> dict:
         # 기존 전역 텍스트 기반 로직 이전에 시설 영역을 우선 파싱
@@ -580,99 +320,3 @@ class Command(BaseCommand):
         if '불가' in v or '불가능' in v or '마감' in v:
             return '불가능'
         return v
-
-    def save_to_db(self, data: dict):
-        ov = data.get('overview') or {}
-        code = ov.get('code')
-        if not code:
-            return None
-        name = ov.get('name') or code
-        kind = ov.get('kind') or ''
-        grade = ov.get('grade') or ''
-        availability = ov.get('availability') or ''
-        capacity = ov.get('capacity')
-        occupancy = ov.get('occupancy')
-        waiting = ov.get('waiting')
-
-        from core.models import Facility, FacilityBasic  # 지연 import
-        with transaction.atomic():
-            facility, created = Facility.objects.get_or_create(code=code, defaults={
-                'name': name,
-                'kind': kind,
-                'grade': grade,
-                'availability': availability,
-                'capacity': capacity,
-                'occupancy': occupancy,
-                'waiting': waiting,
-            })
-            # 업데이트 필요 필드만 반영
-            changed = False
-            for field, value in {
-                'name': name,
-                'kind': kind,
-                'grade': grade,
-                'availability': availability,
-                'capacity': capacity,
-                'occupancy': occupancy,
-                'waiting': waiting,
-            }.items():
-                if value is not None and getattr(facility, field) != value:
-                    setattr(facility, field, value)
-                    changed = True
-            if changed:
-                facility.save()
-
-            # 기본정보 항목 저장 (재생성)
-            basic_items = data.get('basic_items') or []
-            if basic_items:
-                FacilityBasic.objects.filter(facility=facility).delete()
-                FacilityBasic.objects.bulk_create([
-                    FacilityBasic(facility=facility, title=item['title'][:100], content=item['content'])
-                    for item in basic_items if item.get('title')
-                ])
-            # 평가정보 항목 저장 (재생성)
-            from core.models import FacilityEvaluation
-            eval_items = data.get('evaluation_items') or []
-            if eval_items:
-                FacilityEvaluation.objects.filter(facility=facility).delete()
-                FacilityEvaluation.objects.bulk_create([
-                    FacilityEvaluation(facility=facility, title=item['title'][:100], content=item['content'])
-                    for item in eval_items if item.get('title')
-                ])
-            # 인력현황 항목 저장 (재생성)
-            from core.models import FacilityStaff
-            staff_items = data.get('staff_items') or []
-            if staff_items:
-                FacilityStaff.objects.filter(facility=facility).delete()
-                FacilityStaff.objects.bulk_create([
-                    FacilityStaff(facility=facility, title=item['title'][:100], content=item['content'])
-                    for item in staff_items if item.get('title')
-                ])
-            # 프로그램운영 항목 저장 (재생성)
-            from core.models import FacilityProgram
-            program_items = data.get('program_items') or []
-            if program_items:
-                FacilityProgram.objects.filter(facility=facility).delete()
-                FacilityProgram.objects.bulk_create([
-                    FacilityProgram(facility=facility, title=item['title'][:100], content=item['content'])
-                    for item in program_items if item.get('title')
-                ])
-            # 위치 항목 저장 (개별 항목으로 재생성)
-            from core.models import FacilityLocation
-            location_items = data.get('location_items') or []
-            FacilityLocation.objects.filter(facility=facility).delete()
-            for item in location_items:
-                FacilityLocation.objects.create(facility=facility, title=item['title'], content=item['content'])
-            # 홈페이지 항목 저장 (OneToOne 재생성)
-            from core.models import FacilityHomepage
-            homepage_item = data.get('homepage_item')
-            if homepage_item:
-                FacilityHomepage.objects.filter(facility=facility).delete()
-                FacilityHomepage.objects.create(facility=facility, title=homepage_item['title'], content=homepage_item['content'])
-            # 비급여 항목 ��장 (개별 항목으로 재생성)
-            from core.models import FacilityNonCovered
-            noncov_items = data.get('non_covered_items') or []
-            FacilityNonCovered.objects.filter(facility=facility).delete()
-            for item in noncov_items:
-                FacilityNonCovered.objects.create(facility=facility, title=item['title'], content=item['content'])
-        return facility
@@ -1,31 +1,17 @@
 import asyncio
-import random
-import os
-import requests
-from pathlib import Path
-from urllib.parse import urlencode, urljoin, urlparse
-from django.core.files.base import ContentFile
-
-from django.core.management.base import BaseCommand
+
 from django.db import transaction
 from core import models as core_models
+from core.crawl_engine import USER_AGENT, CrawlCommand, ImmediateWriter
+from core.crawl_utils import RateLimiter
+from core.fetchers import HttpFetcher
+from core.hospital_attributes import sync_hospital_attributes
+from core.image_pipeline import EROUM_URL, ImagePipeline, image_urls
+from core.signals import invalidate_hospitals
 import re
 from asgiref.sync import sync_to_async
 
 from bs4 import BeautifulSoup
-from tqdm import tqdm
-
-SEARCH_BASE_URL = "https://www.seniortalktalk.com/search"
-DEFAULT_QUERY = {
-    "kind": "요양병원",
-    "keyword": "",
-    "location": "서울시/전체",
-    "sort": "평가등급 순",
-    "filter": "",
-}
-
-# 세부 페이지 a 태그 href 패턴 후보들 (실제 DOM 미확인 환경 대응용)
-DETAIL_KEYWORDS = ["detail", "facility", "nursing", "home", "center", "search/view"]
 
 # 풍부도 점수 계산 헬퍼
 def _compute_richness(data: dict) -> int:
@@ -51,283 +37,50 @@ def _compute_richness(data: dict) -> int:
     score += len(medical_fee_info) * 2  # 진료비 정보 가중치
     return int(score * 100)  # 소수 방지
 
-USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.1 Safari/537.36"
-)
-
-RETRY_COUNT = 3
-GOTO_TIMEOUT = 60000  # 60s
-SCREENSHOT_DIR = Path('crawl_debug')
-SCREENSHOT_DIR.mkdir(exist_ok=True)
-
 
-class Command(BaseCommand):
+class Command(CrawlCommand):
     help = "시니어톡톡 요양병원 목록 + 디테일 크롤링 후 CSV 저장"
+    crawler = 'hospital'  # 크롤 프론티어(core.crawl_frontier) 구분값
+    kind = '요양병원'
+    unit = '병원'
+    default_concurrency = 1  # 저장마다 eroum 상세 페이지 요청이 이어지므로 기본은 한 번에 하나
 
-    def add_arguments(self, parser):
-        parser.add_argument("--location", default="전체", help="검색 위치 파라미터 (기본: 전체 - 모든 지역 순회)")
-        parser.add_argument("--max-pages", type=int, default=50, help="각 지역별 최대 크롤 페이지 수 (기본:50)")
-        parser.add_argument("--delay", type=float, default=1.0, help="각 요청 사이 기본 지연(초)")
-        parser.add_argument("--headful", action="store_true", help="브라우저 UI 표시")
-        # CSV / detail-url 옵션 제거 및 최소 옵션 유지
-        parser._actions = [a for a in parser._actions if a.dest not in {"output","no_csv","detail_url"}]
-        # 안전하게 남은 help 수정
-        for a in parser._actions:
-            if a.dest == 'max_pages':
-                a.help = '각 지역별 최대 크롤 페이지 수'
-
-    def handle(self, *args, **options):
-        try:
-            asyncio.run(self._async_handle(options))
-        except KeyboardInterrupt:
-            self.stdout.write(self.style.WARNING("사용자 중단"))
+    def richness(self, data: dict) -> int:
+        return _compute_richness(data)
+
+    def make_writer(self, options):
+        # 병원 저장과 속성 재계산은 항목마다 한 트랜잭션 (저장 직후 이미지 수집에 병원 행이 필요)
+        return ImmediateWriter(self._save)
 
-    async def _async_handle(self, options):
-        from playwright.async_api import async_playwright  # 지연 import
+    def _save(self, data):
+        hospital = self.save_to_db(data)
+        return hospital.pk if hospital else None
 
-        location = options["location"]
-        max_pages = options["max_pages"]
+    async def on_start(self, options):
+        # eroum 상세 페이지는 httpx 로, 이미지는 파이프라인이 동시에 내려받아 일괄 저장
+        # after_save 는 작업자마다 동시에 돌므로 eroum 요청은 전용 속도 제한(1/delay 회/초)으로 간격을 둔다
         delay = options["delay"]
-        headless = not options["headful"]
-
-        # 전국 지역 리스트
-        all_locations = [
-            "서울시/전체", "부산시/전체", "대구시/전체", "인천시/전체",
-            "광주시/전체", "대전시/전체", "울산시/전체", "세종시/전체",
-            "경기도/전체", "강원도/전체", "충청북도/전체", "충청남도/전체",
-            "전라북도/전체", "전라남도/전체", "경상북도/전체", "경상남도/전체",
-            "제주도/전체"
-        ]
-
-        # 특정 지역 지정시 해당 지역만, 아니면 전체 지역 순회
-        if location != "전체":
-            locations_to_crawl = [location if "/" in location else f"{location}/전체"]
-        else:
-            locations_to_crawl = all_locations
-
-        saved_facilities = []
-        detail_urls_seen = set()
-        best_scores = {}  # code -> richness score
-        dup_skipped = 0
-        dup_updated = 0
-        total_regions = len(locations_to_crawl)
-
-        self.stdout.write(f"크롤링 대상 지역: {total_regions}개")
-        self.stdout.write(f"각 지역별 최대 페이지: {max_pages}")
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=headless, args=["--disable-blink-features=AutomationControlled"])
-            context = await browser.new_context(
-                user_agent=USER_AGENT,
-                locale="ko-KR",
-                java_script_enabled=True,
-                extra_http_headers={
-                    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
-                    "Referer": "https://www.seniortalktalk.com/",
-                },
-                viewport={"width":1280,"height":1600}
-            )
-            # 리소스 절약: 이미지/폰트 차단
-            async def route_intercept(route, request):
-                if request.resource_type in ['image','media','font']:
-                    await route.abort()
-                else:
-                    await route.continue_()
-            await context.route("**/*", route_intercept)
-            page = await context.new_page()
-
-            async def safe_goto(pg, url, expect_selector=None):
-                last_err = None
-                for attempt in range(1, RETRY_COUNT+1):
-                    try:
-                        await pg.goto(url, wait_until='domcontentloaded', timeout=GOTO_TIMEOUT)
-                        if expect_selector:
-                            try:
-                                await pg.wait_for_selector(expect_selector, timeout=8000)
-                            except Exception:
-                                pass
-                        return True
-                    except Exception as e:
-                        last_err = e
-                        self.stderr.write(f"[목록 이동 실패 {attempt}/{RETRY_COUNT}] {e}")
-                        await asyncio.sleep(2*attempt)
-                if last_err:
-                    fname = SCREENSHOT_DIR / f"fail_list_{int(asyncio.get_event_loop().time())}.png"
-                    try:
-                        await pg.screenshot(path=str(fname))
-                    except Exception:
-                        pass
-                return False
+        self.eroum = HttpFetcher(USER_AGENT, RateLimiter(1 / delay if delay > 0 else 0), headers={'Referer': f'{EROUM_URL}/'})
+        self.images = ImagePipeline(core_models.HospitalImage, 'hospital', USER_AGENT, invalidate=invalidate_hospitals)
+        await self.images.prefetch()
 
-            async def safe_detail(detail_ctx, durl):
-                dpage = await detail_ctx.new_page()
-                for attempt in range(1, RETRY_COUNT+1):
-                    try:
-                        await dpage.goto(durl, wait_until='domcontentloaded', timeout=GOTO_TIMEOUT)
-                        await dpage.wait_for_timeout(500)
-                        # 페이지 내 간단 anchor 수 기록
-                        try:
-                            await dpage.evaluate("() => window.scrollTo(0,0)")
-                        except Exception:
-                            pass
-                        return dpage
-                    except Exception as e:
-                        self.stderr.write(f"[상세 이동 실패 {attempt}/{RETRY_COUNT}] {durl} : {e}")
-                        if attempt == RETRY_COUNT:
-                            try:
-                                await dpage.screenshot(path=str(SCREENSHOT_DIR / f"fail_detail_{int(asyncio.get_event_loop().time())}.png"))
-                            except Exception:
-                                pass
-                        await asyncio.sleep(1.5*attempt)
-                await dpage.close()
-                return None
+    async def on_finish(self):
+        await self.eroum.close()
+        await self.images.close()
+
+    async def after_save(self, pk, code):
+        # 병원 정보 저장 후 이미지와 태그 크롤링
+        await self.crawl_hospital_images_and_tags(pk, code)
 
-            async def auto_scroll(pg, max_rounds=8, pause=600):
-                last_height = await pg.evaluate("() => document.body.scrollHeight")
-                for i in range(max_rounds):
-                    await pg.evaluate("() => window.scrollBy(0, document.body.scrollHeight)")
-                    await pg.wait_for_timeout(pause)
-                    new_height = await pg.evaluate("() => document.body.scrollHeight")
-                    if new_height == last_height:
-                        break
-                    last_height = new_height
-
-            # 지역별 순회
-            for region_idx, current_location in enumerate(locations_to_crawl, 1):
-                self.stdout.write(f"\n{'='*60}")
-                self.stdout.write(f"[{region_idx}/{total_regions}] {current_location} 크롤링 시작")
-                self.stdout.write(f"{'='*60}")
-
-                region_facilities = 0
-                empty_page_count = 0
-
-                # 해당 지역의 페이지별 순회
-                for page_no in range(1, max_pages + 1):
-                    query = DEFAULT_QUERY.copy()
-                    query["location"] = current_location
-                    query["page"] = page_no
-
-                    url = f"{SEARCH_BASE_URL}?{urlencode(query, doseq=True)}"
-                    self.stdout.write(f"[{current_location}] 페이지 {page_no} 이동: {url}")
-
-                    ok = await safe_goto(page, url, expect_selector='a')
-                    if not ok:
-                        continue
-
-                    # 자동 스크롤 수행 (동적 로딩 대비)
-                    await auto_scroll(page)
-                    html = await page.content()
-
-                    # 디버그 스냅샷 저장
-                    region_name = current_location.split('/')[0]
-                    debug_path = SCREENSHOT_DIR / f"{region_name}_page{page_no}.html"
-                    debug_path.write_text(html, encoding='utf-8')
-
-                    soup = BeautifulSoup(html, "lxml")
-
-                    # 후보: list, item, card 등 class 를 가진 a 태그 수집 (일반화)
-                    anchors = []
-                    for a in soup.find_all("a", href=True):
-                        href_lower = a["href"].lower()
-                        if "/search/view/" in href_lower:  # 우선 강제 패턴
-                            anchors.append(a)
-                        elif any(k in href_lower for k in DETAIL_KEYWORDS):
-                            anchors.append(a)
-
-                    # 중복 제거 & 절대 URL 보정
-                    detail_links = []
-                    for a in anchors:
-                        href = a["href"].strip()
-                        if href.startswith("javascript:"):
-                            continue
-                        if href.startswith("/"):
-                            href = "https://www.seniortalktalk.com" + href
-                        if href not in detail_urls_seen and href.startswith("http"):
-                            detail_urls_seen.add(href)
-                            detail_links.append(href)
-
-                    # 링크 디버그 저장
-                    link_debug_file = SCREENSHOT_DIR / f"{region_name}_links_page{page_no}.txt"
-                    link_debug_file.write_text("\n".join(detail_links), encoding='utf-8')
-
-                    if not detail_links:
-                        empty_page_count += 1
-                        self.stdout.write(f"[{current_location}] 페이지 {page_no} 상세 링크 0개")
-                        # 연속 3페이지 이상 비어있으면 해당 지역 크롤링 종료
-                        if empty_page_count >= 3:
-                            self.stdout.write(f"[{current_location}] 연속 {empty_page_count}페이지 비어있음 - 해당 지역 크롤링 종료")
-                            break
-                        continue
-                    else:
-                        empty_page_count = 0  # 링크가 있으면 카운터 리셋
-                        self.stdout.write(f"[{current_location}] 페이지 {page_no} 상세 링크 {len(detail_links)}개")
-
-                    page_facilities = 0
-                    for link in tqdm(detail_links, desc=f"{region_name} p{page_no}", unit="fac"):
-                        dpage = await safe_detail(context, link)
-                        if not dpage:
-                            continue
-                        try:
-                            dhtml = await dpage.content()
-                            dsoup = BeautifulSoup(dhtml, "lxml")
-                            data = self.parse_detail(dsoup, link)
-                            code = data.get('overview', {}).get('code')
-                            richness = _compute_richness(data)
-                            do_save = True
-                            updated = False
-                            if code in best_scores:
-                                if richness > best_scores[code]:
-                                    updated = True
-                                else:
-                                    do_save = False
-                            if do_save:
-                                facility = await sync_to_async(self.save_to_db, thread_sensitive=True)(data)
-                                best_scores[code] = richness
-                                if facility:
-                                    # 병원 정보 저장 후 이미지와 태그 크롤링
-                                    try:
-                                        images_found = await sync_to_async(self.crawl_hospital_images_and_tags, thread_sensitive=True)(facility)
-                                        # has_images 필드 업데이트
-                                        facility.has_images = images_found
-                                        await sync_to_async(facility.save, thread_sensitive=True)(update_fields=['has_images'])
-                                    except Exception as img_e:
-                                        self.stderr.write(f"[이미지 크롤링 오류] {facility.code}: {img_e}")
-
-                                    if updated:
-                                        dup_updated += 1
-                                        self.stdout.write(f"[갱신] {facility.code} (점수 {richness})")
-                                    else:
-                                        saved_facilities.append(facility)
-                                        page_facilities += 1
-                                        region_facilities += 1
-                                        self.stdout.write(f"[저장] {facility.code} (점수 {richness})")
-                            else:
-                                dup_skipped += 1
-                                self.stdout.write(f"[중복-스킵] {code} (기존 점수 {best_scores[code]}, 새 점수 {richness})")
-                        except Exception as e:
-                            self.stderr.write(f"[오류] {link}: {e}\n")
-                        finally:
-                            await dpage.close()
-                            await asyncio.sleep(delay + random.uniform(0, delay / 2))
-
-                    self.stdout.write(f"[{current_location}] 페이지 {page_no} 완료: {page_facilities}개 시설 저장")
-
-                self.stdout.write(f"[{current_location}] 지역 크롤링 완료: 총 {region_facilities}개 시설")
-
-            await context.close()
-            await browser.close()
-
-        self.stdout.write(f"\n{'='*60}")
-        self.stdout.write(f"전체 크롤링 완료!")
-        self.stdout.write(f"총 {len({f.id for f in saved_facilities})}개 시설 DB 저장")
-        self.stdout.write(f"중복 스킵: {dup_skipped}, 정보 갱신: {dup_updated}")
-        self.stdout.write(f"{'='*60}")
+    async def summary_lines(self):
+        stats = self.images.stats
+        lines = [f"이미지: 새로 저장 {stats['saved']}, 기존 {stats['known']}, 다운로드 실패 {stats['failed']}, 중복 건너뜀 {stats['duplicate']}"]
         try:
             hospital_count = await sync_to_async(core_models.Hospital.objects.count)()
-            self.stdout.write(f"요양병원 레코드 누적: {hospital_count}")
+            lines.append(f"요양병원 레코드 누적: {hospital_count}")
         except Exception:
             pass
+        return lines
 
     def parse_detail(self, soup, url):
         """요양병원 상세 페이지 파싱"""
@@ -573,30 +326,34 @@ class Command(BaseCommand):
                     except:
                         pass
 
-            hospital, created = core_models.Hospital.objects.update_or_create(
-                code=code,
-                defaults={
-                    'name': overview.get('name', ''),
-                    'grade': overview.get('grade', ''),
-                    'establishment_type': overview.get('establishment_type', ''),
-                    'phone': overview.get('phone', ''),
-                    'establishment_date': establishment_date,
-                    'bed_count': data.get('bed_count', {}),
-                    'operation_facility': data.get('operation_facility', {}),
-                    'doctor_count': data.get('doctor_count', {}),
-                    'specialist_by_department': data.get('specialist_by_department', {}),
-                    'department_specialists': data.get('department_specialists', {}),
-                    'other_staff': data.get('other_staff', {}),
-                    'consultation_hours': data.get('consultation_hours', {}),
-                    'medical_fee_info': data.get('medical_fee_info', {}),
-                    'location': overview.get('location', ''),
-                    'has_images': False,  # 추후 이미지 크롤링 시 구현
-                    'sido': '',  # 추후 지역 정보 파싱 시 구현
-                    'sigungu': '',  # 추후 지역 정보 파싱 시 구현
-                    'homepage_url': '',  # 추후 홈페이지 정보 파싱 시 구현
-                    'summary': ''  # 추후 AI 요약 시 구현
-                }
-            )
+            # 병원 저장과 속성 재계산을 한 트랜잭션으로 (캐시 무효화는 커밋 후 한 번)
+            with transaction.atomic():
+                hospital, created = core_models.Hospital.objects.update_or_create(
+                    code=code,
+                    defaults={
+                        'name': overview.get('name', ''),
+                        'grade': overview.get('grade', ''),
+                        'establishment_type': overview.get('establishment_type', ''),
+                        'phone': overview.get('phone', ''),
+                        'establishment_date': establishment_date,
+                        'bed_count': data.get('bed_count', {}),
+                        'operation_facility': data.get('operation_facility', {}),
+                        'doctor_count': data.get('doctor_count', {}),
+                        'specialist_by_department': data.get('specialist_by_department', {}),
+                        'department_specialists': data.get('department_specialists', {}),
+                        'other_staff': data.get('other_staff', {}),
+                        'consultation_hours': data.get('consultation_hours', {}),
+                        'medical_fee_info': data.get('medical_fee_info', {}),
+                        'location': overview.get('location', ''),
+                        'has_images': False,  # 추후 이미지 크롤링 시 구현
+                        'sido': '',  # 추후 지역 정보 파싱 시 구현
+                        'sigungu': '',  # 추후 지역 정보 파싱 시 구현
+                        'homepage_url': '',  # 추후 홈페이지 정보 파싱 시 구현
+                        'summary': ''  # 추후 AI 요약 시 구현
+                    }
+                )
+                # 병상/의사/전문의 등 JSON 값을 검색용 정수 행으로 갱신
+                sync_hospital_attributes([hospital.pk])
 
             return hospital
 
@@ -604,88 +361,26 @@ class Command(BaseCommand):
             self.stderr.write(f"DB 저장 오류: {e}")
             return None
 
-    def crawl_hospital_images_and_tags(self, hospital):
-        """병원 코드를 사용해 eroum.co.kr에서 이미지와 태그 크롤링"""
+    async def crawl_hospital_images_and_tags(self, pk, code):
+        """병원 코드를 사용해 eroum.co.kr에서 이미지와 태그 크롤링 (이미지는 백그라운드로 내려받아 일괄 저장)"""
         # 요양병원의 경우 careCenterType을 NURSING_HOSPITAL로 변경
-        url = f"https://eroum.co.kr/search/hospitalDetail?careCenterType=NURSING_HOSPITAL&webYn=Y&ykiho={hospital.code}"
-
-        headers = {
-            'User-Agent': USER_AGENT,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-
-        try:
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+        url = f"{EROUM_URL}/search/hospitalDetail?careCenterType=NURSING_HOSPITAL&webYn=Y&ykiho={code}"
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # 이미지 크롤링
-            images_found = self.crawl_hospital_images(hospital, soup)
-
-            # 태그 크롤링
-            self.crawl_hospital_tags(hospital, soup)
-
-            return images_found
-
-        except Exception as e:
-            self.stderr.write(f"이미지/태그 크롤링 오류 ({hospital.code}): {e}")
-            return False
-
-    def crawl_hospital_images(self, hospital, soup):
-        """이미지 크롤링 및 저장 - 이미지가 발견되면 True 반환"""
-        # swiper-slide 내의 이미지 찾기
-        image_slides = soup.select('div.swiper-slide img')
-
-        if not image_slides:
-            return False
-
-        images_saved = 0
-        for img_tag in image_slides:
-            img_src = img_tag.get('src')
-            if not img_src:
-                continue
-
-            try:
-                # 이미 존재하는 이미지인지 확인
-                if core_models.HospitalImage.objects.filter(original_url=img_src).exists():
-                    continue
-
-                # 이미지 다운로드
-                img_response = requests.get(img_src, headers={'User-Agent': USER_AGENT}, timeout=15)
-                img_response.raise_for_status()
-
-                # 파일명 생성
-                parsed_url = urlparse(img_src)
-                filename = os.path.basename(parsed_url.path)
-                if not filename or '.' not in filename:
-                    filename = f"hospital_{hospital.code}_{images_saved}.jpg"
-
-                # HospitalImage 객체 생성 및 이미지 저장
-                hospital_image = core_models.HospitalImage(
-                    hospital=hospital,
-                    original_url=img_src
-                )
-
-                # 이미지 파일을 ImageField에 저장
-                hospital_image.image.save(
-                    filename,
-                    ContentFile(img_response.content),
-                    save=True
-                )
+        html = await self.eroum.fetch(url)
+        if html is None:
+            self.stderr.write(f"이미지/태그 크롤링 오류 ({code}): 상세 페이지를 가져오지 못했습니다")
+            await self.images.add(pk, [], f"hospital_{code}")  # has_images = False
+            return
+        soup = await asyncio.to_thread(BeautifulSoup, html, 'html.parser')
 
-                images_saved += 1
-                self.stdout.write(f"이미지 저장 완료: {hospital.code} - {img_src}")
+        # 이미지 크롤링 (has_images: 저장된 이미지가 있으면 바로 True, 새 이미지는 저장되면 True)
+        await self.images.add(pk, image_urls(soup), f"hospital_{code}")
 
-            except Exception as e:
-                self.stderr.write(f"이미지 저장 실패 ({img_src}): {e}")
-                continue
+        # 태그 크롤링
+        await sync_to_async(self._crawl_tags, thread_sensitive=True)(pk, soup)
 
-        return images_saved > 0
+    def _crawl_tags(self, pk, soup):
+        self.crawl_hospital_tags(core_models.Hospital.objects.get(pk=pk), soup)
 
     def crawl_hospital_tags(self, hospital, soup):
         """태그 크롤링 및 저장"""
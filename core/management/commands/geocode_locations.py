@@ -87,7 +87,7 @@ class Command(BaseCommand):
                 if lat and lng:
                     facility.latitude = Decimal(str(lat))
                     facility.longitude = Decimal(str(lng))
-                    facility.save(update_fields=['latitude', 'longitude'])
+                    facility.save(update_fields=['latitude', 'longitude', 'geohash'])
                     success_count += 1
                     self.stdout.write(
                         self.style.SUCCESS(f'  ✓ Updated coordinates: {lat}, {lng}')
@@ -146,7 +146,7 @@ class Command(BaseCommand):
                 if lat and lng:
                     hospital.latitude = Decimal(str(lat))
                     hospital.longitude = Decimal(str(lng))
-                    hospital.save(update_fields=['latitude', 'longitude'])
+                    hospital.save(update_fields=['latitude', 'longitude', 'geohash'])
                     success_count += 1
                     self.stdout.write(
                         self.style.SUCCESS(f'  ✓ Updated coordinates: {lat}, {lng}')
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from core.caching import get_facility_detail
+from core.models import Facility
+
+
+class Command(BaseCommand):
+    help = '조회수가 많은 시설의 상세 페이지 캐시를 미리 채웁니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=200, help='조회수 상위 N개 시설 (기본: 200)')
+        parser.add_argument('--codes', nargs='*', default=None, help='특정 시설 코드만 prewarm')
+        parser.add_argument('--refresh', action='store_true', help='기존 캐시가 있어도 다시 생성')
+
+    def handle(self, *args, **options):
+        codes = options['codes']
+        if not codes:
+            codes = list(
+                Facility.objects.order_by('-view_count', 'name')
+                .values_list('code', flat=True)[:options['limit']]
+            )
+
+        self.stdout.write(f'총 {len(codes)}개 시설 상세 캐시 생성 시작')
+
+        warmed = 0
+        missing = 0
+        for code in codes:
+            if get_facility_detail(code, refresh=options['refresh']) is None:
+                missing += 1
+                self.stdout.write(self.style.WARNING(f'시설 코드 {code}를 찾을 수 없습니다.'))
+                continue
+            warmed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'완료: {warmed}개 캐시 생성, {missing}개 없음'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.costs import sync_facility_costs
+from core.models import Facility
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = '비급여 항목을 월 환산 금액(FacilityCost)과 시설별 월 합계로 다시 계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--codes', nargs='*', default=None, help='특정 시설 코드만 재계산')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f'한 번에 처리할 시설 수 (기본: {BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        queryset = Facility.objects.order_by('pk')
+        if options['codes']:
+            queryset = queryset.filter(code__in=options['codes'])
+
+        pks = list(queryset.values_list('pk', flat=True))
+        self.stdout.write(f'총 {len(pks)}개 시설 비급여 비용 계산 시작')
+
+        batch_size = max(1, options['batch_size'])
+        row_count = 0
+        for start in range(0, len(pks), batch_size):
+            row_count += sync_facility_costs(pks[start:start + batch_size])
+            self.stdout.write(f'  {min(start + batch_size, len(pks))}/{len(pks)}')
+
+        self.stdout.write(self.style.SUCCESS(f'완료: 비용 항목 {row_count}개 생성'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.hospital_attributes import sync_hospital_attributes
+from core.models import Hospital
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = '요양병원 JSON 필드(병상/의사/전문의/기타인력)를 HospitalAttribute 와 합계 컬럼으로 다시 계산합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--codes', nargs='*', default=None, help='특정 병원 코드만 재계산')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f'한 번에 처리할 병원 수 (기본: {BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        queryset = Hospital.objects.order_by('pk')
+        if options['codes']:
+            queryset = queryset.filter(code__in=options['codes'])
+
+        pks = list(queryset.values_list('pk', flat=True))
+        self.stdout.write(f'총 {len(pks)}개 병원 속성 계산 시작')
+
+        batch_size = max(1, options['batch_size'])
+        row_count = 0
+        for start in range(0, len(pks), batch_size):
+            row_count += sync_hospital_attributes(pks[start:start + batch_size])
+            self.stdout.write(f'  {min(start + batch_size, len(pks))}/{len(pks)}')
+
+        self.stdout.write(self.style.SUCCESS(f'완료: 속성 {row_count}개 생성'))
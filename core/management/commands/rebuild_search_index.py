@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Facility
+from core.search import reindex_facilities, REINDEX_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = '시설 검색 색인(FacilitySearchToken)을 다시 생성합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--codes', nargs='*', default=None, help='특정 시설 코드만 재색인')
+        parser.add_argument('--batch-size', type=int, default=REINDEX_BATCH_SIZE, help=f'한 번에 처리할 시설 수 (기본: {REINDEX_BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        queryset = Facility.objects.order_by('pk')
+        if options['codes']:
+            queryset = queryset.filter(code__in=options['codes'])
+
+        pks = list(queryset.values_list('pk', flat=True))
+        self.stdout.write(f'총 {len(pks)}개 시설 검색 색인 생성 시작')
+
+        batch_size = max(1, options['batch_size'])
+        token_count = 0
+        for start in range(0, len(pks), batch_size):
+            token_count += reindex_facilities(pks[start:start + batch_size])
+            self.stdout.write(f'  {min(start + batch_size, len(pks))}/{len(pks)}')
+
+        self.stdout.write(self.style.SUCCESS(f'완료: 토큰 {token_count}개 생성'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2025-09-02 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_alter_facilityevaluation_options_facility_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facility',
+            name='view_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='상세 페이지 조회수 (캐시 prewarm 대상 선정용)', verbose_name='조회수'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.5 on 2025-09-03 09:40
+
+from django.db import migrations, models
+
+# 마이그레이션 시점의 계산 방식을 고정하기 위해 core.geo 를 import 하지 않고 복사해 둔다
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 7
+
+
+def geohash_for(lat, lng, precision=GEOHASH_PRECISION):
+    lat, lng = float(lat), float(lng)
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 짝수 비트는 경도
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def backfill_geohash(apps, schema_editor):
+    for model_name in ('Facility', 'Hospital'):
+        model = apps.get_model('core', model_name)
+        rows = model.objects.filter(latitude__isnull=False, longitude__isnull=False).only('pk', 'latitude', 'longitude')
+        batch = []
+        for obj in rows.iterator(chunk_size=1000):
+            obj.geohash = geohash_for(obj.latitude, obj.longitude)
+            batch.append(obj)
+            if len(batch) >= 1000:
+                model.objects.bulk_update(batch, ['geohash'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_facility_view_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facility',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, help_text='위도/경도로 계산 (주변 검색용)', max_length=12, verbose_name='지오해시'),
+        ),
+        migrations.AddField(
+            model_name='hospital',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, help_text='위도/경도로 계산 (주변 검색용)', max_length=12, verbose_name='지오해시'),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
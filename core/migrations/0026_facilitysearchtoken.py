@@ -0,0 +1,80 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:31
+
+import re
+import unicodedata
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 마이그레이션 시점의 토큰화 방식을 고정하기 위해 core.search 를 import 하지 않고 복사해 둔다
+FIELD_WEIGHTS = {'name': 10, 'tags': 4, 'location': 3, 'program': 1}
+WORD_RE = re.compile(r'[0-9a-z가-힣]+')
+
+
+def text_tokens(text, unigrams=False):
+    tokens = []
+    for word in WORD_RE.findall(unicodedata.normalize('NFKC', text or '').lower()):
+        if len(word) < 2:
+            tokens.append(word)
+            continue
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        if unigrams:
+            tokens.extend(word)
+    return tokens
+
+
+def backfill_tokens(apps, schema_editor):
+    Facility = apps.get_model('core', 'Facility')
+    FacilityProgram = apps.get_model('core', 'FacilityProgram')
+    FacilitySearchToken = apps.get_model('core', 'FacilitySearchToken')
+    Tag = apps.get_model('core', 'Tag')
+    tags, programs = {}, {}
+    for facility_id, name in Tag.facilities.through.objects.values_list('facility_id', 'tag__name').iterator(chunk_size=1000):
+        tags.setdefault(facility_id, []).append(name)
+    for facility_id, title, content in FacilityProgram.objects.values_list('facility_id', 'title', 'content').iterator(chunk_size=1000):
+        programs.setdefault(facility_id, []).append(f'{title} {content}')
+    rows = []
+    facilities = Facility.objects.values_list('pk', 'name', 'sido', 'sigungu', 'location')
+    for pk, name, sido, sigungu, location in facilities.iterator(chunk_size=1000):
+        fields = {
+            'name': text_tokens(name, unigrams=True),
+            'tags': text_tokens(' '.join(tags.get(pk, []))),
+            'location': text_tokens(' '.join(filter(None, [sido, sigungu, location]))),
+            'program': text_tokens(' '.join(programs.get(pk, []))),
+        }
+        weights = Counter()
+        for field, tokens in fields.items():
+            for token in set(tokens):
+                weights[token[:16]] += FIELD_WEIGHTS[field]
+        rows.extend(FacilitySearchToken(facility_id=pk, token=token, weight=weight) for token, weight in weights.items())
+        if len(rows) >= 5000:
+            FacilitySearchToken.objects.bulk_create(rows, batch_size=1000)
+            rows = []
+    FacilitySearchToken.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_facility_geohash_hospital_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacilitySearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(help_text='한글 bigram 또는 한 글자 토큰', max_length=16, verbose_name='토큰')),
+                ('weight', models.PositiveIntegerField(default=1, help_text='시설명 > 태그 > 주소 > 프로그램 순 필드 가중치 합', verbose_name='가중치')),
+                ('facility', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='core.facility')),
+            ],
+            options={
+                'verbose_name': '검색 색인',
+                'verbose_name_plural': '검색 색인',
+                'indexes': [models.Index(fields=['token', 'facility'], name='facility_search_token_idx')],
+                'unique_together': {('facility', 'token')},
+            },
+        ),
+        migrations.RunPython(backfill_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:39
+
+import django.db.models.deletion
+import re
+
+from django.db import migrations, models
+
+# 마이그레이션 시점의 계산 방식을 고정하기 위해 core.costs / core.parsing 을 import 하지 않고 복사해 둔다
+DAYS_PER_MONTH = 30
+NUMBER_RE = re.compile(r'\d[\d,]*')
+CATEGORY_KEYWORDS = [
+    ('snack', ('간식',)),
+    ('meal', ('식사', '식비', '식대', '급식')),
+    ('room', ('상급침실', '1인실', '2인실', '침실')),
+    ('beauty', ('이미용', '미용')),
+]
+
+
+def categorize(title):
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in title for keyword in keywords):
+            return category
+    return 'etc'
+
+
+def monthly_amount(title, content):
+    text = str(content or '')
+    numbers = re.findall(r'(\d[\d,]*)\s*원', text) or NUMBER_RE.findall(text)
+    if not numbers:
+        return None
+    amount = max(int(n.replace(',', '')) for n in numbers)
+    joined = f'{title or ""} {text}'
+    if re.search(r'1\s*일|일당|/\s*일|하루|일\s*기준', joined):
+        return amount * DAYS_PER_MONTH
+    return amount
+
+
+def cost_items(source):
+    items = []
+    for title, content in (source or {}).items():
+        title = (title or '').strip()
+        amount = monthly_amount(title, content)
+        if title and amount is not None:
+            items.append((categorize(title), title[:100], amount))
+    return items
+
+
+def backfill_costs(apps, schema_editor):
+    Facility = apps.get_model('core', 'Facility')
+    FacilityCost = apps.get_model('core', 'FacilityCost')
+    FacilityNonCovered = apps.get_model('core', 'FacilityNonCovered')
+    sections = {}
+    for facility_id, title, content in FacilityNonCovered.objects.values_list('facility_id', 'title', 'content').iterator(chunk_size=1000):
+        sections.setdefault(facility_id, {})[title] = content
+    rows, facilities = [], []
+    for facility in Facility.objects.only('pk', 'noncovered_info').iterator(chunk_size=1000):
+        items = cost_items(sections.get(facility.pk) or facility.noncovered_info)
+        if not items:
+            continue
+        rows.extend(FacilityCost(facility_id=facility.pk, category=category, title=title, monthly_amount=amount) for category, title, amount in items)
+        facility.noncovered_monthly_total = sum(amount for _, _, amount in items)
+        facilities.append(facility)
+    FacilityCost.objects.bulk_create(rows, batch_size=1000)
+    Facility.objects.bulk_update(facilities, ['noncovered_monthly_total'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_facilitysearchtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facility',
+            name='noncovered_monthly_total',
+            field=models.PositiveIntegerField(blank=True, db_index=True, help_text='FacilityCost 월 환산 금액 합계(원), 비급여 정보가 없으면 비어 있음', null=True, verbose_name='비급여 월 합계'),
+        ),
+        migrations.CreateModel(
+            name='FacilityCost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('meal', '식사재료비'), ('snack', '간식비'), ('room', '상급침실이용료'), ('beauty', '이미용비'), ('etc', '기타')], max_length=16, verbose_name='분류')),
+                ('title', models.CharField(max_length=100, verbose_name='항목명')),
+                ('monthly_amount', models.PositiveIntegerField(help_text='원 단위, 1일 기준 금액은 30일로 환산', verbose_name='월 금액')),
+                ('facility', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='costs', to='core.facility')),
+            ],
+            options={
+                'verbose_name': '비급여 비용',
+                'verbose_name_plural': '비급여 비용',
+                'indexes': [models.Index(fields=['category', 'monthly_amount'], name='facility_cost_category_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_costs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:41
+
+import django.db.models.deletion
+import re
+
+from django.db import migrations, models
+
+# 마이그레이션 시점의 계산 방식을 고정하기 위해 core.hospital_attributes / core.parsing 을 import 하지 않고 복사해 둔다
+NUMBER_RE = re.compile(r'\d[\d,]*')
+TOTAL_KEYWORDS = ('합계', '총')
+
+
+def parse_count(text):
+    match = NUMBER_RE.search(str(text or ''))
+    return int(match.group().replace(',', '')) if match else None
+
+
+def parse_bed_count(text):
+    numbers = re.findall(r'(\d[\d,]*)\s*(?:명|개|병상)', str(text or ''))
+    if not numbers:
+        return parse_count(text)
+    return sum(int(n.replace(',', '')) for n in numbers)
+
+
+ATTRIBUTE_SOURCES = {
+    'bed': ('bed_count', parse_bed_count),
+    'doctor': ('doctor_count', parse_count),
+    'specialist': ('specialist_by_department', parse_count),
+    'department': ('department_specialists', parse_count),
+    'staff': ('other_staff', parse_count),
+}
+SOURCE_FIELDS = [field for field, _ in ATTRIBUTE_SOURCES.values()]
+
+
+def attribute_items(hospital):
+    items = {}
+    for kind, (field, parser) in ATTRIBUTE_SOURCES.items():
+        values = getattr(hospital, field) or {}
+        if not isinstance(values, dict):
+            continue
+        for name, text in values.items():
+            name = (name or '').strip()[:100]
+            count = parser(text)
+            if name and count is not None:
+                items.setdefault((kind, name), count)
+    return [(kind, name, count) for (kind, name), count in items.items()]
+
+
+def kind_total(items, kind):
+    counts = {name: count for item_kind, name, count in items if item_kind == kind}
+    if not counts:
+        return None
+    for name, count in counts.items():
+        if any(keyword in name for keyword in TOTAL_KEYWORDS):
+            return count
+    return sum(counts.values())
+
+
+def backfill_attributes(apps, schema_editor):
+    Hospital = apps.get_model('core', 'Hospital')
+    HospitalAttribute = apps.get_model('core', 'HospitalAttribute')
+    rows, hospitals = [], []
+    for hospital in Hospital.objects.only('pk', *SOURCE_FIELDS).iterator(chunk_size=1000):
+        items = attribute_items(hospital)
+        if not items:
+            continue
+        rows.extend(HospitalAttribute(hospital_id=hospital.pk, kind=kind, name=name, count=count) for kind, name, count in items)
+        hospital.doctor_total = kind_total(items, 'doctor')
+        hospital.bed_total = kind_total(items, 'bed')
+        hospitals.append(hospital)
+    HospitalAttribute.objects.bulk_create(rows, batch_size=1000)
+    Hospital.objects.bulk_update(hospitals, ['doctor_total', 'bed_total'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_facilitycost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hospital',
+            name='bed_total',
+            field=models.PositiveIntegerField(blank=True, db_index=True, help_text='bed_count 에서 계산 (HospitalAttribute 와 함께 갱신)', null=True, verbose_name='병상 수 합계'),
+        ),
+        migrations.AddField(
+            model_name='hospital',
+            name='doctor_total',
+            field=models.PositiveIntegerField(blank=True, db_index=True, help_text='doctor_count 에서 계산 (HospitalAttribute 와 함께 갱신)', null=True, verbose_name='의사 수 합계'),
+        ),
+        migrations.CreateModel(
+            name='HospitalAttribute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('bed', '병상수'), ('doctor', '의사수'), ('specialist', '전문과목별 전문의수'), ('department', '진료과목별 전문의수'), ('staff', '기타인력')], max_length=16, verbose_name='구분')),
+                ('name', models.CharField(help_text='병상 유형, 과목명, 직종 등', max_length=100, verbose_name='항목명')),
+                ('count', models.PositiveIntegerField(verbose_name='수')),
+                ('hospital', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attributes', to='core.hospital')),
+            ],
+            options={
+                'verbose_name': '병원 속성',
+                'verbose_name_plural': '병원 속성',
+                'indexes': [models.Index(fields=['kind', 'name', 'count'], name='hospital_attribute_idx')],
+                'unique_together': {('hospital', 'kind', 'name')},
+            },
+        ),
+        migrations.RunPython(backfill_attributes, migrations.RunPython.noop),
+    ]
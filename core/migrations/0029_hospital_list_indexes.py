@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_hospitalattribute'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hospital',
+            index=models.Index(fields=['sido', 'sigungu', 'name'], name='hospital_region_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hospital',
+            index=models.Index(fields=['grade', 'name'], name='hospital_grade_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_hospital_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('crawler', models.CharField(choices=[('facility', '요양원'), ('hospital', '요양병원')], max_length=16, verbose_name='크롤러')),
+                ('run_id', models.CharField(max_length=32, verbose_name='실행 ID')),
+                ('region', models.CharField(max_length=32, verbose_name='지역')),
+                ('shard', models.PositiveIntegerField(default=0, verbose_name='샤드')),
+                ('page', models.PositiveIntegerField(default=0, help_text='처리 중인 목록 페이지 (재개 시 이 페이지부터)', verbose_name='페이지')),
+                ('done', models.BooleanField(default=False, verbose_name='완료')),
+                ('saved', models.PositiveIntegerField(default=0, verbose_name='신규 저장')),
+                ('updated', models.PositiveIntegerField(default=0, verbose_name='갱신')),
+                ('skipped', models.PositiveIntegerField(default=0, verbose_name='중복 스킵')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '크롤 커서',
+                'verbose_name_plural': '크롤 커서',
+                'indexes': [models.Index(fields=['crawler', '-updated_at'], name='crawl_cursor_recent_idx')],
+                'unique_together': {('crawler', 'run_id', 'region')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CrawlRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('crawler', models.CharField(choices=[('facility', '요양원'), ('hospital', '요양병원')], max_length=16, verbose_name='크롤러')),
+                ('code', models.CharField(max_length=64, verbose_name='시설 코드')),
+                ('run_id', models.CharField(help_text='richness 가 기록된 실행', max_length=32, verbose_name='실행 ID')),
+                ('richness', models.IntegerField(default=0, verbose_name='풍부도 점수')),
+                ('url', models.CharField(blank=True, max_length=500, verbose_name='상세 URL')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '크롤 기록',
+                'verbose_name_plural': '크롤 기록',
+                'unique_together': {('crawler', 'code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CrawlURL',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('crawler', models.CharField(choices=[('facility', '요양원'), ('hospital', '요양병원')], max_length=16, verbose_name='크롤러')),
+                ('url', models.CharField(max_length=500, verbose_name='상세 URL')),
+                ('run_id', models.CharField(help_text='마지막으로 이 URL 을 가져간 실행', max_length=32, verbose_name='실행 ID')),
+                ('region', models.CharField(blank=True, max_length=32, verbose_name='지역')),
+                ('code', models.CharField(blank=True, max_length=64, verbose_name='시설 코드')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('fetched', '수집'), ('parsed', '파싱'), ('saved', '저장'), ('skipped', '중복 스킵'), ('failed', '실패')], default='queued', max_length=16, verbose_name='상태')),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='이번 실행에서의 상세 이동 시도 횟수', verbose_name='시도 횟수')),
+                ('last_fetched', models.DateTimeField(blank=True, null=True, verbose_name='마지막 수집 시각')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '크롤 URL',
+                'verbose_name_plural': '크롤 URL',
+                'indexes': [models.Index(fields=['crawler', 'run_id', 'region', 'status'], name='crawl_url_pending_idx')],
+                'unique_together': {('crawler', 'url')},
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-19 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_crawl_frontier'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='changes',
+            field=models.PositiveIntegerField(default=0, verbose_name='변경 횟수'),
+        ),
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='checks',
+            field=models.PositiveIntegerField(default=0, verbose_name='확인 횟수'),
+        ),
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='fingerprint',
+            field=models.CharField(blank=True, help_text='파싱 결과 전체의 해시 (같으면 DB 저장 생략)', max_length=40, verbose_name='내용 지문'),
+        ),
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='interval_hours',
+            field=models.PositiveIntegerField(default=24, verbose_name='재수집 간격(시간)'),
+        ),
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='last_changed',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='마지막 변경 시각'),
+        ),
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='last_checked',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='마지막 확인 시각'),
+        ),
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='next_due',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='다음 재수집 시각'),
+        ),
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='section_changes',
+            field=models.JSONField(blank=True, default=dict, verbose_name='섹션별 변경 횟수'),
+        ),
+        migrations.AddField(
+            model_name='crawlrecord',
+            name='section_fingerprints',
+            field=models.JSONField(blank=True, default=dict, verbose_name='섹션별 지문'),
+        ),
+        migrations.AddIndex(
+            model_name='crawlrecord',
+            index=models.Index(fields=['crawler', 'next_due'], name='crawl_record_due_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.conf import settings
 from pgvector.django import VectorField, HnswIndex
 
+from .geo import geohash_for
+
 
 class TimestampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -11,6 +13,14 @@ class TimestampedModel(models.Model):
         abstract = True
 
 
+def set_geohash(instance, save_kwargs):
+    """좌표로 geohash 를 갱신 (update_fields 에 좌표가 있으면 geohash 도 함께 저장)"""
+    instance.geohash = geohash_for(instance.latitude, instance.longitude)
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+        save_kwargs['update_fields'] = {*update_fields, 'geohash'}
+
+
 class Facility(TimestampedModel):
     code = models.CharField(max_length=32, unique=True, verbose_name='시설 코드', help_text='고유한 시설 식별 코드')
     name = models.CharField(max_length=255)
@@ -35,6 +45,9 @@ class Facility(TimestampedModel):
     summary_embedding = VectorField(dimensions=1536, null=True, blank=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, db_index=True, help_text='위도 (WGS84)')
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, db_index=True, help_text='경도 (WGS84)')
+    view_count = models.PositiveIntegerField(default=0, db_index=True, verbose_name='조회수', help_text='상세 페이지 조회수 (캐시 prewarm 대상 선정용)')
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, verbose_name='지오해시', help_text='위도/경도로 계산 (주변 검색용)')
+    noncovered_monthly_total = models.PositiveIntegerField(null=True, blank=True, db_index=True, verbose_name='비급여 월 합계', help_text='FacilityCost 월 환산 금액 합계(원), 비급여 정보가 없으면 비어 있음')
 
     class Meta:
         ordering = ["name"]
@@ -51,6 +64,10 @@ class Facility(TimestampedModel):
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+    def save(self, *args, **kwargs):
+        set_geohash(self, kwargs)
+        super().save(*args, **kwargs)
+
 
 class FacilityBasic(TimestampedModel):
     facility = models.ForeignKey(Facility, on_delete=models.CASCADE, related_name='basic_items')
@@ -216,6 +233,9 @@ class Hospital(TimestampedModel):
     summary_embedding = VectorField(dimensions=1536, null=True, blank=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, db_index=True, help_text='위도 (WGS84)')
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, db_index=True, help_text='경도 (WGS84)')
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, verbose_name='지오해시', help_text='위도/경도로 계산 (주변 검색용)')
+    doctor_total = models.PositiveIntegerField(null=True, blank=True, db_index=True, verbose_name='의사 수 합계', help_text='doctor_count 에서 계산 (HospitalAttribute 와 함께 갱신)')
+    bed_total = models.PositiveIntegerField(null=True, blank=True, db_index=True, verbose_name='병상 수 합계', help_text='bed_count 에서 계산 (HospitalAttribute 와 함께 갱신)')
 
     class Meta:
         ordering = ["name"]
@@ -227,11 +247,18 @@ class Hospital(TimestampedModel):
                 name='hospital_sum_hnsw',
                 opclasses=['vector_cosine_ops'],
             ),
+            # 목록 페이지: 지역/등급 필터 + 이름순 정렬
+            models.Index(fields=['sido', 'sigungu', 'name'], name='hospital_region_idx'),
+            models.Index(fields=['grade', 'name'], name='hospital_grade_idx'),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+    def save(self, *args, **kwargs):
+        set_geohash(self, kwargs)
+        super().save(*args, **kwargs)
+
 
 class HospitalImage(TimestampedModel):
     hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE, related_name='images')
@@ -247,6 +274,33 @@ class HospitalImage(TimestampedModel):
         return f"{self.hospital.code} - {self.original_url.split('/')[-1]}"
 
 
+class HospitalAttribute(models.Model):
+    """병원 JSON 필드(병상/의사/전문의/기타인력)를 정수로 파싱한 행 (core/hospital_attributes.py 에서 재계산)"""
+    KIND_CHOICES = [
+        ('bed', '병상수'),
+        ('doctor', '의사수'),
+        ('specialist', '전문과목별 전문의수'),
+        ('department', '진료과목별 전문의수'),
+        ('staff', '기타인력'),
+    ]
+
+    hospital = models.ForeignKey(Hospital, on_delete=models.CASCADE, related_name='attributes')
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES, verbose_name='구분')
+    name = models.CharField(max_length=100, verbose_name='항목명', help_text='병상 유형, 과목명, 직종 등')
+    count = models.PositiveIntegerField(verbose_name='수')
+
+    class Meta:
+        verbose_name = "병원 속성"
+        verbose_name_plural = "병원 속성"
+        unique_together = ['hospital', 'kind', 'name']
+        indexes = [
+            models.Index(fields=['kind', 'name', 'count'], name='hospital_attribute_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.hospital_id}-{self.kind}:{self.name}={self.count}"
+
+
 class Tag(TimestampedModel):
     name = models.CharField(max_length=100, unique=True)
     facilities = models.ManyToManyField(Facility, related_name='tags', blank=True)
@@ -259,3 +313,147 @@ class Tag(TimestampedModel):
 
     def __str__(self):
         return self.name
+
+
+class FacilitySearchToken(models.Model):
+    """시설 검색 색인 (core/search.py 에서 관리, 시설/태그/섹션 변경 시 재계산)"""
+    facility = models.ForeignKey(Facility, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=16, verbose_name='토큰', help_text='한글 bigram 또는 한 글자 토큰')
+    weight = models.PositiveIntegerField(default=1, verbose_name='가중치', help_text='시설명 > 태그 > 주소 > 프로그램 순 필드 가중치 합')
+
+    class Meta:
+        verbose_name = "검색 색인"
+        verbose_name_plural = "검색 색인"
+        unique_together = ['facility', 'token']
+        indexes = [
+            models.Index(fields=['token', 'facility'], name='facility_search_token_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.facility_id}:{self.token}"
+
+
+class FacilityCost(models.Model):
+    """비급여 항목의 월 환산 금액 (core/costs.py 에서 FacilityNonCovered 로부터 재계산)"""
+    CATEGORY_CHOICES = [
+        ('meal', '식사재료비'),
+        ('snack', '간식비'),
+        ('room', '상급침실이용료'),
+        ('beauty', '이미용비'),
+        ('etc', '기타'),
+    ]
+
+    facility = models.ForeignKey(Facility, on_delete=models.CASCADE, related_name='costs')
+    category = models.CharField(max_length=16, choices=CATEGORY_CHOICES, verbose_name='분류')
+    title = models.CharField(max_length=100, verbose_name='항목명')
+    monthly_amount = models.PositiveIntegerField(verbose_name='월 금액', help_text='원 단위, 1일 기준 금액은 30일로 환산')
+
+    class Meta:
+        verbose_name = "비급여 비용"
+        verbose_name_plural = "비급여 비용"
+        indexes = [
+            models.Index(fields=['category', 'monthly_amount'], name='facility_cost_category_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.facility_id}-{self.title}: {self.monthly_amount}"
+
+
+CRAWLER_CHOICES = [
+    ('facility', '요양원'),
+    ('hospital', '요양병원'),
+]
+
+
+class CrawlURL(models.Model):
+    """크롤 프론티어: 상세 URL 별 처리 상태 (중단된 실행을 --resume 으로 이어가기 위함)"""
+    STATUS_QUEUED = 'queued'
+    STATUS_FETCHED = 'fetched'
+    STATUS_PARSED = 'parsed'
+    STATUS_SAVED = 'saved'
+    STATUS_SKIPPED = 'skipped'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, '대기'),
+        (STATUS_FETCHED, '수집'),
+        (STATUS_PARSED, '파싱'),
+        (STATUS_SAVED, '저장'),
+        (STATUS_SKIPPED, '중복 스킵'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    crawler = models.CharField(max_length=16, choices=CRAWLER_CHOICES, verbose_name='크롤러')
+    url = models.CharField(max_length=500, verbose_name='상세 URL')
+    run_id = models.CharField(max_length=32, verbose_name='실행 ID', help_text='마지막으로 이 URL 을 가져간 실행')
+    region = models.CharField(max_length=32, blank=True, verbose_name='지역')
+    code = models.CharField(max_length=64, blank=True, verbose_name='시설 코드')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED, verbose_name='상태')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='시도 횟수', help_text='이번 실행에서의 상세 이동 시도 횟수')
+    last_fetched = models.DateTimeField(null=True, blank=True, verbose_name='마지막 수집 시각')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "크롤 URL"
+        verbose_name_plural = "크롤 URL"
+        unique_together = ['crawler', 'url']
+        indexes = [
+            models.Index(fields=['crawler', 'run_id', 'region', 'status'], name='crawl_url_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.url} ({self.status})"
+
+
+class CrawlCursor(models.Model):
+    """실행별 지역 목록 페이지 커서와 처리 건수"""
+    crawler = models.CharField(max_length=16, choices=CRAWLER_CHOICES, verbose_name='크롤러')
+    run_id = models.CharField(max_length=32, verbose_name='실행 ID')
+    region = models.CharField(max_length=32, verbose_name='지역')
+    shard = models.PositiveIntegerField(default=0, verbose_name='샤드')
+    page = models.PositiveIntegerField(default=0, verbose_name='페이지', help_text='처리 중인 목록 페이지 (재개 시 이 페이지부터)')
+    done = models.BooleanField(default=False, verbose_name='완료')
+    saved = models.PositiveIntegerField(default=0, verbose_name='신규 저장')
+    updated = models.PositiveIntegerField(default=0, verbose_name='갱신')
+    skipped = models.PositiveIntegerField(default=0, verbose_name='중복 스킵')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "크롤 커서"
+        verbose_name_plural = "크롤 커서"
+        unique_together = ['crawler', 'run_id', 'region']
+        indexes = [
+            models.Index(fields=['crawler', '-updated_at'], name='crawl_cursor_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.run_id} {self.region} p{self.page}"
+
+
+class CrawlRecord(models.Model):
+    """시설 코드별 크롤 기록 (실행 안에서의 최고 풍부도 점수, 내용 지문과 재수집 일정)"""
+    crawler = models.CharField(max_length=16, choices=CRAWLER_CHOICES, verbose_name='크롤러')
+    code = models.CharField(max_length=64, verbose_name='시설 코드')
+    run_id = models.CharField(max_length=32, verbose_name='실행 ID', help_text='richness 가 기록된 실행')
+    richness = models.IntegerField(default=0, verbose_name='풍부도 점수')
+    url = models.CharField(max_length=500, blank=True, verbose_name='상세 URL')
+    fingerprint = models.CharField(max_length=40, blank=True, verbose_name='내용 지문', help_text='파싱 결과 전체의 해시 (같으면 DB 저장 생략)')
+    section_fingerprints = models.JSONField(default=dict, blank=True, verbose_name='섹션별 지문')
+    section_changes = models.JSONField(default=dict, blank=True, verbose_name='섹션별 변경 횟수')
+    checks = models.PositiveIntegerField(default=0, verbose_name='확인 횟수')
+    changes = models.PositiveIntegerField(default=0, verbose_name='변경 횟수')
+    last_checked = models.DateTimeField(null=True, blank=True, verbose_name='마지막 확인 시각')
+    last_changed = models.DateTimeField(null=True, blank=True, verbose_name='마지막 변경 시각')
+    interval_hours = models.PositiveIntegerField(default=24, verbose_name='재수집 간격(시간)')
+    next_due = models.DateTimeField(null=True, blank=True, verbose_name='다음 재수집 시각')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "크롤 기록"
+        verbose_name_plural = "크롤 기록"
+        unique_together = ['crawler', 'code']
+        indexes = [
+            models.Index(fields=['crawler', 'next_due'], name='crawl_record_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.crawler}:{self.code} ({self.richness})"
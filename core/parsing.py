@@ -0,0 +1,83 @@
+"""크롤링한 텍스트 값의 숫자 파싱
+
+인력현황("요양보호사": "12명"), 비급여("식사재료비": "4,500원 / 1일"), 병원 병상수("상급 : 21 명") 처럼
+제목/내용이 자유 텍스트인 값을 비교/정렬 가능한 정수로 바꾼다.
+"""
+import re
+
+DAYS_PER_MONTH = 30
+
+_NUMBER_RE = re.compile(r'\d[\d,]*')
+
+
+def parse_int(text):
+    """첫 번째 정수 (콤마 제거). 없으면 None"""
+    match = _NUMBER_RE.search(str(text or ''))
+    if not match:
+        return None
+    return int(match.group().replace(',', ''))
+
+
+def parse_count(text):
+    """'12명', '3 명(촉탁의 1명 포함)' → 12, 3"""
+    return parse_int(text)
+
+
+def parse_bed_count(text):
+    """'상급 : 21 명', '일반 : 30 병상 / 상급 : 4 병상' → 21, 34 (단위가 붙은 숫자 합, 없으면 첫 정수)"""
+    numbers = re.findall(r'(\d[\d,]*)\s*(?:명|개|병상)', str(text or ''))
+    if not numbers:
+        return parse_int(text)
+    return sum(int(n.replace(',', '')) for n in numbers)
+
+
+def parse_amount(text):
+    """금액 텍스트 → 가장 큰 숫자 (단위 '원' 이 붙은 값 우선). 없으면 None"""
+    text = str(text or '')
+    won = re.findall(r'(\d[\d,]*)\s*원', text)
+    numbers = won or _NUMBER_RE.findall(text)
+    if not numbers:
+        return None
+    return max(int(n.replace(',', '')) for n in numbers)
+
+
+def amount_period(*texts) -> str:
+    """제목/내용에서 금액 기준 기간 추정: 'day' | 'month' | 'once'"""
+    joined = ' '.join(str(t or '') for t in texts)
+    if re.search(r'1\s*일|일당|/\s*일|하루|일\s*기준', joined):
+        return 'day'
+    if re.search(r'1\s*회|회당|/\s*회', joined):
+        return 'once'
+    return 'month'
+
+
+def monthly_amount(title, content):
+    """비급여 항목 → 월 환산 금액(원). 1일 기준은 30일, 1회 기준은 월 1회로 계산"""
+    amount = parse_amount(content)
+    if amount is None:
+        return None
+    if amount_period(title, content) == 'day':
+        return amount * DAYS_PER_MONTH
+    return amount
+
+
+def staff_counts(facility) -> dict:
+    """시설의 {직종: 인원}. staff_info(JSON) 우선, 없으면 staff_items"""
+    items = facility.staff_info or {item.title: item.content for item in facility.staff_items.all()}
+    counts = {}
+    for title, content in items.items():
+        count = parse_count(content)
+        if title and count is not None:
+            counts[title.strip()] = count
+    return counts
+
+
+def noncovered_costs(facility) -> dict:
+    """시설의 {비급여 항목: 월 환산 금액}. noncovered_items 우선(기간 정보 포함), 없으면 noncovered_info"""
+    items = {item.title: item.content for item in facility.noncovered_items.all()} or facility.noncovered_info or {}
+    costs = {}
+    for title, content in items.items():
+        amount = monthly_amount(title, content)
+        if title and amount is not None:
+            costs[title.strip()] = amount
+    return costs
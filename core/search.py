@@ -0,0 +1,124 @@
+"""시설 검색 색인
+
+시설명, 주소, 태그, 프로그램 내용을 정규화한 뒤 bigram 토큰으로 나눠 FacilitySearchToken 에 저장한다.
+검색어도 같은 방식으로 토큰화해 모든 토큰을 가진 시설만 골라내고, 필드 가중치 합으로 순위를 매긴다.
+토큰 인덱스를 조회하므로 LIKE '%..%' 전체 스캔과 달리 테이블 크기에 비례해 느려지지 않는다.
+"""
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+
+from .models import Facility, FacilitySearchToken
+
+# 필드별 가중치 (시설명 일치가 가장 중요)
+FIELD_WEIGHTS = {
+    'name': 10,
+    'tags': 4,
+    'location': 3,
+    'program': 1,
+}
+
+REINDEX_BATCH_SIZE = 200
+
+_WORD_RE = re.compile(r'[0-9a-z가-힣]+')
+
+
+def normalize(text: str) -> list:
+    """소문자/NFKC 정규화 후 단어 목록"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return _WORD_RE.findall(text)
+
+
+def bigrams(word: str) -> list:
+    if len(word) < 2:
+        return [word] if word else []
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def text_tokens(text: str, unigrams: bool = False) -> list:
+    """색인용 토큰. unigrams=True 면 한 글자 검색을 위해 글자 단위 토큰도 포함 (시설명 전용)"""
+    tokens = []
+    for word in normalize(text):
+        tokens.extend(bigrams(word))
+        if unigrams and len(word) > 1:
+            tokens.extend(word)
+    return tokens
+
+
+def query_tokens(query: str) -> list:
+    """검색어 토큰 (중복 제거, 순서 유지)"""
+    tokens = []
+    for word in normalize(query):
+        tokens.extend(bigrams(word))
+    return list(dict.fromkeys(token[:16] for token in tokens))
+
+
+def facility_tokens(facility) -> Counter:
+    """시설 한 곳의 {토큰: 가중치}. tags, program_items 는 prefetch 된 상태를 가정"""
+    weights = Counter()
+    fields = {
+        'name': text_tokens(facility.name, unigrams=True),
+        'tags': text_tokens(' '.join(tag.name for tag in facility.tags.all())),
+        'location': text_tokens(' '.join(filter(None, [facility.sido, facility.sigungu, facility.location]))),
+        'program': text_tokens(' '.join(f'{item.title} {item.content}' for item in facility.program_items.all())),
+    }
+    for field, tokens in fields.items():
+        for token in set(tokens):
+            weights[token[:16]] += FIELD_WEIGHTS[field]
+    return weights
+
+
+def reindex_facilities(pks) -> int:
+    """지정한 시설들의 검색 토큰을 다시 계산. 생성한 토큰 수 반환"""
+    pks = list(pks)
+    facilities = (
+        Facility.objects.filter(pk__in=pks)
+        .only('pk', 'name', 'sido', 'sigungu', 'location')
+        .prefetch_related('tags', 'program_items')
+    )
+    rows = [
+        FacilitySearchToken(facility_id=facility.pk, token=token, weight=weight)
+        for facility in facilities
+        for token, weight in facility_tokens(facility).items()
+    ]
+    with transaction.atomic():
+        FacilitySearchToken.objects.filter(facility_id__in=pks).delete()
+        FacilitySearchToken.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def matching_facilities(tokens: list):
+    """모든 토큰을 가진 시설 pk 서브쿼리 (개수 제한 없음)"""
+    return (
+        FacilitySearchToken.objects.filter(token__in=tokens)
+        .values('facility')
+        .annotate(matched=Count('token'))
+        .filter(matched=len(tokens))
+        .values('facility')
+    )
+
+
+def search_facilities(queryset, query: str, ranked: bool = True):
+    """검색 색인으로 필터링. ranked=True 면 점수순 정렬
+
+    일치 조건은 서브쿼리로 queryset 의 다른 필터와 함께 적용되므로 지역/등급 필터나 페이지 수와 관계없이 빠짐없이 찾는다.
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return queryset.none()
+    queryset = queryset.filter(pk__in=matching_facilities(tokens))
+    if not ranked:
+        return queryset
+    score = (
+        FacilitySearchToken.objects.filter(facility=OuterRef('pk'), token__in=tokens)
+        .values('facility')
+        .annotate(total=Sum('weight'))
+        .values('total')
+    )
+    return queryset.annotate(
+        _search_score=Subquery(score, output_field=IntegerField())
+    ).order_by('-_search_score', 'pk')
+
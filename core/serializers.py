@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Facility, FacilityBasic, FacilityEvaluation, FacilityStaff, FacilityProgram, FacilityLocation, FacilityNonCovered
+from .models import Facility, Hospital, HospitalAttribute, FacilityBasic, FacilityEvaluation, FacilityStaff, FacilityProgram, FacilityLocation, FacilityNonCovered
 
 class FacilityBasicSerializer(serializers.ModelSerializer):
     class Meta:
@@ -53,7 +53,34 @@ class FacilityListSerializer(serializers.ModelSerializer):
         model = Facility
         fields = [
             'id', 'code', 'name', 'kind', 'grade', 'availability',
-            'capacity', 'occupancy', 'waiting'
+            'capacity', 'occupancy', 'waiting', 'noncovered_monthly_total'
+        ]
+
+class HospitalListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Hospital
+        fields = [
+            'id', 'code', 'name', 'grade', 'establishment_type', 'phone',
+            'sido', 'sigungu', 'location', 'latitude', 'longitude',
+            'doctor_total', 'bed_total'
+        ]
+
+class HospitalAttributeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HospitalAttribute
+        fields = ['kind', 'name', 'count']
+
+class HospitalDetailSerializer(serializers.ModelSerializer):
+    attributes = HospitalAttributeSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Hospital
+        fields = [
+            'id', 'code', 'name', 'grade', 'establishment_type', 'phone', 'establishment_date',
+            'sido', 'sigungu', 'location', 'latitude', 'longitude', 'homepage_url',
+            'bed_count', 'operation_facility', 'doctor_count', 'specialist_by_department',
+            'department_specialists', 'other_staff', 'consultation_hours', 'medical_fee_info',
+            'doctor_total', 'bed_total', 'attributes', 'summary', 'created_at', 'updated_at'
         ]
 
 class ChatRequestSerializer(serializers.Serializer):
@@ -0,0 +1,161 @@
+"""모델 변경 시 캐시 무효화 시그널
+
+관리자 수정/크롤러 저장 등으로 시설(또는 요양병원) 관련 데이터가 바뀌면
+트랜잭션 커밋 이후 검색 색인/비급여 비용을 다시 계산하고 상세 캐시 버전과 전역 데이터 세대를 올린다.
+"""
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from . import models
+from .caching import (
+    bump_facility_version, bump_hospital_version, bump_data_generation, forget_facility_code, forget_hospital_code,
+)
+from .costs import sync_facility_costs
+from .search import reindex_facilities
+
+# facility_id 를 가진 시설 하위 모델 (상세 페이지에 노출되는 것들)
+FACILITY_CHILD_MODELS = (
+    models.FacilityBasic,
+    models.FacilityEvaluation,
+    models.FacilityStaff,
+    models.FacilityProgram,
+    models.FacilityLocation,
+    models.FacilityHomepage,
+    models.FacilityNonCovered,
+    models.FacilityImage,
+)
+
+# 커밋 대기 중인 시설/병원 pk (스레드별)
+_pending = threading.local()
+
+
+def _schedule(name, pks):
+    pks = [pk for pk in pks if pk is not None]
+    if not pks:
+        return
+    pending = getattr(_pending, name, None)
+    if pending is None:
+        pending = set()
+        setattr(_pending, name, pending)
+    pending.update(pks)
+    transaction.on_commit(_flush_pending)
+
+
+def invalidate_facilities(*pks):
+    """커밋 이후 캐시 무효화 (롤백되면 무효화도 하지 않음)
+
+    크롤러처럼 한 트랜잭션에서 하위 행을 여러 개 저장/삭제하면 행마다 시그널이 발생하므로
+    pk 를 모아 두고 커밋 후 첫 콜백에서 한 번에 처리한다 (나머지 콜백은 처리할 pk 가 없음).
+    롤백된 트랜잭션의 pk 는 다음 커밋 때 함께 무효화될 수 있으나 캐시를 더 비울 뿐이다.
+    """
+    _schedule('facility_pks', pks)
+
+
+def invalidate_hospitals(*pks):
+    """병원 상세 캐시/목록 세대 무효화 (invalidate_facilities 와 같은 방식)"""
+    _schedule('hospital_pks', pks)
+
+
+def _flush_pending():
+    facility_pks = getattr(_pending, 'facility_pks', None)
+    hospital_pks = getattr(_pending, 'hospital_pks', None)
+    _pending.facility_pks = set()
+    _pending.hospital_pks = set()
+    if facility_pks:
+        _invalidate(sorted(facility_pks))
+    if hospital_pks:
+        bump_hospital_version(*hospital_pks)
+        bump_data_generation()
+
+
+def _invalidate(pks):
+    # 파생 데이터(검색 색인, 비급여 비용)를 먼저 갱신한 뒤 캐시를 무효화
+    reindex_facilities(pks)
+    sync_facility_costs(pks)
+    bump_facility_version(*pks)
+    bump_data_generation()
+
+
+@receiver(post_save, sender=models.Facility)
+def facility_saved(sender, instance, **kwargs):
+    invalidate_facilities(instance.pk)
+
+
+@receiver(post_delete, sender=models.Facility)
+def facility_deleted(sender, instance, **kwargs):
+    invalidate_facilities(instance.pk)
+    transaction.on_commit(lambda: forget_facility_code(instance.code))
+
+
+def facility_child_changed(sender, instance, **kwargs):
+    # instance.facility 접근 시 쿼리가 발생하므로 facility_id 만 사용
+    invalidate_facilities(instance.facility_id)
+
+
+for _model in FACILITY_CHILD_MODELS:
+    post_save.connect(facility_child_changed, sender=_model, dispatch_uid=f'core_{_model.__name__}_saved')
+    post_delete.connect(facility_child_changed, sender=_model, dispatch_uid=f'core_{_model.__name__}_deleted')
+
+
+@receiver(post_save, sender=models.Hospital)
+def hospital_saved(sender, instance, **kwargs):
+    invalidate_hospitals(instance.pk)
+
+
+@receiver(post_delete, sender=models.Hospital)
+def hospital_deleted(sender, instance, **kwargs):
+    invalidate_hospitals(instance.pk)
+    transaction.on_commit(lambda: forget_hospital_code(instance.code))
+
+
+@receiver(post_save, sender=models.HospitalImage)
+@receiver(post_delete, sender=models.HospitalImage)
+def hospital_image_changed(sender, instance, **kwargs):
+    invalidate_hospitals(instance.hospital_id)
+
+
+@receiver(m2m_changed, sender=models.Tag.hospitals.through)
+def tag_hospitals_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_hospitals(instance.pk)
+        return
+    if action == 'pre_clear':
+        instance._cleared_hospital_pks = list(instance.hospitals.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        invalidate_hospitals(*getattr(instance, '_cleared_hospital_pks', []))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_hospitals(*(pk_set or []))
+
+
+@receiver(m2m_changed, sender=models.Tag.facilities.through)
+def tag_facilities_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # facility.tags.add(...) 형태 → instance 가 시설
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_facilities(instance.pk)
+        return
+    # tag.facilities.add(...) 형태 → pk_set 이 시설 pk
+    if action == 'pre_clear':
+        instance._cleared_facility_pks = list(instance.facilities.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        invalidate_facilities(*getattr(instance, '_cleared_facility_pks', []))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_facilities(*(pk_set or []))
+
+
+@receiver(post_save, sender=models.Tag)
+def tag_saved(sender, instance, created, **kwargs):
+    if not created:
+        # 태그명 변경 → 연결된 시설/병원 전체
+        invalidate_facilities(*instance.facilities.values_list('pk', flat=True))
+        invalidate_hospitals(*instance.hospitals.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=models.Tag)
+def tag_deleted(sender, instance, **kwargs):
+    invalidate_facilities(*instance.facilities.values_list('pk', flat=True))
+    invalidate_hospitals(*instance.hospitals.values_list('pk', flat=True))
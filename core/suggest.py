@@ -0,0 +1,183 @@
+"""검색창 자동완성 (메모리 prefix 색인)
+
+시설/요양병원 이름과 시도·시군구 이름을 정규화한 키로 정렬 배열을 만들어
+bisect 로 접두어 범위를 찾는다. 한글 초성(ㅎㅂ → 행복...) 검색용 키도 함께 둔다.
+항목은 미리 순위(지역 > 등급 > 이름) 순으로 정렬해 두므로 범위 안의 가장 작은 번호 k 개가 곧 상위 k 개이며,
+1~2 글자 접두어는 결과 범위가 넓으므로 상위 목록을 미리 계산해 둔다.
+
+색인은 프로세스마다 첫 요청 때 만들어지고, 전역 데이터 세대(core.caching)가 바뀌면 다시 만든다.
+크롤 중에는 배치마다 세대가 바뀌므로 세대 확인은 REFRESH_INTERVAL 초에 한 번만 하고,
+재생성은 백그라운드 스레드에서 해 요청은 그동안 이전 색인으로 바로 응답한다.
+"""
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from django.db import connections
+
+from .caching import get_data_generation
+from .filters import GRADE_ORDER
+from .models import Facility, Hospital
+from .regions import regions
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+PRECOMPUTED_PREFIX_LENGTH = 2
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 20
+REFRESH_INTERVAL = 30  # 데이터 세대 확인/색인 재생성 최소 간격(초)
+
+_KEY_RE = re.compile(r'[0-9a-z가-힣ㄱ-ㅎ]+')
+
+
+def normalize_key(text: str) -> str:
+    """소문자/NFKC 정규화 후 공백·기호 제거 (NFKC 는 호환 자모를 첫가끝 자모로 바꾸므로 초성은 그대로 둠)"""
+    text = ''.join(char if char in CHOSUNG else unicodedata.normalize('NFKC', char) for char in text or '')
+    return ''.join(_KEY_RE.findall(text.lower()))
+
+
+def chosung(text: str) -> str:
+    """완성형 한글을 초성으로 변환 (그 외 문자는 그대로)"""
+    result = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        result.append(CHOSUNG[code // 588] if 0 <= code < 11172 else char)
+    return ''.join(result)
+
+
+def is_chosung_query(key: str) -> bool:
+    return bool(key) and all(char in CHOSUNG for char in key)
+
+
+def _name_keys(name: str) -> set:
+    """이름 전체와 각 단어 시작 위치부터의 키 ('푸른 행복요양원' → 푸른행복요양원, 행복요양원)"""
+    words = (name or '').split()
+    return {normalize_key(''.join(words[i:])) for i in range(len(words))} - {''}
+
+
+def _grade_rank(grade: str) -> int:
+    return GRADE_ORDER.index(grade) if grade in GRADE_ORDER else len(GRADE_ORDER)
+
+
+class SuggestIndex:
+    def __init__(self, entries, generation=None):
+        self.generation = generation
+        self.checked_at = time.monotonic()  # 마지막으로 세대를 확인한 시각
+        # 순위 순으로 정렬 → 항목 번호가 작을수록 상위
+        entries = sorted(entries, key=lambda pair: pair[0]['_rank'])
+        self.entries = [{k: v for k, v in entry.items() if k != '_rank'} for entry, _ in entries]
+        self.keys, self.ids, self.top = self._build([keys for _, keys in entries], chosung_keys=False)
+        self.chosung_keys, self.chosung_ids, self.chosung_top = self._build([keys for _, keys in entries], chosung_keys=True)
+
+    @staticmethod
+    def _build(entry_keys, chosung_keys):
+        pairs = sorted(
+            (chosung(key) if chosung_keys else key, idx)
+            for idx, keys in enumerate(entry_keys)
+            for key in keys
+        )
+        top = {}
+        for key, idx in pairs:
+            for length in range(1, min(PRECOMPUTED_PREFIX_LENGTH, len(key)) + 1):
+                top.setdefault(key[:length], set()).add(idx)
+        top = {prefix: heapq.nsmallest(SUGGEST_MAX_LIMIT, ids) for prefix, ids in top.items()}
+        return [key for key, _ in pairs], [idx for _, idx in pairs], top
+
+    def lookup(self, query: str, limit: int = SUGGEST_DEFAULT_LIMIT, types=None) -> list:
+        """접두어가 일치하는 상위 limit 개. types 를 주면 해당 종류(region/facility/hospital)만"""
+        key = normalize_key(query)
+        if not key:
+            return []
+        if is_chosung_query(key):
+            keys, ids, top = self.chosung_keys, self.chosung_ids, self.chosung_top
+        else:
+            keys, ids, top = self.keys, self.ids, self.top
+        if types is None and len(key) <= PRECOMPUTED_PREFIX_LENGTH:
+            found = top.get(key, [])[:limit]
+        else:
+            lo = bisect_left(keys, key)
+            hi = bisect_left(keys, key + '\uffff', lo)
+            candidates = set(ids[lo:hi])
+            if types is not None:
+                candidates = {idx for idx in candidates if self.entries[idx]['type'] in types}
+            found = heapq.nsmallest(limit, candidates)
+        return [self.entries[idx] for idx in found]
+
+
+def build_entries() -> list:
+    """색인 항목 목록 [(응답 dict + 정렬용 _rank, 키 집합)]"""
+    entries = []
+    for sido, sigungu_list in regions.items():
+        if sido == '전체':
+            continue
+        entries.append(({'type': 'region', 'label': sido, 'sido': sido, 'sigungu': '', '_rank': (0, 0, sido)}, _name_keys(sido)))
+        for sigungu in sigungu_list:
+            label = f'{sido} {sigungu}'
+            entries.append((
+                {'type': 'region', 'label': label, 'sido': sido, 'sigungu': sigungu, '_rank': (0, 1, label)},
+                _name_keys(sigungu),
+            ))
+
+    for kind, model in (('facility', Facility), ('hospital', Hospital)):
+        rows = model.objects.order_by().values_list('pk', 'code', 'name', 'grade', 'sido', 'sigungu')
+        for pk, code, name, grade, sido, sigungu in rows:
+            entries.append((
+                {'type': kind, 'label': name, 'id': pk, 'code': code, 'grade': grade, 'sido': sido, 'sigungu': sigungu,
+                 '_rank': (1, _grade_rank(grade), name)},
+                _name_keys(name),
+            ))
+    return [(entry, keys) for entry, keys in entries if keys]
+
+
+_index = None
+_index_lock = threading.Lock()
+_rebuilding = False
+
+
+def get_index() -> SuggestIndex:
+    """현재 색인. 세대가 바뀌었으면 백그라운드 재생성을 시작하고 그동안은 이전 색인을 그대로 사용"""
+    global _index, _rebuilding
+    current = _index
+    if current is None:
+        # 처음 한 번은 만들어질 때까지 기다림
+        with _index_lock:
+            if _index is None:
+                _index = SuggestIndex(build_entries(), get_data_generation())
+            return _index
+    now = time.monotonic()
+    if now - current.checked_at < REFRESH_INTERVAL:
+        return current
+    current.checked_at = now
+    generation = get_data_generation()
+    if current.generation == generation:
+        return current
+    with _index_lock:
+        if _rebuilding:
+            return current
+        _rebuilding = True
+    _start_rebuild(generation)
+    return current
+
+
+def _rebuild(generation):
+    global _index, _rebuilding
+    try:
+        _index = SuggestIndex(build_entries(), generation)
+    finally:
+        _rebuilding = False
+
+
+def _start_rebuild(generation):
+    """요청 스레드를 막지 않도록 다른 스레드에서 색인 재생성"""
+    def run():
+        try:
+            _rebuild(generation)
+        finally:
+            connections.close_all()
+    threading.Thread(target=run, name='suggest-index', daemon=True).start()
+
+
+def suggest(query: str, limit: int = SUGGEST_DEFAULT_LIMIT, types=None) -> list:
+    return get_index().lookup(query, min(limit, SUGGEST_MAX_LIMIT), types=types)
@@ -1,3 +1,919 @@
-from django.test import TestCase
+import asyncio
+import os
+import secrets
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
 
-# Create your tests here.
+import httpx
+import zstandard
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import bitmap_index
+from .caching import bump_data_generation, get_facility_detail, list_fragment_key
+from .geo import encode, map_features, nearest, nearest_naive
+from .loaders import prefetch_sections
+from .models import (
+    CrawlRecord, CrawlURL, Facility, FacilityBasic, FacilityHomepage, FacilityImage, FacilityLocation, FacilityNonCovered,
+    FacilityProgram, FacilitySearchToken, FacilityStaff, Hospital, HospitalImage, Tag,
+)
+from .compare import get_comparison
+from .crawl_frontier import MIN_INTERVAL_HOURS, CrawlFrontier, latest_run_id, section_fingerprints
+from .crawl_capture import SnapshotCapture
+from .crawl_engine import CrawlCommand, ImmediateWriter
+from .crawl_utils import PagePool, RateLimiter, shard_regions
+from .crawl_writer import FacilityBatchWriter, sync_section, write_facilities
+from .fetchers import HttpFetcher, has_marker
+from .hospital_attributes import sync_hospital_attributes
+from .image_pipeline import ImagePipeline
+from .parsing import monthly_amount, parse_amount, parse_count
+from .search import FIELD_WEIGHTS, search_facilities
+from . import suggest as suggest_module
+from .suggest import suggest
+from .facets import bitmap_facets, compute_facets, get_facets
+from .filters import filter_facilities, get_facility_filters, order_facilities
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+_locmem_caches = override_settings(CACHES=LOCMEM_CACHES)
+
+
+def setUpModule():
+    # 모든 테스트가 작업 디렉터리의 파일 캐시(django_cache/) 대신 메모리 캐시를 사용
+    _locmem_caches.enable()
+
+
+def tearDownModule():
+    _locmem_caches.disable()
+
+
+class FacilityDetailCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.facility = Facility.objects.create(code='1001', name='테스트요양원')
+        FacilityProgram.objects.create(facility=self.facility, title='프로그램운영', content='인지프로그램, 여가프로그램\n노래교실')
+
+    def test_detail_is_cached(self):
+        detail = get_facility_detail('1001')
+        self.assertEqual(detail['program_items_tokens'][0]['tokens'], ['인지프로그램', '여가프로그램', '노래교실'])
+        self.assertEqual(detail['program_badges'], ['인지프로그램', '여가프로그램'])
+        with self.assertNumQueries(0):
+            get_facility_detail('1001')
+
+    def test_child_change_invalidates(self):
+        get_facility_detail('1001')
+        with self.captureOnCommitCallbacks(execute=True):
+            FacilityProgram.objects.create(facility=self.facility, title='특화', content='특화프로그램')
+        detail = get_facility_detail('1001')
+        self.assertIn('특화프로그램', detail['program_badges'])
+
+    def test_missing_facility(self):
+        self.assertIsNone(get_facility_detail('없는코드'))
+
+
+class PrefetchSectionsTest(TestCase):
+    def setUp(self):
+        self.facilities = [Facility.objects.create(code=f'20{i}', name=f'시설{i}') for i in range(3)]
+        for facility in self.facilities:
+            FacilityBasic.objects.create(facility=facility, title='주소', content=f'{facility.name} 주소')
+            FacilityStaff.objects.create(facility=facility, title='요양보호사', content='10명')
+            FacilityStaff.objects.create(facility=facility, title='간호사', content='2명')
+
+    def test_single_query_for_all_sections(self):
+        facilities = list(Facility.objects.filter(pk__in=[f.pk for f in self.facilities]))
+        with self.assertNumQueries(1):
+            prefetch_sections(facilities)
+            for facility in facilities:
+                self.assertEqual([s.title for s in facility.staff_items.all()], ['요양보호사', '간호사'])
+                self.assertEqual(facility.basic_items.all()[0].content, f'{facility.name} 주소')
+                self.assertEqual(list(facility.program_items.all()), [])
+                self.assertEqual(facility.staff_items.all()[0].facility, facility)
+
+    def test_detail_api_query_count(self):
+        code = self.facilities[0].code
+        pk = self.facilities[0].pk
+        # 조건부 요청 검증값 1 + 시설 1 + 섹션 UNION 1
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/facilities/{pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['staff_items']), 2)
+        self.assertEqual(response.json()['code'], code)
+
+    def test_batch_endpoint(self):
+        codes = ','.join(f.code for f in reversed(self.facilities)) + ',없음'
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/facilities/batch/?codes={codes}')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(list(body['results']), [f.code for f in reversed(self.facilities)])
+        self.assertEqual(body['missing'], ['없음'])
+
+        etag = response['ETag']
+        response = self.client.get(f'/api/facilities/batch/?codes={codes}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        FacilityStaff.objects.create(facility=self.facilities[0], title='사회복지사', content='1명')
+        response = self.client.get(f'/api/facilities/batch/?codes={codes}', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class ConditionalRequestTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.facility = Facility.objects.create(code='3001', name='조건부요양원', sido='서울특별시')
+
+    def test_api_detail_not_modified(self):
+        url = f'/api/facilities/{self.facility.pk}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age=300', response['Cache-Control'])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_changes_with_data(self):
+        url = '/api/facilities/?grade='
+        etag = self.client.get(url)['ETag']
+        Facility.objects.create(code='3002', name='신규요양원')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_public_html_same_for_every_user(self):
+        # 공개 페이지는 세션을 읽지 않으므로 Vary: Cookie 가 없고 로그인 사용자와 ETag/본문이 같음
+        from django.contrib.auth import get_user_model
+        url = f'/facility/{self.facility.code}/'
+        anonymous = self.client.get(url)
+        self.client.force_login(get_user_model().objects.create_user('visitor', password='pw'))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+        self.assertNotIn('visitor', response.content.decode())
+        self.assertEqual(response['ETag'], anonymous['ETag'])
+
+
+class ListFragmentCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Facility.objects.create(code='4001', name='목록요양원', sido='부산광역시')
+
+    def test_ajax_fragment_cached_until_data_changes(self):
+        url = '/facilities/?sido=부산광역시&ajax=1'
+        response = self.client.get(url)
+        self.assertContains(response, '목록요양원')
+        # 두 번째 요청은 조건부 검증값 쿼리만 실행되고 렌더링은 캐시에서
+        with self.assertNumQueries(1):
+            self.assertContains(self.client.get(url), '목록요양원')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Facility.objects.create(code='4002', name='신규목록요양원', sido='부산광역시')
+        self.assertContains(self.client.get(url), '신규목록요양원')
+
+    def test_search_not_cached(self):
+        self.assertIsNone(list_fragment_key(QueryDict('search=목록&ajax=1')))
+
+
+class NearbySearchTest(TestCase):
+    def setUp(self):
+        # 서울시청 기준 거리순: 근접 < 중간 < 원거리(부산)
+        self.near = Facility.objects.create(code='5001', name='근접요양원', latitude=Decimal('37.566000'), longitude=Decimal('126.978000'))
+        self.mid = Facility.objects.create(code='5002', name='중간요양원', latitude=Decimal('37.600000'), longitude=Decimal('127.050000'))
+        self.far = Facility.objects.create(code='5003', name='원거리요양원', latitude=Decimal('35.179000'), longitude=Decimal('129.075000'))
+        Facility.objects.create(code='5004', name='좌표없음요양원')
+
+    def test_geohash_set_on_save(self):
+        self.assertEqual(self.near.geohash, encode(37.566, 126.978))
+        self.near.latitude = Decimal('37.500000')
+        self.near.save(update_fields=['latitude'])
+        self.near.refresh_from_db()
+        self.assertEqual(self.near.geohash, encode(37.5, 126.978))
+
+    def test_nearest_matches_naive_scan(self):
+        queryset = Facility.objects.all()
+        for k in (1, 2, 3):
+            self.assertEqual(nearest(queryset, 37.5665, 126.978, k=k), nearest_naive(queryset, 37.5665, 126.978, k=k))
+        self.assertEqual([pk for pk, _ in nearest(queryset, 37.5665, 126.978, k=5, max_km=20)], [self.near.pk, self.mid.pk])
+
+    def test_nearby_api(self):
+        response = self.client.get('/api/facilities/nearby/?lat=37.5665&lng=126.978&k=2')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([r['code'] for r in results], ['5001', '5002'])
+        self.assertLess(results[0]['distance_km'], 1)
+        self.assertEqual(self.client.get('/api/facilities/nearby/?lat=abc').status_code, 400)
+
+    def test_list_view_distance_sort(self):
+        response = self.client.get('/facilities/?sort=distance&lat=37.5665&lng=126.978&ajax=1')
+        names = [f.name for f in response.context['facilities']]
+        self.assertEqual(names, ['근접요양원', '중간요양원', '원거리요양원'])
+        self.assertContains(response, 'km')
+
+
+class FacilityMapTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(6):
+            Facility.objects.create(code=f'60{i}', name=f'지도요양원{i}', grade='A등급',
+                                    latitude=Decimal('37.50') + Decimal(i) / 100, longitude=Decimal('127.00'))
+        Facility.objects.create(code='699', name='부산요양원', latitude=Decimal('35.18'), longitude=Decimal('129.07'))
+
+    def test_points_within_bbox(self):
+        response = self.client.get('/api/facilities/map/?bbox=37.4,126.9,37.6,127.1')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['mode'], 'points')
+        self.assertEqual(body['total'], 6)
+        response = self.client.get('/api/facilities/map/?bbox=37.4,126.9,37.6,127.1', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_clusters_when_over_limit(self):
+        body = map_features(Facility.objects.all(), (33, 124, 39, 132), max_points=3, max_clusters=4)
+        self.assertEqual(body['mode'], 'clusters')
+        self.assertLessEqual(len(body['clusters']), 4)
+        self.assertEqual(sum(c['count'] for c in body['clusters']), 7)
+
+    def test_invalid_bbox(self):
+        self.assertEqual(self.client.get('/api/facilities/map/?bbox=1,2,3').status_code, 400)
+
+
+class FacilitySearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        suggest_module._index = None
+        with self.captureOnCommitCallbacks(execute=True):
+            self.named = Facility.objects.create(code='7001', name='행복한노인요양원', location='서울특별시 강남구 테헤란로 1')
+            self.program = Facility.objects.create(code='7002', name='푸른요양원', location='부산광역시 해운대구')
+            FacilityProgram.objects.create(facility=self.program, title='프로그램운영', content='행복 노래교실')
+            tag = Tag.objects.create(name='치매전담')
+            tag.facilities.add(self.program)
+
+    def test_ranked_search(self):
+        results = list(search_facilities(Facility.objects.all(), '행복'))
+        self.assertEqual(results, [self.named, self.program])
+        self.assertEqual(list(search_facilities(Facility.objects.all(), '해운대')), [self.program])
+        self.assertEqual(list(search_facilities(Facility.objects.all(), '치매')), [self.program])
+        self.assertEqual(list(search_facilities(Facility.objects.all(), '없는검색어')), [])
+
+    def test_index_updates_on_save(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.named.name = '새이름요양원'
+            self.named.save()
+        self.assertEqual(list(search_facilities(Facility.objects.all(), '새이름')), [self.named])
+
+    def test_list_view_and_autocomplete(self):
+        response = self.client.get('/facilities/?search=강남&ajax=1')
+        self.assertEqual([f.code for f in response.context['facilities']], ['7001'])
+        body = self.client.get('/api/facilities/autocomplete/?q=푸').json()
+        self.assertEqual([r['code'] for r in body['results']], ['7002'])
+        body = self.client.get('/api/facilities/autocomplete/?q=행복').json()
+        self.assertEqual(body['results'][0]['code'], '7001')
+
+    def test_filtered_matches_beyond_global_top(self):
+        # 서울에 점수 높은 일치 시설이 많아도 부산 필터 결과에서 빠지지 않아야 함
+        seoul = Facility.objects.bulk_create(
+            Facility(code=f'S{i:04d}', name=f'행복{i}요양원', sido='서울특별시') for i in range(600)
+        )
+        FacilitySearchToken.objects.bulk_create(
+            FacilitySearchToken(facility=facility, token='행복', weight=FIELD_WEIGHTS['name']) for facility in seoul
+        )
+        self.program.sido = '부산광역시'
+        self.program.save()
+        results = filter_facilities(Facility.objects.all(), {'sido': '부산광역시', 'search': '행복'})
+        self.assertEqual(list(results), [self.program])
+        ranked = search_facilities(Facility.objects.filter(sido='부산광역시'), '행복')
+        self.assertEqual(list(ranked), [self.program])
+        self.assertEqual(search_facilities(Facility.objects.all(), '행복').count(), 602)
+
+    def test_admin_search_keeps_list_filter(self):
+        from django.contrib.auth import get_user_model
+        admin = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(admin)
+        Facility.objects.filter(pk=self.program.pk).update(grade='A등급')
+        response = self.client.get('/admin/core/facility/', {'q': '행복', 'grade': 'A등급'})
+        self.assertEqual([f.code for f in response.context['cl'].result_list], ['7002'])
+
+
+class SuggestTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Facility.objects.create(code='8001', name='행복요양원', grade='C등급')
+        Facility.objects.create(code='8002', name='행복마을요양원', grade='A등급')
+        Hospital.objects.create(code='H8001', name='행복요양병원')
+        suggest_module._index = None
+
+    def test_prefix_ranked_by_grade(self):
+        labels = [r['label'] for r in suggest('행복')]
+        self.assertEqual(labels, ['행복마을요양원', '행복요양원', '행복요양병원'])
+        self.assertEqual([r['label'] for r in suggest('행복요양')], ['행복요양원', '행복요양병원'])
+
+    def test_chosung_and_regions(self):
+        self.assertEqual(suggest('ㅎㅂㅁ')[0]['code'], '8002')
+        region = suggest('해운대')[0]
+        self.assertEqual((region['type'], region['sido'], region['sigungu']), ('region', '부산광역시', '해운대구'))
+
+    def test_refreshed_on_data_change(self):
+        suggest('행복')
+        with self.captureOnCommitCallbacks(execute=True):
+            Facility.objects.create(code='8003', name='행복나라요양원', grade='B등급')
+        # 확인 간격 안에서는 세대를 보지 않고, 지나면 재생성(여기서는 바로 실행)을 시작하되 이번 응답은 이전 색인으로
+        with patch('core.suggest._start_rebuild', side_effect=suggest_module._rebuild) as rebuild:
+            self.assertEqual(len(suggest('행복')), 3)
+            rebuild.assert_not_called()
+            with patch('core.suggest.REFRESH_INTERVAL', 0):
+                self.assertEqual(len(suggest('행복')), 3)
+                rebuild.assert_called_once()
+        response = self.client.get('/api/suggest/?q=행복&limit=2')
+        self.assertEqual([r['label'] for r in response.json()['results']], ['행복마을요양원', '행복나라요양원'])
+        body = self.client.get('/api/facilities/autocomplete/?q=행복').json()
+        self.assertEqual([r['code'] for r in body['results']], ['8002', '8003', '8001'])
+
+
+class FacetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        large = Tag.objects.create(name='대형')
+        small = Tag.objects.create(name='소형')
+        rows = [
+            ('9001', '서울특별시', '강남구', 'A등급', large),
+            ('9002', '서울특별시', '강남구', 'B등급', small),
+            ('9003', '서울특별시', '송파구', 'A등급', large),
+            ('9004', '부산광역시', '해운대구', 'A등급', small),
+        ]
+        for code, sido, sigungu, grade, tag in rows:
+            Facility.objects.create(code=code, name=f'패싯{code}', sido=sido, sigungu=sigungu, grade=grade).tags.add(tag)
+
+    def test_disjunctive_counts(self):
+        facets = get_facets(get_facility_filters(QueryDict('sido=서울특별시&grade=A등급')))
+        # 등급 개수는 등급 필터를 제외하고(서울 전체), 시도 개수는 시도 필터를 제외하고 계산
+        self.assertEqual(facets['grade'], {'A등급': 2, 'B등급': 1})
+        self.assertEqual(facets['sido'], {'서울특별시': 2, '부산광역시': 1})
+        self.assertEqual(facets['sigungu'], {'강남구': 1, '송파구': 1})
+        self.assertEqual(facets['size'], {'대형': 2, '중형': 0, '소형': 0})
+
+    def test_endpoint_is_cached(self):
+        url = '/api/facilities/facets/?sido=서울특별시'
+        self.assertEqual(self.client.get(url).json()['size'], {'대형': 2, '중형': 0, '소형': 1})
+        with self.assertNumQueries(0):
+            self.client.get(url.replace('서울특별시', '서울특별시&sort=name'))
+
+
+@override_settings(FACILITY_BITMAP_INDEX=True)
+class BitmapIndexTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        large = Tag.objects.create(name='대형')
+        rows = [
+            ('9101', '가요양원', '서울특별시', '강남구', 'B등급', True),
+            ('9102', '나요양원', '서울특별시', '강남구', 'A등급', False),
+            ('9103', '다요양원', '서울특별시', '송파구', '', True),
+            ('9104', '라요양원', '부산광역시', '해운대구', 'A등급', False),
+        ]
+        for code, name, sido, sigungu, grade, tagged in rows:
+            facility = Facility.objects.create(code=code, name=name, sido=sido, sigungu=sigungu, grade=grade)
+            if tagged:
+                facility.tags.add(large)
+        bump_data_generation()
+        bitmap_index._index = None
+
+    def test_matches_database_results(self):
+        for query in ('', 'sido=서울특별시', 'sido=서울특별시&sigungu=강남구', 'size=대형', 'grade=A등급&sort=name', 'sort=name'):
+            filters = get_facility_filters(QueryDict(query))
+            expected = list(order_facilities(filter_facilities(Facility.objects.all(), filters), filters['sort']).distinct())
+            result = bitmap_index.bitmap_queryset(filters, Facility.objects.all())
+            self.assertEqual(len(result), len(expected), query)
+            self.assertEqual(result[0:10], expected, query)
+            self.assertEqual(result[1:2], expected[1:2], query)
+            self.assertEqual(bitmap_facets(bitmap_index.get_index(), filters), compute_facets(filters), query)
+
+    def test_list_view_uses_index(self):
+        response = self.client.get('/facilities/?sido=서울특별시&ajax=1')
+        self.assertEqual([f.code for f in response.context['facilities']], ['9102', '9101', '9103'])
+        self.assertEqual(response.context['total_count'], 3)
+        self.assertIsNone(bitmap_index.bitmap_queryset(get_facility_filters(QueryDict('search=가')), Facility.objects.all()))
+
+    def test_rebuilt_in_background_on_data_change(self):
+        url = '/facilities/?sido=서울특별시&ajax=1'
+        first = self.client.get(url)
+        Facility.objects.create(code='9105', name='마요양원', sido='서울특별시', sigungu='강남구', grade='A등급')
+        bump_data_generation()
+        # 확인 간격 안에서는 이전 색인, 지나면 재생성을 시작하되 끝날 때까지는 이전 색인으로 응답
+        with patch('core.bitmap_index._start_rebuild') as rebuild:
+            self.assertEqual(self.client.get(url).context['total_count'], 3)
+            rebuild.assert_not_called()
+            with patch('core.bitmap_index.REFRESH_INTERVAL', 0):
+                stale = self.client.get(url)
+                rebuild.assert_called_once()
+        # 이전 색인으로 만든 응답은 새 세대로 캐시/검증되지 않음
+        self.assertEqual(stale.context['total_count'], 3)
+        self.assertEqual(stale['ETag'], first['ETag'])
+        bitmap_index._rebuild(*rebuild.call_args.args)
+        response = self.client.get(url)
+        self.assertEqual(response.context['total_count'], 4)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+
+class ParsingTest(TestCase):
+    def test_amounts_and_counts(self):
+        self.assertEqual(parse_count('12명'), 12)
+        self.assertEqual(parse_amount('식사재료비 4,500원'), 4500)
+        self.assertEqual(monthly_amount('식사재료비(1일)', '4,500원'), 135000)
+        self.assertEqual(monthly_amount('상급침실이용료', '1인실 월 300,000원'), 300000)
+        self.assertIsNone(monthly_amount('이미용비', '실비'))
+
+
+class FacilityCompareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.a = Facility.objects.create(code='9201', name='비교A', grade='A등급', capacity=50, occupancy=40,
+                                         latitude=Decimal('37.5665'), longitude=Decimal('126.978'))
+        self.b = Facility.objects.create(code='9202', name='비교B', grade='B등급', capacity=30, occupancy=30,
+                                         staff_info={'요양보호사': '10명'})
+        FacilityStaff.objects.create(facility=self.a, title='요양보호사', content='20명')
+        FacilityNonCovered.objects.create(facility=self.a, title='식사재료비(1일)', content='5,000원')
+
+    def test_matrix_in_request_order(self):
+        response = self.client.get('/api/facilities/compare/?codes=9202,9201,없음&lat=37.5665&lng=126.978')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([f['code'] for f in body['facilities']], ['9202', '9201'])
+        self.assertEqual(body['missing'], ['없음'])
+        rows = {row['key']: row['values'] for row in body['rows']}
+        self.assertEqual(rows['grade'], ['B등급', 'A등급'])
+        self.assertEqual(rows['occupancy_rate'], [100.0, 80.0])
+        self.assertEqual(rows['staff:요양보호사'], [10, 20])
+        self.assertEqual(rows['noncovered_monthly_total'], [None, 150000])
+        self.assertEqual(rows['distance'], [None, 0.0])
+
+    def test_cached_by_sorted_codes(self):
+        get_comparison(['9201', '9202'])
+        with self.assertNumQueries(0):
+            get_comparison(['9202', '9201'])
+        self.assertEqual(self.client.get('/api/facilities/compare/?codes=9201').status_code, 400)
+        self.assertContains(self.client.get('/facilities/compare/?codes=9201,9202'), '비교B')
+
+
+class FacilityCostTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cheap = Facility.objects.create(code='9301', name='비용A')
+            FacilityNonCovered.objects.create(facility=self.cheap, title='식사재료비(1일)', content='4,000원')
+            FacilityNonCovered.objects.create(facility=self.cheap, title='이미용비', content='10,000원')
+            self.costly = Facility.objects.create(code='9302', name='비용B', noncovered_info={'상급침실이용료': '월 300,000원'})
+            self.unknown = Facility.objects.create(code='9303', name='비용C')
+
+    def test_costs_synced_after_commit(self):
+        self.cheap.refresh_from_db()
+        self.assertEqual(self.cheap.noncovered_monthly_total, 130000)
+        self.assertEqual(
+            sorted(self.cheap.costs.values_list('category', 'monthly_amount')),
+            [('beauty', 10000), ('meal', 120000)],
+        )
+        self.assertEqual(self.costly.costs.get().category, 'room')
+
+    def test_max_cost_filter_and_cost_sort(self):
+        filters = get_facility_filters(QueryDict('max_cost=200,000&sort=cost'))
+        self.assertEqual(list(filter_facilities(Facility.objects.all(), filters)), [self.cheap])
+        ordered = order_facilities(Facility.objects.filter(code__startswith='93'), 'cost')
+        self.assertEqual([f.code for f in ordered], ['9301', '9302', '9303'])
+        response = self.client.get('/api/facilities/?max_cost=200000')
+        self.assertEqual([f['code'] for f in response.json()['results']], ['9301'])
+
+
+class HospitalAttributeTest(TestCase):
+    def setUp(self):
+        self.rehab = Hospital.objects.create(
+            code='H901', name='재활요양병원', sido='경기도', sigungu='수원시',
+            bed_count={'일반입원실': '상급 : 21 명', '중환자실': '4 병상'},
+            doctor_count={'의과': '6 명', '한의과': '1 명'},
+            specialist_by_department={'재활의학과': '2 명', '내과': '0 명'},
+        )
+        self.small = Hospital.objects.create(
+            code='H902', name='작은요양병원', sido='경기도',
+            doctor_count={'의과': '3 명'}, specialist_by_department={'재활의학과': '1 명'},
+        )
+        sync_hospital_attributes([self.rehab.pk, self.small.pk])
+
+    def test_parsed_rows_and_totals(self):
+        self.rehab.refresh_from_db()
+        self.assertEqual((self.rehab.doctor_total, self.rehab.bed_total), (7, 25))
+        self.assertEqual(self.rehab.attributes.get(kind='specialist', name='재활의학과').count, 2)
+
+    def test_filtered_list_api(self):
+        response = self.client.get('/api/hospitals/?sido=경기도&min_doctors=5&specialist=재활의학과')
+        self.assertEqual([h['code'] for h in response.json()['results']], ['H901'])
+        response = self.client.get('/api/hospitals/?specialist=내과')
+        self.assertEqual(response.json()['results'], [])
+        detail = self.client.get(f'/api/hospitals/{self.rehab.pk}/').json()
+        self.assertEqual(detail['bed_total'], 25)
+        self.assertEqual(len(detail['attributes']), 6)
+
+
+class HospitalPageTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hospital = Hospital.objects.create(code='H801', name='목록요양병원', sido='서울특별시', grade='1등급',
+                                                    doctor_count={'의과': '4 명'})
+            for idx in range(3):
+                HospitalImage.objects.create(hospital=self.hospital, image=f'hospital_images/{idx}.jpg',
+                                             original_url=f'https://example.com/{idx}.jpg')
+        sync_hospital_attributes([self.hospital.pk])
+
+    def test_list_prefetches_first_image_only(self):
+        Hospital.objects.create(code='H802', name='다른요양병원', sido='부산광역시')
+        response = self.client.get('/hospitals/?sido=서울특별시&ajax=1')
+        self.assertContains(response, '목록요양병원')
+        self.assertNotContains(response, '다른요양병원')
+        self.assertContains(response, 'hospital_images/0.jpg')
+        self.assertNotContains(response, 'hospital_images/1.jpg')
+        # 결과 조각은 데이터 세대가 같으면 캐시에서 (검증값 계산도 DB 조회 없음)
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get('/hospitals/?sido=서울특별시&ajax=1'), '목록요양병원')
+        self.assertContains(self.client.get('/hospitals/?min_doctors=3'), '목록요양병원')
+
+    def test_detail_cached_until_hospital_changes(self):
+        url = f'/hospital/{self.hospital.code}/'
+        self.assertContains(self.client.get(url), '의사 수')
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get(url), '목록요양병원')
+        with self.captureOnCommitCallbacks(execute=True):
+            Hospital.objects.filter(pk=self.hospital.pk).update(name='변경요양병원')
+            self.hospital.refresh_from_db()
+            self.hospital.save()
+        self.assertContains(self.client.get(url), '변경요양병원')
+        self.assertEqual(self.client.get('/hospital/없음/').status_code, 404)
+
+
+class CrawlUtilsTest(TestCase):
+    def test_page_pool_processes_all_items_within_rate(self):
+        class FakePage:
+            def __init__(self):
+                self.closed = False
+
+            def is_closed(self):
+                return self.closed
+
+            async def close(self):
+                self.closed = True
+
+        class FakeContext:
+            def __init__(self):
+                self.pages = []
+
+            async def new_page(self):
+                self.pages.append(FakePage())
+                return self.pages[-1]
+
+        async def run():
+            context = FakeContext()
+            limiter = RateLimiter(rate=200, jitter=0)
+            seen, errors = [], []
+
+            async def handler(page, item):
+                await limiter.wait()
+                if item == 3:
+                    raise ValueError('실패')
+                seen.append((item, page))
+
+            pool = PagePool(context, handler, concurrency=3, on_error=lambda item, e: errors.append(item))
+            pool.start()
+            started = time.monotonic()
+            for item in range(10):
+                await pool.put(item)
+            await pool.join()
+            elapsed = time.monotonic() - started
+            await pool.close()
+            return context, seen, errors, elapsed
+
+        context, seen, errors, elapsed = asyncio.run(run())
+        self.assertEqual(sorted(item for item, _ in seen), [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(errors, [3])
+        # 페이지는 작업자 수만큼만 열고 재사용
+        self.assertEqual(len(context.pages), 3)
+        self.assertTrue(all(page.closed for page in context.pages))
+        # 10 회 요청 = 9 간격 * 5ms 이상
+        self.assertGreaterEqual(elapsed, 0.045)
+
+
+class CrawlWriterTest(TestCase):
+    def test_batch_writer_upserts_and_replaces_sections(self):
+        facility = Facility.objects.create(code='W1', name='기존', capacity=30, occupancy=20)
+        FacilityBasic.objects.create(facility=facility, title='옛 정보', content='x')
+        FacilityStaff.objects.create(facility=facility, title='요양보호사', content='5명')
+        FacilityLocation.objects.create(facility=facility, title='교통', content='버스')
+        writer = FacilityBatchWriter(batch_size=3)
+        existing = {
+            'overview': {'code': 'W1', 'name': '새 이름', 'capacity': None, 'occupancy': 25},
+            'basic_items': [{'title': '설립일', 'content': '2010'}, {'title': '', 'content': '제목 없음'}],
+            'homepage_item': {'title': '홈페이지', 'content': 'https://example.com'},
+        }
+        new = {'overview': {'code': 'W2', 'name': '신규'}, 'non_covered_items': [{'title': '식대', 'content': '5,000원'}]}
+        with patch('core.crawl_writer.invalidate_facilities') as invalidate:
+            self.assertEqual(writer.add(existing, 'a'), [])
+            self.assertEqual(writer.add({'overview': {}}, 'b'), [])
+            results = dict(writer.add(new, 'c'))
+        self.assertEqual(len(writer), 0)
+        self.assertEqual((writer.batches, writer.written), (1, 2))
+        created = Facility.objects.get(code='W2')
+        self.assertEqual(results, {'a': facility.pk, 'b': None, 'c': created.pk})
+        self.assertEqual(sorted(invalidate.call_args.args), sorted([facility.pk, created.pk]))
+
+        facility.refresh_from_db()
+        self.assertEqual((facility.name, facility.capacity, facility.occupancy), ('새 이름', 30, 25))
+        self.assertEqual(list(facility.basic_items.values_list('title', 'content')), [('설립일', '2010')])
+        self.assertEqual(facility.staff_items.count(), 1)  # 항목이 없던 섹션은 유지
+        self.assertFalse(facility.location_items.exists())  # 위치/비급여는 항상 교체
+        self.assertEqual(FacilityHomepage.objects.get(facility=facility).content, 'https://example.com')
+        self.assertEqual(list(created.noncovered_items.values_list('title', flat=True)), ['식대'])
+        self.assertEqual(writer.flush(), [])
+
+    def test_section_sync_applies_only_differences(self):
+        facility = Facility.objects.create(code='S1', name='시설')
+        kept = FacilityBasic.objects.create(facility=facility, title='설립일', content='2010')
+        edited = FacilityBasic.objects.create(facility=facility, title='정원', content='30명')
+        FacilityBasic.objects.create(facility=facility, title='폐지', content='x')
+        incoming = [('설립일', '2010'), ('정원', '40명'), ('전화', '02-000-0000')]
+        self.assertEqual(sync_section(FacilityBasic, {facility.pk: incoming}), {facility.pk: (1, 1, 1)})
+        rows = {row.title: row for row in FacilityBasic.objects.filter(facility=facility)}
+        self.assertEqual(sorted(rows), ['설립일', '전화', '정원'])
+        self.assertEqual((rows['설립일'].pk, rows['설립일'].created_at), (kept.pk, kept.created_at))
+        self.assertEqual((rows['정원'].pk, rows['정원'].content), (edited.pk, '40명'))
+        self.assertEqual(sync_section(FacilityBasic, {facility.pk: incoming}), {})
+
+        # 같은 내용을 다시 저장하면 변경/무효화 없음, 섹션별 변경만 보고
+        data = {
+            'overview': {'code': 'S1', 'name': '시설'},
+            'basic_items': [{'title': title, 'content': content} for title, content in incoming],
+            'location_items': [{'title': '교통', 'content': '버스'}],
+        }
+        with patch('core.crawl_writer.invalidate_facilities') as invalidate:
+            pks, changes = write_facilities([data])
+        self.assertEqual(changes, {facility.pk: {'location_items': (1, 0, 0)}})
+        invalidate.assert_called_once_with(facility.pk)
+        with patch('core.crawl_writer.invalidate_facilities') as invalidate:
+            self.assertEqual(write_facilities([data]), ({'S1': facility.pk}, {}))
+        invalidate.assert_not_called()
+
+
+class ImagePipelineTest(TestCase):
+    def test_image_pipeline_skips_known_and_streams_new(self):
+        first = Facility.objects.create(code='I1', name='시설1')
+        second = Facility.objects.create(code='I2', name='시설2', has_images=True)
+        FacilityImage.objects.create(facility=first, image='facility_images/old.jpg', original_url='https://img.example.com/old.jpg')
+        active = peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if request.url.path == '/missing.jpg':
+                return httpx.Response(404)
+            return httpx.Response(200, content=b'jpeg:' + request.url.path.encode())
+
+        invalidate = Mock()
+
+        async def run():
+            pipeline = ImagePipeline(FacilityImage, 'facility', 'test-agent', concurrency=4, per_host=1, invalidate=invalidate)
+            await pipeline.client.aclose()
+            pipeline.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            await pipeline.prefetch()
+            known = await pipeline.add(first.pk, ['https://img.example.com/old.jpg', 'https://img.example.com/new.jpg'], 'I1')
+            await pipeline.add(second.pk, ['https://img.example.com/missing.jpg', 'https://img.example.com/b.png'], 'I2')
+            # 다른 실행이 저장을 마치기 전에 같은 URL 을 먼저 저장한 경우
+            await sync_to_async(FacilityImage.objects.create)(
+                facility=second, image='facility_images/other.png', original_url='https://img.example.com/b.png',
+            )
+            await pipeline.close()
+            return known, pipeline.stats
+
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            known, stats = async_to_sync(run)()
+            self.assertEqual(known, 1)
+            self.assertEqual((stats['known'], stats['saved'], stats['failed'], stats['duplicate']), (1, 1, 1, 1))
+            self.assertEqual(peak, 1)  # 같은 호스트는 per_host 개까지만 동시에
+            image = FacilityImage.objects.get(original_url='https://img.example.com/new.jpg')
+            self.assertEqual(image.facility_id, first.pk)
+            self.assertTrue(image.image.name.startswith('facility_images/'))
+            with image.image.open('rb') as fh:
+                self.assertEqual(fh.read(), b'jpeg:/new.jpg')
+            stored = [name for _, _, names in os.walk(media) for name in names]
+            self.assertEqual(stored, ['new.jpg'])  # 건너뛴 행의 파일은 지움
+        self.assertFalse(FacilityImage.objects.filter(original_url='https://img.example.com/missing.jpg').exists())
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertTrue(first.has_images and second.has_images)
+        # 새 이미지만 있던 시설은 저장 전에 has_images 를 바꾸지 않음 (False 로 깜빡이며 무효화되지 않음)
+        invalidated = [pk for call in invalidate.call_args_list for pk in call.args]
+        self.assertNotIn(second.pk, invalidated)
+        self.assertIn(first.pk, invalidated)
+
+
+class CrawlFrontierTest(TestCase):
+    def test_frontier_shared_and_resumable(self):
+        self.assertEqual(shard_regions(['a', 'b', 'c', 'd', 'e'], 2), [['a', 'c', 'e'], ['b', 'd']])
+        first, second = CrawlFrontier('facility', 'run1'), CrawlFrontier('facility', 'run1')
+        self.assertEqual(first.start_regions(0, ['서울시/전체', '부산시/전체']), {'서울시/전체': 1, '부산시/전체': 1})
+        # 같은 실행의 다른 샤드가 먼저 가져간 URL 은 건너뜀
+        self.assertTrue(first.claim_url('https://example.com/1', '서울시/전체'))
+        self.assertFalse(second.claim_url('https://example.com/1', '서울시/전체'))
+        self.assertTrue(first.claim_url('https://example.com/2', '서울시/전체'))
+        first.mark('https://example.com/1', CrawlURL.STATUS_FETCHED)
+        first.mark('https://example.com/1', CrawlURL.STATUS_SAVED)
+        first.set_best_score('A1', 500, 'https://example.com/1')
+        second.set_best_score('A1', 300)
+        self.assertEqual(second.best_score('A1'), 500)
+        first.update_progress('서울시/전체', page=3, saved=1)
+        first.update_progress('부산시/전체', page=1, done=True)
+
+        # 중단 후 재개: 끝난 지역은 건너뛰고, 중단된 페이지와 미완료 URL 부터
+        self.assertEqual(latest_run_id('facility'), 'run1')
+        resumed = CrawlFrontier('facility', latest_run_id('facility'))
+        self.assertEqual(resumed.start_regions(1, ['서울시/전체', '부산시/전체']), {'서울시/전체': 3})
+        self.assertEqual(resumed.pending_urls('서울시/전체'), ['https://example.com/2'])
+        self.assertEqual(resumed.best_score('A1'), 500)
+        url = CrawlURL.objects.get(url='https://example.com/1')
+        self.assertEqual((url.attempts, url.status), (1, CrawlURL.STATUS_SAVED))
+        self.assertIsNotNone(url.last_fetched)
+        self.assertEqual(
+            [(row['shard'], row['region'], row['page'], row['saved'], row['done']) for row in resumed.progress_rows()],
+            [(1, '서울시/전체', 3, 1, False)],
+        )
+
+        # 새 실행은 이전 실행의 URL/점수를 다시 가져감
+        fresh = CrawlFrontier('facility', 'run2')
+        self.assertTrue(fresh.claim_url('https://example.com/1', '서울시/전체'))
+        self.assertIsNone(fresh.best_score('A1'))
+        fresh.set_best_score('A1', 100)
+        self.assertEqual(fresh.best_score('A1'), 100)
+
+    def test_recrawl_schedule_follows_changes(self):
+        frontier = CrawlFrontier('facility', 'run1')
+        data = {
+            'overview': {'code': 'A1', 'name': '행복요양원', 'availability': '가능', 'waiting': 0, 'raw_text': '광고 1'},
+            'staff_items': [{'title': '요양보호사', 'content': '10명'}],
+        }
+        sections = section_fingerprints(data)
+        # 원문(raw_text)만 바뀐 것은 변경이 아님
+        self.assertEqual(section_fingerprints({**data, 'overview': {**data['overview'], 'raw_text': '광고 2'}}), sections)
+
+        self.assertIsNone(frontier.changed_sections('A1', sections))
+        frontier.record_check('A1', 'https://example.com/1', sections, None)
+        record = CrawlRecord.objects.get(code='A1')
+        self.assertEqual(record.interval_hours, MIN_INTERVAL_HOURS)
+
+        # 변경 없음 → 간격 두 배, 인력 섹션 변경 → 절반, 입소 가능 여부 변경 → 최소 간격
+        self.assertEqual(frontier.changed_sections('A1', sections), [])
+        frontier.record_check('A1', 'https://example.com/1', sections, [])
+        frontier.record_check('A1', 'https://example.com/1', sections, [])
+        self.assertEqual(CrawlRecord.objects.get(code='A1').interval_hours, MIN_INTERVAL_HOURS * 4)
+        staff_changed = section_fingerprints({**data, 'staff_items': [{'title': '요양보호사', 'content': '12명'}]})
+        self.assertEqual(frontier.changed_sections('A1', staff_changed), ['staff_items'])
+        frontier.record_check('A1', 'https://example.com/1', staff_changed, ['staff_items'])
+        self.assertEqual(CrawlRecord.objects.get(code='A1').interval_hours, MIN_INTERVAL_HOURS * 2)
+        status_changed = section_fingerprints({
+            'overview': {**data['overview'], 'availability': '불가능'},
+            'staff_items': [{'title': '요양보호사', 'content': '12명'}],
+        })
+        changed = frontier.changed_sections('A1', status_changed)
+        self.assertEqual(changed, ['status'])
+        frontier.record_check('A1', 'https://example.com/1', status_changed, changed)
+        record = CrawlRecord.objects.get(code='A1')
+        self.assertEqual((record.interval_hours, record.checks, record.changes), (MIN_INTERVAL_HOURS, 5, 2))
+        self.assertEqual(record.section_changes, {'staff_items': 1, 'status': 1})
+
+        # 재수집 대상: 시각이 지난 것만, 오래 밀린 것부터
+        frontier.record_check('B1', 'https://example.com/2', sections, None)
+        CrawlRecord.objects.filter(code='B1').update(next_due=timezone.now() - timedelta(days=2))
+        CrawlRecord.objects.filter(code='A1').update(next_due=timezone.now() - timedelta(hours=1))
+        frontier.record_check('C1', 'https://example.com/3', sections, None)
+        self.assertEqual(frontier.due_urls(10), ['https://example.com/2', 'https://example.com/1'])
+        self.assertEqual(frontier.due_urls(1), ['https://example.com/2'])
+
+
+class FetcherTest(TestCase):
+    def test_http_fetcher_marker_and_retry(self):
+        self.assertTrue(has_marker('<div class="row section-view-title mt-3">', 'section-view-title'))
+        self.assertFalse(has_marker('<div class="section-view-title-old">', 'section-view-title'))
+        self.assertFalse(has_marker(None, 'section-view-title'))
+
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if request.url.path == '/missing':
+                return httpx.Response(404)
+            if len(calls) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, text='<div class="section-view-title">ok</div>')
+
+        async def run():
+            fetcher = HttpFetcher('test-agent')
+            await fetcher.client.aclose()
+            fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch('core.fetchers.asyncio.sleep', new=AsyncMock()):
+                html = await fetcher.fetch('https://example.com/view')
+                missing = await fetcher.fetch('https://example.com/missing')
+            await fetcher.close()
+            return html, missing
+
+        html, missing = asyncio.run(run())
+        # 503 후 재시도로 성공, 404 는 재시도 없이 None
+        self.assertIn('ok', html)
+        self.assertIsNone(missing)
+        self.assertEqual(calls, ['/view', '/view', '/missing'])
+
+
+class SnapshotCaptureTest(TestCase):
+    def test_snapshot_capture_modes_and_retention(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp) / 'debug'
+            self.assertFalse(SnapshotCapture(directory, mode='off').wants(failed=True))
+            failures = SnapshotCapture(directory, mode='failures')
+            self.assertTrue(failures.wants(failed=True))
+            self.assertFalse(failures.wants())
+            self.assertFalse(SnapshotCapture(directory, mode='sample', sample_rate=0).wants())
+            self.assertTrue(SnapshotCapture(directory, mode='sample', sample_rate=1).wants())
+            self.assertFalse(directory.exists())  # 저장 전에는 디렉터리를 만들지 않음
+
+            capture = SnapshotCapture(directory, mode='all', max_bytes=4000)
+            html = '<html>' + secrets.token_hex(3000) + '</html>'  # 압축 후 약 3KB
+            path = capture.save('page1.html', html).result()
+            self.assertEqual(path.name, 'page1.html.zst')
+            self.assertLess(path.stat().st_size, len(html.encode()))
+            self.assertEqual(zstandard.ZstdDecompressor().decompress(path.read_bytes()).decode(), html)
+
+            capture.save('shot.png', b'x' * 100)
+            capture.save('page2.html', html)
+            capture.close()
+            # 최대 크기를 넘으면 오래된 파일부터 삭제
+            self.assertEqual(sorted(p.name for p in directory.iterdir()), ['page2.html.zst', 'shot.png'])
+
+
+class CrawlEngineTest(TestCase):
+    def test_engine_runs_plugin_parser_and_writer(self):
+        saved, after = [], []
+
+        class FakeHttp:
+            async def fetch(self, url):
+                count = url.rsplit('/', 1)[-1]
+                return f'<div class="section-view-title"><h3>{count}</h3></div>'
+
+        class Plugin(CrawlCommand):
+            crawler = 'facility'
+
+            def parse_detail(self, soup, url):
+                return {'overview': {'code': 'P1'}, 'items': int(soup.h3.get_text())}
+
+            def richness(self, data):
+                return data['items']
+
+            def make_writer(self, options):
+                return ImmediateWriter(lambda data: saved.append(data['items']) or len(saved))
+
+            async def after_save(self, pk, code):
+                after.append((pk, self.save_lock.locked()))
+
+        command = Plugin(stdout=StringIO(), stderr=StringIO())
+        command.frontier = CrawlFrontier('facility', 'run-e')
+        command.http = FakeHttp()
+        command.capture = SnapshotCapture(mode='off')
+        command.writer = command.make_writer({})
+        command.save_lock = asyncio.Lock()
+        command.pending_scores, command.saved_ids, command.region_saved = {}, set(), {}
+        command.stats = {'dup_skipped': 0, 'dup_updated': 0, 'unchanged': 0, 'http': 0, 'browser_fallback': 0}
+        command.progress = type('Progress', (), {'update': lambda self, n: None})()
+        command.frontier.start_regions(0, ['서울시/전체'])
+
+        async def run(*links):
+            for link in links:
+                await command.frontier.aclaim_url(link, '서울시/전체')
+                await command._process_detail(None, ('서울시/전체', link))
+
+        # async_to_sync: 프론티어의 sync_to_async 호출이 테스트 트랜잭션과 같은 스레드(연결)에서 실행되도록
+        async_to_sync(run)('https://example.com/view/2', 'https://example.com/view/1', 'https://example.com/view/3')
+        self.assertEqual(saved, [2, 3])  # 덜 풍부한 중복은 건너뛰고 더 풍부한 결과로 갱신
+        self.assertEqual(after, [(1, False), (2, False)])  # 저장 후 처리는 save_lock 밖에서
+        self.assertEqual((command.stats['dup_skipped'], command.stats['dup_updated'], command.stats['http']), (1, 1, 3))
+        self.assertEqual(command.region_saved, {'서울시/전체': 1})
+        statuses = dict(CrawlURL.objects.values_list('url', 'status'))
+        self.assertEqual(statuses['https://example.com/view/1'], CrawlURL.STATUS_SKIPPED)
+        self.assertEqual(statuses['https://example.com/view/3'], CrawlURL.STATUS_SAVED)
+        self.assertEqual(command.frontier.best_score('P1'), 3)
+
+        # 다음 실행에서 빈약한 중복 URL 을 먼저 만나도 변경으로 저장하지 않음
+        changes = CrawlRecord.objects.get(code='P1').changes
+        command.frontier = CrawlFrontier('facility', 'run-f')
+        command.frontier.start_regions(0, ['서울시/전체'])
+        async_to_sync(run)('https://example.com/view/1', 'https://example.com/view/3')
+        self.assertEqual(saved, [2, 3])
+        self.assertEqual((command.stats['dup_skipped'], command.stats['unchanged']), (2, 1))
+        record = CrawlRecord.objects.get(code='P1')
+        self.assertEqual((record.url, record.changes), ('https://example.com/view/3', changes))
@@ -5,6 +5,7 @@ from . import views
 # DRF 라우터 설정
 router = DefaultRouter()
 router.register(r'facilities', views.FacilityViewSet)
+router.register(r'hospitals', views.HospitalViewSet)
 
 app_name = 'core'
 
@@ -14,10 +15,14 @@ urlpatterns = [
     path('chat/', views.chat_view, name='chat'),  # 채팅 페이지
     path('chatbot/', views.chatbot_view, name='chatbot'),  # 기존 호환성
     path('facilities/', views.FacilityListView.as_view(), name='facility_list'),  # 시설 리스트
+    path('facilities/compare/', views.facility_compare, name='facility_compare'),  # 시설 비교
     path('facility/<str:code>/', views.facility_detail, name='facility_detail'),
+    path('hospitals/', views.HospitalListView.as_view(), name='hospital_list'),  # 요양병원 리스트
+    path('hospital/<str:code>/', views.hospital_detail, name='hospital_detail'),
 
     # DRF API
     path('api/', include(router.urls)),
+    path('api/suggest/', views.suggest_api, name='suggest'),
     path('api/chat/', views.ChatbotAPI.as_view(), name='chatbot_api'),
     path('api/initialize-rag/', views.initialize_rag, name='initialize_rag'),
 ]
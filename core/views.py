@@ -1,18 +1,45 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
+from django.http import Http404, HttpResponse
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.views.decorators.csrf import ensure_csrf_cookie, csrf_exempt
+from django.views.decorators.cache import cache_control
 from django.conf import settings
-from .models import Facility, ChatHistory, Tag
-from .serializers import FacilityListSerializer, FacilityDetailSerializer, ChatRequestSerializer, ChatResponseSerializer
+from .models import Facility, Hospital, HospitalAttribute, HospitalImage, ChatHistory, Tag
+from .serializers import (
+    FacilityListSerializer, FacilityDetailSerializer, HospitalListSerializer, HospitalDetailSerializer,
+    ChatRequestSerializer, ChatResponseSerializer,
+)
 from .rag_service import RAGService
+from .caching import (
+    get_facility_detail, get_facility_pk, get_facility_version, record_facility_view,
+    get_data_generation, list_fragment_key, get_list_fragment, set_list_fragment,
+    get_hospital_pk, get_hospital_version, get_hospital_detail,
+)
+from .loaders import prefetch_sections
+from .http_cache import (
+    make_etag, etag_matches, not_modified, facility_fingerprint, facility_last_modified,
+    queryset_validators, conditional_page, cache_policy,
+)
 from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
 from .regions import regions
 from django.views.generic import ListView
-from django.db.models import Case, When, Value, IntegerField
+from django.db.models import Prefetch, Q
+from .filters import (
+    get_facility_filters, filter_facilities, order_facilities, order_by_distance, parse_max_cost,
+    get_hospital_filters, filter_hospitals,
+)
+from . import bitmap_index
+from .compare import get_comparison, COMPARE_MIN_SIZE, COMPARE_MAX_SIZE
+from .facets import get_facets
+from .suggest import suggest, SUGGEST_DEFAULT_LIMIT
+from .search import search_facilities
+from .geo import parse_point, parse_bbox, nearest, attach_distances, map_features, NEARBY_DEFAULT_K, NEARBY_MAX_K
 import json
+import time
 
 
 @ensure_csrf_cookie
@@ -30,152 +57,207 @@ def chatbot_view(request):
     return render(request, 'core/main.html')
 
 
-def facility_detail(request, code: str):
-    facility = get_object_or_404(Facility, code=code)
-
-    # 모든 관련 정보 수집
-    basic_items = list(facility.basic_items.all())
-    evaluation_items = list(facility.evaluation_items.all())
-    staff_items = list(facility.staff_items.all())
-    program_items = list(facility.program_items.all())
-    location_items = list(facility.location_items.all())
-    noncovered_items = list(facility.noncovered_items.all())
-
-    # 프로그램 tokens 처리 (템플릿 태그 제거 대체)
-    program_items_tokens = []
-    for p in program_items:
-        raw = p.content or ''
-        # 개행, 한글쉼표 변형 통합 → 콤마 기준 분리
-        normalized = raw.replace('\n', ',').replace('，', ',')
-        tokens = [t.strip() for t in normalized.split(',') if t.strip()]
-        program_items_tokens.append({
-            'title': p.title,
-            'tokens': tokens,
-        })
-
-    # 배지 키워드(존재 여부 표시 용도 필요시 유지)
-    badge_keywords = ["인지프로그램", "여가프로그램", "특화프로그램"]
-    flat_text = ' '.join([' '.join(pi['tokens']) for pi in program_items_tokens])
-    program_badges = [kw for kw in badge_keywords if kw in flat_text]
+def _facility_detail_validators(request, code):
+    pk = get_facility_pk(code)
+    if pk is None:
+        return None, None
+    last_modified = facility_last_modified(pk=pk)
+    etag = make_etag('facility_detail', code, get_facility_version(pk), last_modified)
+    return etag, last_modified
 
-    # OneToOne 관계 정보
-    homepage_info = getattr(facility, 'homepage_info', None)
-    summary_info = getattr(facility, 'summary', None)
 
-    # 이미지 및 태그 정보
-    images = list(facility.images.all().reverse())
-    tags = list(facility.tags.all())
+@cache_policy('facility_detail')
+@conditional_page(_facility_detail_validators)
+def facility_detail(request, code: str):
+    # 관련 정보/프로그램 토큰은 캐시된 컨텍스트 사용 (변경 시 시그널로 무효화)
+    detail = get_facility_detail(code)
+    if detail is None:
+        raise Http404("시설을 찾을 수 없습니다.")
+    record_facility_view(code)
 
     context = {
-        'facility': facility,
-        'basic_items': basic_items,
-        'evaluation_items': evaluation_items,
-        'staff_items': staff_items,
-        'program_items': program_items,  # 원본 유지
-        'program_items_tokens': program_items_tokens,  # 신규
-        'location_items': location_items,
-        'noncovered_items': noncovered_items,
-        'homepage_info': homepage_info,
-        'summary_info': summary_info,
-        'images': images,
-        'tags': tags,
+        **detail,
         'google_maps_api_key': settings.GOOGLE_MAPS_API_KEY,
-        'program_badges': program_badges,
     }
     return render(request, 'core/facility_detail.html', context)
 
 
+def _compare_codes(params):
+    """비교 대상 코드 목록과 오류 메시지"""
+    codes = _split_param(params.get('codes'))
+    if not COMPARE_MIN_SIZE <= len(codes) <= COMPARE_MAX_SIZE:
+        return codes, f'비교할 시설 코드를 {COMPARE_MIN_SIZE}~{COMPARE_MAX_SIZE}개 지정해 주세요.'
+    return codes, None
+
+
+@cache_policy('facility_detail')
+def facility_compare(request):
+    """시설 비교 페이지 (?codes=a,b,c[&lat=..&lng=..])"""
+    codes, error = _compare_codes(request.GET)
+    context = {'error': error}
+    if not error:
+        context['comparison'] = get_comparison(codes, parse_point(request.GET))
+    return render(request, 'core/facility_compare.html', context)
+
+
+def _facility_list_validators(request):
+    filters = get_facility_filters(request.GET)
+    index = bitmap_index.serving_index(filters)
+    if index is not None:
+        # 비트맵 색인 사용 시 응답을 만든 색인의 데이터 세대만으로 판단 (DB 조회 없음)
+        return make_etag('facility_list', request.GET.urlencode(), index.generation), None
+    last_modified, count = queryset_validators(filter_facilities(Facility.objects.all(), filters))
+    etag = make_etag('facility_list', request.GET.urlencode(), get_data_generation(), last_modified, count)
+    return etag, last_modified
+
+
+@method_decorator([cache_policy('facility_list'), conditional_page(_facility_list_validators)], name='get')
 class FacilityListView(ListView):
     model = Facility
     template_name = 'core/facility_list.html'
     context_object_name = 'facilities'
     paginate_by = 20
 
-    def get_queryset(self):
-        queryset = Facility.objects.all().prefetch_related('tags', 'images')
+    def is_partial(self):
+        return self.request.GET.get('ajax') == '1' or self.request.headers.get('X-Requested-With') == 'XMLHttpRequest'
 
-        # 필터 파라미터 가져오기
-        sido = self.request.GET.get('sido', '전체')
-        sigungu = self.request.GET.get('sigungu', '')
-        grade = self.request.GET.get('grade', '')
-        establishment = self.request.GET.get('establishment', '')
-        size = self.request.GET.get('size', '')
-        search = self.request.GET.get('search', '').strip()
-        sort = self.request.GET.get('sort', 'grade')  # 새 정렬 기준 (기본: 등급)
-
-        # 지역 필터링
-        if sido and sido != '전체':
-            queryset = queryset.filter(sido=sido)
-            if sigungu:
-                queryset = queryset.filter(sigungu=sigungu)
-
-        # 평가등급 필터링
-        if grade:
-            queryset = queryset.filter(grade=grade)
-
-        # 태그 기반 필터링
-        tag_filters = [establishment, size]
-        for tag_name in tag_filters:
-            if tag_name:
-                queryset = queryset.filter(tags__name__icontains=tag_name)
-
-        # 검색(시설명)
-        if search:
-            queryset = queryset.filter(name__icontains=search)
-
-        # 정렬 적용
-        if sort == 'grade':
-            grade_order = Case(
-                When(grade='A등급', then=Value(1)),
-                When(grade='B등급', then=Value(2)),
-                When(grade='C등급', then=Value(3)),
-                When(grade='D등급', then=Value(4)),
-                When(grade='E등급', then=Value(5)),
-                When(grade='등급외', then=Value(6)),
-                default=Value(7),
-                output_field=IntegerField()
-            )
-            queryset = queryset.annotate(_grade_order=grade_order).order_by('_grade_order', 'name')
-        else:  # 이름 오름차순
-            queryset = queryset.order_by('name')
+    def get(self, request, *args, **kwargs):
+        # AJAX 결과 조각은 (데이터 세대, 필터, 페이지) 키로 캐시된 HTML 을 바로 반환
+        self.fragment_key = list_fragment_key(request.GET) if self.is_partial() else None
+        content = get_list_fragment(self.fragment_key)
+        if content is not None:
+            return HttpResponse(content)
+        return super().get(request, *args, **kwargs)
 
-        return queryset.distinct()
+    def get_queryset(self):
+        filters = get_facility_filters(self.request.GET)
+        queryset = Facility.objects.all().prefetch_related('tags', 'images')
+        self.distances = {}
+        self.index_generation = None
+        result = bitmap_index.bitmap_queryset(filters, queryset)
+        if result is not None:
+            self.index_generation = result.index.generation
+            return result
+        if filters['sort'] == 'relevance' and filters['search']:
+            # 검색 필터를 점수순 검색으로 대신 적용 (색인 조회 1회)
+            queryset = filter_facilities(queryset, {**filters, 'search': ''})
+            return search_facilities(queryset, filters['search']).distinct()
+        queryset = filter_facilities(queryset, filters)
+        point = parse_point(filters)
+        if filters['sort'] == 'distance' and point:
+            queryset, self.distances = order_by_distance(queryset, point)
+            return queryset.distinct()
+        return order_facilities(queryset, filters['sort']).distinct()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        for facility in context['object_list']:
+            facility.distance_km = self.distances.get(facility.pk)
 
-        # 필터 파라미터 가져오기
-        sido = self.request.GET.get('sido', '')
-        sigungu = self.request.GET.get('sigungu', '')
-        grade = self.request.GET.get('grade', '')
-        establishment = self.request.GET.get('establishment', '')
-        size = self.request.GET.get('size', '')
-        search = self.request.GET.get('search', '')
-        sort = self.request.GET.get('sort', 'grade')  # 기본 표시도 등급 정렬
-        current_filters = {
-            'sido': sido,
-            'sigungu': sigungu,
-            'grade': grade,
-            'establishment': establishment,
-            'size': size,
-            'search': search,
-            'sort': sort,
-        }
+        current_filters = get_facility_filters(self.request.GET)
+        paginator = context.get('paginator')
         context.update({
             'regions': regions,
             'current_filters': current_filters,
             'current_filters_json': json.dumps(current_filters, ensure_ascii=False),
-            'total_count': self.get_queryset().count(),
+            # 페이지네이터가 이미 계산한 개수 재사용 (COUNT 쿼리 중복 방지)
+            'total_count': paginator.count if paginator else len(context['object_list']),
         })
         return context
 
     def render_to_response(self, context, **response_kwargs):
         # AJAX(partial) 요청이면 결과 부분만 반환
-        if self.request.GET.get('ajax') == '1' or self.request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            return render(self.request, 'core/_facility_list_results.html', context)
+        if self.is_partial():
+            response = render(self.request, 'core/_facility_list_results.html', context)
+            # 재생성 전의 이전 색인으로 만든 조각은 새 세대 키로 캐시하지 않음
+            if self.index_generation in (None, get_data_generation()):
+                set_list_fragment(self.fragment_key, response.content)
+            return response
         return super().render_to_response(context, **response_kwargs)
 
 
+BATCH_MAX_SIZE = 50  # 일괄 조회 최대 개수
+
+
+def _nearby_response(request, queryset, serializer_class):
+    """?lat=&lng=&k=&radius= 로 가까운 순 k 개 조회 (공통)"""
+    point = parse_point(request.query_params)
+    if point is None:
+        return Response({'error': '올바른 lat, lng 파라미터가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    k = request.query_params.get('k', '')
+    k = min(int(k), NEARBY_MAX_K) if k.isdigit() and int(k) > 0 else NEARBY_DEFAULT_K
+    try:
+        radius = float(request.query_params['radius']) if request.query_params.get('radius') else None
+    except ValueError:
+        return Response({'error': 'radius 는 km 단위 숫자여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    started = time.perf_counter()
+    ranked = nearest(queryset, *point, k=k, max_km=radius)
+    objects = attach_distances(queryset.defer('summary_embedding').filter(pk__in=[pk for pk, _ in ranked]), ranked)
+    took_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    results = []
+    for obj, data in zip(objects, serializer_class(objects, many=True).data):
+        data['distance_km'] = obj.distance_km
+        results.append(data)
+    return Response({'results': results, 'took_ms': took_ms})
+
+
+def _split_param(value) -> list:
+    """콤마 구분 쿼리 파라미터 → 중복 제거된 리스트"""
+    items = [v.strip() for v in (value or '').split(',')]
+    return list(dict.fromkeys(v for v in items if v))
+
+
+def _facility_api_queryset(params):
+    queryset = Facility.objects.all()
+
+    # 필터링 옵션
+    grade = params.get('grade', None)
+    kind = params.get('kind', None)
+    availability = params.get('availability', None)
+
+    if grade:
+        queryset = queryset.filter(grade=grade)
+    if kind:
+        queryset = queryset.filter(kind=kind)
+    if availability:
+        queryset = queryset.filter(availability=availability)
+    max_cost = parse_max_cost(params.get('max_cost'))
+    if max_cost is not None:
+        queryset = queryset.filter(noncovered_monthly_total__lte=max_cost)
+    search = params.get('search', '').strip()
+    if search:
+        queryset = search_facilities(queryset, search)
+
+    return queryset
+
+
+def _facility_api_list_validators(request):
+    last_modified, count = queryset_validators(_facility_api_queryset(request.query_params))
+    etag = make_etag('facility_api_list', request.query_params.urlencode(), last_modified, count)
+    return etag, last_modified
+
+
+def _facility_map_validators(request):
+    # 전역 데이터 세대만으로 판단 (집계 쿼리 없이 304 가능)
+    return make_etag('facility_map', request.query_params.urlencode(), get_data_generation()), None
+
+
+def _facility_facets_validators(request):
+    return make_etag('facility_facets', request.query_params.urlencode(), get_data_generation()), None
+
+
+def _facility_api_detail_validators(request, pk=None):
+    if not str(pk).isdigit():
+        return None, None
+    last_modified = facility_last_modified(pk=pk)
+    if last_modified is None:
+        return None, None
+    etag = make_etag('facility_api_detail', pk, get_facility_version(int(pk)), last_modified)
+    return etag, last_modified
+
+
 class FacilityViewSet(viewsets.ReadOnlyModelViewSet):
     """요양원 CRUD API"""
     queryset = Facility.objects.all()
@@ -186,21 +268,243 @@ class FacilityViewSet(viewsets.ReadOnlyModelViewSet):
         return FacilityDetailSerializer
 
     def get_queryset(self):
-        queryset = Facility.objects.all()
+        queryset = _facility_api_queryset(self.request.query_params)
+        if self.request.query_params.get('search', '').strip():
+            return queryset  # 검색 점수순
+        if self.request.query_params.get('sort') == 'cost':
+            return order_facilities(queryset, 'cost')
+        return queryset.order_by('name')
 
-        # 필터링 옵션
-        grade = self.request.query_params.get('grade', None)
-        kind = self.request.query_params.get('kind', None)
-        availability = self.request.query_params.get('availability', None)
+    @method_decorator([cache_policy('facility_api'), conditional_page(_facility_api_list_validators)])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @method_decorator([cache_policy('facility_api'), conditional_page(_facility_api_detail_validators)])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'], url_path='batch')
+    def batch(self, request):
+        """여러 시설 상세를 한 번에 조회 (?codes=a,b,c 또는 ?ids=1,2,3)"""
+        codes = _split_param(request.query_params.get('codes'))
+        ids = [int(v) for v in _split_param(request.query_params.get('ids')) if v.isdigit()]
+        if not codes and not ids:
+            return Response({'error': 'codes 또는 ids 파라미터가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(codes) + len(ids) > BATCH_MAX_SIZE:
+            return Response({'error': f'한 번에 최대 {BATCH_MAX_SIZE}개까지 조회할 수 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        facilities = list(
+            Facility.objects.defer('summary_embedding')
+            .filter(Q(code__in=codes) | Q(pk__in=ids))
+        )
+        # 요청 순서 유지
+        order = {value: idx for idx, value in enumerate(codes + ids)}
+        facilities.sort(key=lambda f: order.get(f.code, order.get(f.pk, len(order))))
+        prefetch_sections(facilities)
+
+        etag = make_etag(*(facility_fingerprint(f) for f in facilities))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        data = FacilityDetailSerializer(facilities, many=True).data
+        found_codes = {f.code for f in facilities}
+        found_ids = {f.pk for f in facilities}
+        missing = [c for c in codes if c not in found_codes] + [i for i in ids if i not in found_ids]
+        response = Response({
+            'results': {item['code']: item for item in data},
+            'missing': missing,
+        })
+        response['ETag'] = etag
+        return response
+
+    @action(detail=False, methods=['get'], url_path='compare')
+    @method_decorator(cache_policy('facility_api'))
+    def compare(self, request):
+        """시설 비교 매트릭스 (?codes=a,b,c[&lat=..&lng=..])"""
+        codes, error = _compare_codes(request.query_params)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(get_comparison(codes, parse_point(request.query_params)))
+
+    @action(detail=False, methods=['get'], url_path='facets')
+    @method_decorator([cache_policy('facility_list'), conditional_page(_facility_facets_validators)])
+    def facets(self, request):
+        """목록 페이지 필터(sido, grade, establishment ...) 기준 선택지별 시설 수"""
+        return Response(get_facets(get_facility_filters(request.query_params)))
+
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    def autocomplete(self, request):
+        """시설명 자동완성 (?q=행복&limit=10). /api/suggest/ 색인에서 시설만 골라 같은 순서로 반환"""
+        limit = request.query_params.get('limit', '')
+        limit = int(limit) if limit.isdigit() and int(limit) > 0 else SUGGEST_DEFAULT_LIMIT
+        results = suggest(request.query_params.get('q', ''), limit=limit, types=('facility',))
+        return Response({'results': [
+            {'id': r['id'], 'code': r['code'], 'name': r['label'], 'grade': r['grade'], 'sido': r['sido'], 'sigungu': r['sigungu']}
+            for r in results
+        ]})
+
+    @action(detail=False, methods=['get'], url_path='nearby')
+    def nearby(self, request):
+        """좌표 주변 시설 (?lat=37.5&lng=127.0&k=10&radius=5)"""
+        return _nearby_response(request, self.get_queryset(), FacilityListSerializer)
+
+    @action(detail=False, methods=['get'], url_path='map')
+    @method_decorator([cache_policy('facility_api'), conditional_page(_facility_map_validators)])
+    def map(self, request):
+        """지도 화면 영역 내 시설 (?bbox=south,west,north,east)
+
+        개수가 적으면 개별 좌표, 많으면 geohash 셀별 클러스터(개수/평균 좌표)를 반환한다.
+        """
+        bbox = parse_bbox(request.query_params.get('bbox'))
+        if bbox is None:
+            return Response({'error': 'bbox=south,west,north,east 형식의 파라미터가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(map_features(_facility_api_queryset(request.query_params), bbox))
+
+    def get_object(self):
+        facility = super().get_object()
+        if self.action == 'retrieve':
+            # 6개 섹션을 UNION 쿼리 한 번으로 로드 (시리얼라이저의 섹션별 쿼리 방지)
+            prefetch_sections([facility])
+        return facility
+
+
+# 목록 카드/API 목록에 필요한 컬럼만 조회 (JSON 필드와 임베딩 제외)
+HOSPITAL_LIST_FIELDS = (
+    'pk', 'code', 'name', 'grade', 'establishment_type', 'phone', 'sido', 'sigungu', 'location',
+    'latitude', 'longitude', 'geohash', 'doctor_total', 'bed_total', 'has_images', 'updated_at',
+)
+
+
+def _hospital_api_queryset(params):
+    """?sido=&sigungu=&grade=&min_doctors=&min_beds=&specialist=재활의학과,내과&department=&search="""
+    queryset = Hospital.objects.only(*HOSPITAL_LIST_FIELDS)
+    return filter_hospitals(queryset, get_hospital_filters(params)).order_by('name')
+
+
+def _hospital_list_validators(request):
+    # 병원 변경 시 전역 데이터 세대가 바뀌므로 세대만으로 판단 (DB 조회 없음)
+    return make_etag('hospital_list', request.GET.urlencode(), get_data_generation()), None
+
+
+def _hospital_detail_validators(request, code):
+    pk = get_hospital_pk(code)
+    if pk is None:
+        return None, None
+    return make_etag('hospital_detail', code, get_hospital_version(pk)), None
+
+
+def _hospital_api_list_validators(request):
+    return make_etag('hospital_api_list', request.query_params.urlencode(), get_data_generation()), None
+
+
+def _hospital_api_detail_validators(request, pk=None):
+    if not str(pk).isdigit():
+        return None, None
+    return make_etag('hospital_api_detail', pk, get_hospital_version(int(pk))), None
+
+
+@method_decorator([cache_policy('hospital_list'), conditional_page(_hospital_list_validators)], name='get')
+class HospitalListView(ListView):
+    """요양병원 목록 (FacilityListView 와 같은 페이지네이션/결과 조각 캐시)"""
+    model = Hospital
+    template_name = 'core/hospital_list.html'
+    context_object_name = 'hospitals'
+    paginate_by = 20
 
-        if grade:
-            queryset = queryset.filter(grade=grade)
-        if kind:
-            queryset = queryset.filter(kind=kind)
-        if availability:
-            queryset = queryset.filter(availability=availability)
+    def is_partial(self):
+        return self.request.GET.get('ajax') == '1' or self.request.headers.get('X-Requested-With') == 'XMLHttpRequest'
 
-        return queryset.order_by('name')
+    def get(self, request, *args, **kwargs):
+        self.fragment_key = list_fragment_key(request.GET, scope='hospital') if self.is_partial() else None
+        content = get_list_fragment(self.fragment_key)
+        if content is not None:
+            return HttpResponse(content)
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        # 카드에 쓰는 첫 이미지 1장만 prefetch (병원별 전체 이미지 로드 방지)
+        return _hospital_api_queryset(self.request.GET).prefetch_related(
+            Prefetch('images', queryset=HospitalImage.objects.order_by('created_at', 'pk')[:1], to_attr='first_images')
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        current_filters = get_hospital_filters(self.request.GET)
+        paginator = context.get('paginator')
+        context.update({
+            'regions': regions,
+            'current_filters': current_filters,
+            # 페이지 링크에 붙일 필터 파라미터
+            'query_string': urlencode({key: value for key, value in current_filters.items() if value}),
+            'total_count': paginator.count if paginator else len(context['object_list']),
+        })
+        if not self.is_partial():
+            context.update({
+                'regions_json': json.dumps(regions, ensure_ascii=False),
+                'grade_choices': list(
+                    Hospital.objects.exclude(grade='').order_by('grade').values_list('grade', flat=True).distinct()
+                ),
+            })
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.is_partial():
+            response = render(self.request, 'core/_hospital_list_results.html', context)
+            set_list_fragment(self.fragment_key, response.content)
+            return response
+        return super().render_to_response(context, **response_kwargs)
+
+
+@cache_policy('hospital_detail')
+@conditional_page(_hospital_detail_validators)
+def hospital_detail(request, code: str):
+    # JSON 필드 파싱 결과(HospitalAttribute)와 이미지/태그는 버전 키로 캐시된 컨텍스트 사용
+    detail = get_hospital_detail(code)
+    if detail is None:
+        raise Http404("병원을 찾을 수 없습니다.")
+    return render(request, 'core/hospital_detail.html', {
+        **detail,
+        'google_maps_api_key': settings.GOOGLE_MAPS_API_KEY,
+    })
+
+
+class HospitalViewSet(viewsets.ReadOnlyModelViewSet):
+    """요양병원 조회 API (병상/의사/전문의 조건 필터)"""
+    queryset = Hospital.objects.all()
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'nearby'):
+            return HospitalListSerializer
+        return HospitalDetailSerializer
+
+    def get_queryset(self):
+        if self.action == 'retrieve':
+            return Hospital.objects.defer('summary_embedding').prefetch_related(
+                Prefetch('attributes', queryset=HospitalAttribute.objects.order_by('kind', 'name'))
+            )
+        return _hospital_api_queryset(self.request.query_params)
+
+    @method_decorator([cache_policy('hospital_api'), conditional_page(_hospital_api_list_validators)])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @method_decorator([cache_policy('hospital_api'), conditional_page(_hospital_api_detail_validators)])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'], url_path='nearby')
+    def nearby(self, request):
+        """좌표 주변 요양병원 (?lat=37.5&lng=127.0&k=10&radius=5, 목록 필터와 함께 사용 가능)"""
+        return _nearby_response(request, self.get_queryset(), HospitalListSerializer)
+
+
+@api_view(['GET'])
+@cache_control(public=True, max_age=60)
+def suggest_api(request):
+    """검색창 자동완성 (?q=행복 또는 초성 ?q=ㅎㅂ, &limit=10)"""
+    limit = request.query_params.get('limit', '')
+    limit = int(limit) if limit.isdigit() and int(limit) > 0 else SUGGEST_DEFAULT_LIMIT
+    return Response({'results': suggest(request.query_params.get('q', ''), limit=limit)})
 
 
 @method_decorator(csrf_exempt, name='dispatch')